@@ -0,0 +1,10 @@
+"""
+Benchmarks of the notification hot path. Run from the repository root:
+
+    python -m benchmarks                  # run all benchmarks
+    python -m benchmarks -k send          # only benchmarks whose name contains "send"
+    python -m benchmarks --compare        # compare against benchmarks/baseline.json, fail on regressions
+    python -m benchmarks --save           # store the results in benchmarks/baseline.json
+
+Baselines are machine specific, save one on the machine you compare on before changing code.
+"""
@@ -0,0 +1,26 @@
+"""Overhead of sending log records via :class:`~notifiers.logging.NotificationHandler`"""
+
+import logging
+
+from notifiers.logging import NotificationHandler
+
+from .bench_providers import mocked
+from .runner import benchmark
+
+RECORD = logging.LogRecord("benchmark", logging.ERROR, __file__, 1, "Something failed: %s", ("foo",), None)
+DEFAULTS = {"token": "foo", "user": "bar"}
+
+
+@benchmark("logging.emit")
+def emit():
+    handler = NotificationHandler("pushover", defaults=DEFAULTS)
+    handler.provider = mocked("pushover")
+    return lambda: handler.emit(RECORD)
+
+
+@benchmark("logging.emit_background")
+def emit_background():
+    # Only the cost on the logging thread is measured, records that don't fit the queue are dropped
+    handler = NotificationHandler("pushover", defaults=DEFAULTS, background=True, queue_size=1)
+    handler.provider = mocked("pushover")
+    return lambda: handler.emit(RECORD)
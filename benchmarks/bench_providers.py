@@ -0,0 +1,73 @@
+"""Per provider benchmarks of getting a provider, each data processing phase and a full send against a mock transport"""
+
+from notifiers import get_notifier
+from notifiers.transports import MockTransport
+
+from .runner import register
+
+SAMPLE_DATA = {
+    "dingtalk": {"access_token": "foo", "msg_data": {"msgtype": "text", "text": {"content": "bar"}}},
+    "email": {"to": "foo@foo.com", "message": "bar", "host": "localhost", "username": "foo", "password": "bar"},
+    "gitter": {"token": "foo", "room_id": "bar", "message": "baz"},
+    "join": {"apikey": "foo", "message": "bar"},
+    "mailgun": {"api_key": "foo", "domain": "bar", "to": "foo@foo.com", "from": "bar@bar.com", "message": "baz"},
+    "pagerduty": {"routing_key": "foo", "event_action": "trigger", "source": "bar", "severity": "info", "message": "baz"},
+    "popcornnotify": {"api_key": "foo", "recipients": "foo@foo.com", "message": "bar"},
+    "pushbullet": {"token": "foo", "message": "bar"},
+    "pushover": {"token": "foo", "user": "bar", "message": "baz", "priority": 1, "device": ["a", "b"]},
+    "simplepush": {"key": "foo", "message": "bar"},
+    "slack": {"webhook_url": "https://hooks.slack.com/services/foo", "message": "bar"},
+    "telegram": {"token": "foo", "chat_id": 1, "message": "bar"},
+    "twilio": {"account_sid": "foo", "auth_token": "bar", "to": "+15551234567", "from": "+15557654321", "message": "baz"},
+    "zulip": {"email": "foo@foo.com", "api_key": "bar", "domain": "baz", "to": "qux", "subject": "quux", "message": "corge"},
+}
+
+
+def mocked(provider_name: str):
+    """Returns a provider instance that sends to a :class:`MockTransport` without client side rate limits"""
+    provider = type(get_notifier(provider_name))(transport=MockTransport())
+    provider.rate_limits = ()
+    return provider
+
+
+def register_provider(provider_name: str, data: dict):
+    def get_provider():
+        return lambda: get_notifier(provider_name)
+
+    def environs():
+        provider = get_notifier(provider_name)
+        return lambda: provider._get_environs(None)
+
+    def merge_defaults():
+        provider = get_notifier(provider_name)
+        return lambda: provider._merge_defaults(dict(data))
+
+    def validate():
+        provider = get_notifier(provider_name)
+        merged = provider._merge_defaults(dict(data))
+        return lambda: provider._validate_data(merged)
+
+    def prepare():
+        provider = get_notifier(provider_name)
+        merged = provider._validate_data_dependencies(provider._merge_defaults(dict(data)))
+        return lambda: provider._prepare_data(dict(merged))
+
+    def process():
+        provider = get_notifier(provider_name)
+        return lambda: provider._process_data(**data)
+
+    def send():
+        provider = mocked(provider_name)
+        return lambda: provider.notify(**data)
+
+    register(f"get_notifier.{provider_name}", get_provider)
+    register(f"environs.{provider_name}", environs)
+    register(f"defaults.{provider_name}", merge_defaults)
+    register(f"validate.{provider_name}", validate)
+    register(f"prepare.{provider_name}", prepare)
+    register(f"process.{provider_name}", process)
+    register(f"send.{provider_name}", send)
+
+
+for name, sample in SAMPLE_DATA.items():
+    register_provider(name, sample)
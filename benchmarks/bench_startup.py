@@ -0,0 +1,24 @@
+"""Cold start benchmarks, each run in a new interpreter"""
+
+import subprocess
+import sys
+
+from .runner import register
+
+# Process startup is noisy, so these get a looser threshold
+STARTUP_THRESHOLD = 2.0
+
+CLI = "import sys; sys.argv = ['notifiers', '--help']; from notifiers_cli.core import entry_point; entry_point()"
+
+
+def python(code: str):
+    def setup():
+        return lambda: subprocess.run([sys.executable, "-c", code], check=True, stdout=subprocess.DEVNULL)
+
+    return setup
+
+
+register("startup.interpreter", python("pass"), threshold=STARTUP_THRESHOLD, number=3)
+register("startup.import", python("import notifiers"), threshold=STARTUP_THRESHOLD, number=3)
+register("startup.get_notifier", python("import notifiers; notifiers.get_notifier('pushover')"), threshold=STARTUP_THRESHOLD, number=3)
+register("startup.cli", python(CLI), threshold=STARTUP_THRESHOLD, number=3)
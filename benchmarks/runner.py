@@ -0,0 +1,146 @@
+"""
+Runs the benchmarks, stores baselines and compares against them.
+
+Each ``bench_*`` module in this package registers benchmarks via :func:`benchmark` or :func:`register`. A benchmark is
+a setup function returning the callable to time, so setup cost is not measured. The reported time is the best mean
+time per call over several rounds, which is the least noisy estimate of the real cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import pkgutil
+import platform
+import sys
+import timeit
+from pathlib import Path
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 1.5
+DEFAULT_REPEAT = 5
+QUICK_REPEAT = 1
+
+_benchmarks = {}
+
+
+class Benchmark:
+    """
+    A registered benchmark
+
+    :param name: Unique benchmark name, grouped by dots such as ``send.pushover``
+    :param setup: A callable returning the callable to time
+    :param threshold: Max ratio to the baseline time before the benchmark counts as a regression
+    :param number: Calls per round. Determined automatically if not set, set it for slow benchmarks
+    """
+
+    def __init__(self, name: str, setup: callable, threshold: float | None = None, number: int | None = None):
+        self.name = name
+        self.setup = setup
+        self.threshold = threshold
+        self.number = number
+
+    def __repr__(self):
+        return f"<Benchmark,name={self.name}>"
+
+    def run(self, repeat: int) -> float:
+        """
+        Times the benchmark
+
+        :param repeat: Number of rounds
+        :return: Best mean seconds per call
+        """
+        timer = timeit.Timer(self.setup())
+        number = self.number or timer.autorange()[0]
+        return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def register(name: str, setup: callable, threshold: float | None = None, number: int | None = None):
+    """
+    Registers a benchmark, see :class:`Benchmark`
+
+    :raises ValueError: If a benchmark with the same name is registered
+    """
+    if name in _benchmarks:
+        raise ValueError(f"benchmark {name} is already registered")
+    _benchmarks[name] = Benchmark(name, setup, threshold, number)
+
+
+def benchmark(name: str, threshold: float | None = None, number: int | None = None):
+    """A decorator version of :func:`register`"""
+
+    def decorator(setup: callable) -> callable:
+        register(name, setup, threshold, number)
+        return setup
+
+    return decorator
+
+
+def load_benchmarks() -> dict:
+    """Imports all ``bench_*`` modules and returns the registered benchmarks by name"""
+    package = Path(__file__).parent
+    for module in pkgutil.iter_modules([str(package)]):
+        if module.name.startswith("bench_"):
+            importlib.import_module(f"{__package__}.{module.name}")
+    return _benchmarks
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compares results to a baseline
+
+    :param results: Seconds per call by benchmark name
+    :param baseline: Seconds per call by benchmark name
+    :param threshold: Default max ratio to the baseline
+    :return: A list of ``(name, ratio)`` pairs of regressed benchmarks
+    """
+    regressions = []
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+        ratio = seconds / baseline[name]
+        if ratio > (_benchmarks[name].threshold or threshold):
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Runs the notifiers benchmarks")
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Number of rounds per benchmark")
+    parser.add_argument("--quick", action="store_true", help="Run a single round, to check that benchmarks work")
+    parser.add_argument("--save", type=Path, nargs="?", const=DEFAULT_BASELINE, help="Save the results as a baseline")
+    parser.add_argument("--compare", type=Path, nargs="?", const=DEFAULT_BASELINE, help="Compare against a baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Default max ratio to the baseline")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.compare.read_text())["benchmarks"] if args.compare else {}
+    repeat = QUICK_REPEAT if args.quick else args.repeat
+    results = {}
+    for name, bench in sorted(load_benchmarks().items()):
+        if args.filter not in name:
+            continue
+        results[name] = seconds = bench.run(repeat)
+        line = f"{name:<45} {format_time(seconds):>10}"
+        if name in baseline:
+            line += f" {seconds / baseline[name]:>7.2f}x"
+        print(line)
+
+    if args.save:
+        saved = json.loads(args.save.read_text())["benchmarks"] if args.save.exists() else {}
+        report = {"python": platform.python_version(), "platform": platform.platform(), "benchmarks": {**saved, **results}}
+        args.save.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+        print(f"saved {len(results)} results to {args.save}")
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, ratio in regressions:
+        print(f"REGRESSION {name}: {ratio:.2f}x the baseline", file=sys.stderr)
+    return 1 if regressions else 0
@@ -1,8 +1,8 @@
 import logging
 
 from ._version import __version__
-from .core import all_providers, get_notifier, notify
+from .core import all_providers, anotify, get_notifier, notify, notify_many, notify_stream, warmup
 
 logging.getLogger("notifiers").addHandler(logging.NullHandler())
 
-__all__ = ["__version__", "all_providers", "get_notifier", "notify"]
+__all__ = ["__version__", "all_providers", "anotify", "get_notifier", "notify", "notify_many", "notify_stream", "warmup"]
@@ -1,26 +1,54 @@
 from __future__ import annotations
 
+import contextlib
+import copy
 import importlib.machinery
 import importlib.util
 import logging
+import re
+import threading
 from abc import ABC, abstractmethod
-
-import jsonschema
-import requests
-from importlib_metadata import entry_points
-from jsonschema.exceptions import best_match
+from time import perf_counter
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
 
 from .exceptions import BadArguments, NoSuchNotifierError, NotificationError, SchemaError
-from .utils.helpers import dict_from_environs, merge_dicts
-from .utils.schema.formats import format_checker
+from .transports import get_transport
+from .utils import hooks as lifecycle
+from .utils.context import current_context, send_context
+from .utils.helpers import SENSITIVE_KEYS, dict_from_environs, merge_dicts, redact_data, sensitive_keys_pattern
+from .utils.keepalive import keepalive as keepalive_scheduler
+from .utils.metrics import metrics
+from .utils.ratelimit import rate_limiter
+from .utils.retry import RetryPolicy
+from .utils.timings import Timings, current_timings, record_timing, timings_context
+from .utils.tracing import tracing
+
+if TYPE_CHECKING:
+    import requests
+
+# Heavy dependencies such as jsonschema, requests and importlib_metadata are imported on first use to keep
+# `import notifiers` cheap
 
 DEFAULT_ENVIRON_PREFIX = "NOTIFIERS_"
+DEFAULT_MAX_WORKERS = 32
 
 log = logging.getLogger("notifiers")
 
 FAILURE_STATUS = "Failure"
 SUCCESS_STATUS = "Success"
 
+# Response headers kept by compact responses, useful for auditing and backing off
+COMPACT_HEADERS = (
+    "Retry-After",
+    "X-Request-Id",
+    "X-RateLimit-Limit",
+    "X-RateLimit-Remaining",
+    "X-RateLimit-Reset",
+)
+
+_schema_lock = threading.RLock()
+
 
 class Response:
     """
@@ -31,21 +59,30 @@ class Response:
     :param data: The notification data that was used for the notification
     :param response: The response object that was returned. Usually :class:`requests.Response`
     :param errors: Holds a list of errors if relevant
+    :param attempts: List of :class:`~notifiers.utils.retry.Attempt` objects, one per HTTP request attempt
+    :param timings: :class:`~notifiers.utils.timings.Timings` of the send phases, in seconds
+    :param sensitive_keys: A pattern matching the data keys that :meth:`compact` redacts
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         status: str,
         provider: str,
         data: dict,
         response: requests.Response = None,
         errors: list | None = None,
+        attempts: list | None = None,
+        timings: Timings | None = None,
+        sensitive_keys: re.Pattern = SENSITIVE_KEYS,
     ):
         self.status = status
         self.provider = provider
         self.data = data
         self.response = response
         self.errors = errors
+        self.attempts = attempts or []
+        self.timings = timings if timings is not None else Timings()
+        self.sensitive_keys = sensitive_keys
 
     def __repr__(self):
         return f"<Response,provider={self.provider.capitalize()},status={self.status}, errors={self.errors}>"
@@ -68,10 +105,126 @@ class Response:
     def ok(self):
         return self.errors is None
 
+    def compact(self, keep_data: bool = True, keep_response: bool = False, headers: tuple = COMPACT_HEADERS) -> CompactResponse:
+        """
+        Returns a :class:`CompactResponse` of this response, for when many responses are kept in memory
+
+        :param keep_data: Keep a redacted copy of the notification data
+        :param keep_response: Keep the response object, which holds the whole response body
+        :param headers: Names of the response headers to keep
+        :return: A :class:`CompactResponse`
+        """
+        status_code, elapsed, kept_headers = None, None, None
+        response = self.response
+        if response is not None and hasattr(response, "status_code"):
+            status_code = response.status_code
+            elapsed = response.elapsed.total_seconds() if getattr(response, "elapsed", None) is not None else None
+            kept_headers = {name: response.headers[name] for name in headers if name in response.headers} or None
+        return CompactResponse(
+            status=self.status,
+            provider=self.provider,
+            data=redact_data(self.data, self.sensitive_keys) if keep_data else None,
+            errors=self.errors,
+            attempts=self.attempts,
+            status_code=status_code,
+            elapsed=elapsed,
+            headers=kept_headers,
+            response=response if keep_response else None,
+            timings=self.timings,
+        )
+
+
+class CompactResponse:
+    """
+    A lightweight version of :class:`Response` that uses ``__slots__`` and doesn't hold on to the response object
+    unless asked to. Its data has the values of credentials such as tokens redacted.
+
+    :param status: Response status string. ``SUCCESS`` or ``FAILED``
+    :param provider: Provider name that returned that response
+    :param data: The redacted notification data, if kept
+    :param errors: Holds a list of errors if relevant
+    :param attempts: List of :class:`~notifiers.utils.retry.Attempt` objects, one per HTTP request attempt
+    :param status_code: HTTP status code of the response
+    :param elapsed: Seconds between sending the request and receiving the response
+    :param headers: The kept response headers, see :data:`COMPACT_HEADERS`
+    :param response: The response object, if kept
+    :param timings: :class:`~notifiers.utils.timings.Timings` of the send phases, in seconds
+    """
+
+    __slots__ = (
+        "attempts",
+        "data",
+        "elapsed",
+        "errors",
+        "headers",
+        "provider",
+        "response",
+        "status",
+        "status_code",
+        "timings",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        status: str,
+        provider: str,
+        data: dict | None = None,
+        errors: list | None = None,
+        attempts: list | None = None,
+        status_code: int | None = None,
+        elapsed: float | None = None,
+        headers: dict | None = None,
+        response: requests.Response = None,
+        timings: Timings | None = None,
+    ):
+        self.status = status
+        self.provider = provider
+        self.data = data
+        self.errors = errors
+        self.attempts = attempts or []
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.headers = headers
+        self.response = response
+        self.timings = timings if timings is not None else Timings()
+
+    def __repr__(self):
+        return f"<CompactResponse,provider={self.provider.capitalize()},status={self.status}, errors={self.errors}>"
+
+    def raise_on_errors(self):
+        """
+        Raises a :class:`~notifiers.exceptions.NotificationError` if response hold errors
+
+        :raises: :class:`~notifiers.exceptions.NotificationError`: If response has errors
+        """
+        if self.errors:
+            raise NotificationError(
+                provider=self.provider,
+                data=self.data,
+                errors=self.errors,
+                response=self.response,
+            )
+
+    @property
+    def ok(self):
+        return self.errors is None
+
 
 class SchemaResource(ABC):
     """Base class that represent an object schema and its utility methods"""
 
+    # Retry policy for HTTP requests sent by this resource. Override per provider or per instance
+    retry_policy = RetryPolicy()
+    # Name of a data key that makes a request idempotent when set, allowing it to be safely retried
+    idempotency_key = None
+    # The transport to send with, the default transport is used if not set
+    transport = None
+    # Per instance lifecycle hooks, created on first access to :attr:`hooks`
+    _hooks = None
+    # Names of data keys holding credentials that :data:`~notifiers.utils.helpers.SENSITIVE_KEYS` doesn't match, which
+    # are redacted from compact responses and recordings as well
+    _sensitive_keys = ()
+
     @property
     @abstractmethod
     def _required(self) -> dict:
@@ -82,8 +235,6 @@ class SchemaResource(ABC):
     def _schema(self) -> dict:
         """Resource JSON schema without the required part"""
 
-    _merged_schema = None
-
     @property
     @abstractmethod
     def name(self) -> str:
@@ -93,15 +244,19 @@ class SchemaResource(ABC):
     def schema(self) -> dict:
         """
         A property method that'll return the constructed provider schema.
-        Schema MUST be an object and this method must be overridden
+        Schema MUST be an object and this method must be overridden.
+        The merged schema is memoized on the class and shared by all of its instances
 
         :return: JSON schema of the provider
         """
-        if not self._merged_schema:
+        cls = type(self)
+        merged_schema = cls.__dict__.get("_merged_schema")
+        if merged_schema is None:
             log.debug("merging required dict into schema for %s", self.name)
-            self._merged_schema = self._schema.copy()
-            self._merged_schema.update(self._required)
-        return self._merged_schema
+            merged_schema = self._schema.copy()
+            merged_schema.update(self._required)
+            cls._merged_schema = merged_schema
+        return merged_schema
 
     @property
     def arguments(self) -> dict:
@@ -132,12 +287,104 @@ class SchemaResource(ABC):
         :param errors: List of errors if relevant
         """
         status = FAILURE_STATUS if errors else SUCCESS_STATUS
+        context = current_context()
         return Response(
             status=status,
             provider=self.name,
             data=data,
             response=response,
             errors=errors,
+            attempts=context.attempts if context is not None else None,
+            timings=current_timings(),
+            sensitive_keys=self.sensitive_keys,
+        )
+
+    @property
+    def sensitive_keys(self) -> re.Pattern:
+        """A pattern matching the names of data keys whose values are credentials"""
+        return sensitive_keys_pattern(self._sensitive_keys)
+
+    @property
+    def hooks(self) -> lifecycle.HookRegistry:
+        """
+        The :class:`~notifiers.utils.hooks.HookRegistry` of this instance. Its hooks are called after the global ones
+        registered on :data:`notifiers.utils.hooks.hooks`
+        """
+        if self._hooks is None:
+            self._hooks = lifecycle.HookRegistry()
+        return self._hooks
+
+    def _active_hooks(self) -> tuple:
+        instance_hooks = self._hooks
+        if not lifecycle.hooks.active and (instance_hooks is None or not instance_hooks.active):
+            return ()
+        return tuple(registry for registry in (lifecycle.hooks, instance_hooks) if registry is not None and registry.active)
+
+    def _hook_result(self, event: str, result):
+        """
+        Checks a result returned by a hook instead of the result of a send. Resources accept any result
+
+        :param event: The hook event that returned ``result``
+        :param result: The hook's result
+        :return: The result to use
+        """
+        return result
+
+    def _call_with_hooks(self, data: dict, call: callable):
+        """
+        Calls ``call`` with ``data``, running the lifecycle hooks around it
+
+        :param data: Processed data
+        :param call: The callable that sends ``data``
+        :return: The result of ``call``, or of the hooks
+        """
+        registries = self._active_hooks()
+        if not registries:
+            return call(data)
+        result = lifecycle.pre_send(registries, self, data)
+        if result is not None:
+            return self._hook_result(lifecycle.PRE_SEND, result)
+        try:
+            result = call(data)
+        except Exception as e:
+            recovered = lifecycle.on_error(registries, self, data, e)
+            if recovered is None:
+                raise
+            return self._hook_result(lifecycle.ON_ERROR, recovered)
+        final = lifecycle.post_send(registries, self, data, result)
+        return final if final is result else self._hook_result(lifecycle.POST_SEND, final)
+
+    async def _acall_with_hooks(self, data: dict, call: callable):
+        """The coroutine version of :meth:`_call_with_hooks`, for a coroutine function ``call``"""
+        registries = self._active_hooks()
+        if not registries:
+            return await call(data)
+        result = lifecycle.pre_send(registries, self, data)
+        if result is not None:
+            return self._hook_result(lifecycle.PRE_SEND, result)
+        try:
+            result = await call(data)
+        except Exception as e:
+            recovered = lifecycle.on_error(registries, self, data, e)
+            if recovered is None:
+                raise
+            return self._hook_result(lifecycle.ON_ERROR, recovered)
+        final = lifecycle.post_send(registries, self, data, result)
+        return final if final is result else self._hook_result(lifecycle.POST_SEND, final)
+
+    def _send_context(self, data: dict):
+        """
+        Returns a :func:`~notifiers.utils.context.send_context` for sending ``data`` with this resource's settings
+
+        :param data: The processed data that is about to be sent
+        """
+        idempotent = bool(self.idempotency_key and data.get(self.idempotency_key))
+        return send_context(
+            self.name,
+            retry_policy=self.retry_policy,
+            idempotent=idempotent,
+            transport=self.transport,
+            sensitive_keys=self.sensitive_keys,
         )
 
     def _merge_defaults(self, data: dict) -> dict:
@@ -181,6 +428,8 @@ class SchemaResource(ABC):
 
         :raises: :class:`~notifiers.exceptions.SchemaError`
         """
+        import jsonschema
+
         try:
             log.debug("validating provider schema")
             self.validator.check_schema(self.schema)
@@ -189,12 +438,20 @@ class SchemaResource(ABC):
 
     def _validate_data(self, data: dict):
         """
-        Validates data against provider schema. Raises :class:`~notifiers.exceptions.BadArguments` if relevant
+        Validates data against provider schema. Raises :class:`~notifiers.exceptions.BadArguments` if relevant.
+        Data is first checked by the compiled schema validator, and only data it does not accept goes through the full
+        :mod:`jsonschema` validator to decide and report the most relevant error
 
         :param data: Data to validate
         :raises: :class:`~notifiers.exceptions.BadArguments`
         """
         log.debug("validating provided data")
+        fast_validator = type(self).__dict__.get("_fast_validator")
+        if fast_validator is not None and fast_validator(data):
+            return
+
+        from jsonschema.exceptions import best_match
+
         e = best_match(self.validator.iter_errors(data))
         if e:
             custom_error_key = f"error_{e.validator}"
@@ -220,19 +477,57 @@ class SchemaResource(ABC):
         :param data: The raw data passed by the notifiers client
         :return: Processed data
         """
+        span = tracing.span
+        start = perf_counter()
         env_prefix = data.pop("env_prefix", None)
-        environs = self._get_environs(env_prefix)
+        with span("notifiers.get_environs", self.name):
+            environs = self._get_environs(env_prefix)
         if environs:
             data = merge_dicts(data, environs)
+        environs_done = perf_counter()
+
+        with span("notifiers.merge_defaults", self.name):
+            data = self._merge_defaults(data)
+        defaults_done = perf_counter()
+        with span("notifiers.validate_data", self.name):
+            self._validate_data(data)
+        with span("notifiers.validate_data_dependencies", self.name):
+            data = self._validate_data_dependencies(data)
+        validate_done = perf_counter()
+        with span("notifiers.prepare_data", self.name):
+            data = self._prepare_data(data)
+
+        timings = current_timings()
+        if timings is not None:
+            timings.add("environs", environs_done - start)
+            timings.add("defaults", defaults_done - environs_done)
+            timings.add("validate", validate_done - defaults_done)
+            timings.add("prepare", perf_counter() - validate_done)
+        return data
 
-        data = self._merge_defaults(data)
-        self._validate_data(data)
-        data = self._validate_data_dependencies(data)
-        return self._prepare_data(data)
-
-    def __init__(self):
-        self.validator = jsonschema.Draft4Validator(self.schema, format_checker=format_checker)
-        self._validate_schema()
+    def __init__(self, transport=None):
+        """
+        :param transport: A :class:`~notifiers.transports.Transport` to send with instead of the default one
+        """
+        if transport is not None:
+            self.transport = transport
+        # The validators are compiled and the schema checked once per class, then shared by all instances
+        cls = type(self)
+        validator = cls.__dict__.get("_validator")
+        if validator is None:
+            with _schema_lock:
+                validator = cls.__dict__.get("_validator")
+                if validator is None:
+                    import jsonschema
+
+                    from .utils.schema.compiler import compile_schema
+                    from .utils.schema.formats import format_checker
+
+                    self.validator = jsonschema.Draft4Validator(self.schema, format_checker=format_checker)
+                    self._validate_schema()
+                    cls._fast_validator = compile_schema(self.schema, format_checker)
+                    validator = cls._validator = self.validator
+        self.validator = validator
 
 
 class Provider(SchemaResource, ABC):
@@ -240,12 +535,24 @@ class Provider(SchemaResource, ABC):
 
     _resources = {}
 
+    # Client side rate limits, a tuple of :class:`~notifiers.utils.ratelimit.RateLimit` rules
+    rate_limits = ()
+    rate_limiter = rate_limiter
+    # Return a :class:`CompactResponse` from :meth:`notify` unless the call says otherwise. Set on the class to apply
+    # to all providers
+    compact_responses = False
+
     def __repr__(self):
         return f"<Provider:[{self.name.capitalize()}]>"
 
     def __getattr__(self, item):
         if item in self._resources:
-            return self._resources[item]
+            # Resources may be declared as classes, in which case they are created on first access
+            resource = self._resources[item]
+            if isinstance(resource, type):
+                resource = resource(transport=self.transport)
+            self.__dict__[item] = resource
+            return resource
         raise AttributeError(f"{self} does not have a property {item}")
 
     @property
@@ -278,24 +585,173 @@ class Provider(SchemaResource, ABC):
         :param data: Notification data
         """
 
-    def notify(self, raise_on_errors: bool = False, **kwargs) -> Response:
+    def notify(self, raise_on_errors: bool = False, compact: bool | None = None, **kwargs) -> Response | CompactResponse:
         """
         The main method to send notifications. Prepares the data via the
         :meth:`~notifiers.core.SchemaResource._prepare_data` method and then sends the notification
-        via the :meth:`~notifiers.core.Provider._send_notification` method
+        via the :meth:`~notifiers.core.Provider._send_notification` method. The time spent in each phase of the send
+        is recorded in the response's :attr:`~notifiers.core.Response.timings`
 
         :param kwargs: Notification data
         :param raise_on_errors: Should the :meth:`~notifiers.core.Response.raise_on_errors` be invoked immediately
-        :return: A :class:`~notifiers.core.Response` object
+        :param compact: Return a :class:`~notifiers.core.CompactResponse`. Defaults to :attr:`compact_responses`
+        :return: A :class:`~notifiers.core.Response` or :class:`~notifiers.core.CompactResponse` object
         :raises: :class:`~notifiers.exceptions.NotificationError` if ``raise_on_errors`` is set to True and response
          contained errors
+        :raises: :class:`~notifiers.exceptions.RateLimitExceeded` if the provider's rate limiter rejected the send
         """
-        data = self._process_data(**kwargs)
-        rsp = self._send_notification(data)
+        start = perf_counter()
+        try:
+            with timings_context(Timings()) as timings, tracing.span("notifiers.notify", self.name) as span:
+                data = self._process_data(**kwargs)
+                send_start = perf_counter()
+                timings["process"] = send_start - start
+                rsp = self._call_with_hooks(data, self._send)
+                end = perf_counter()
+                span.set_attribute("notifiers.status", rsp.status)
+        except Exception as e:
+            if metrics.enabled:
+                metrics.record_send(self.name, error=e)
+            raise
+        timings["send"] = end - send_start - timings.get("rate_limit", 0.0)
+        timings["total"] = end - start
+        rsp.timings = timings
+        if metrics.enabled:
+            metrics.record_send(self.name, rsp)
+        if raise_on_errors:
+            rsp.raise_on_errors()
+        if compact or (compact is None and self.compact_responses):
+            return rsp.compact()
+        return rsp
+
+    async def anotify(self, raise_on_errors: bool = False, compact: bool | None = None, **kwargs) -> Response | CompactResponse:
+        """
+        The coroutine version of :meth:`notify`. Data is processed on the event loop and the blocking
+        :meth:`~notifiers.core.Provider._send_notification` call runs on a shared executor, reusing pooled connections
+
+        :param kwargs: Notification data
+        :param raise_on_errors: Should the :meth:`~notifiers.core.Response.raise_on_errors` be invoked immediately
+        :param compact: Return a :class:`~notifiers.core.CompactResponse`. Defaults to :attr:`compact_responses`
+        :return: A :class:`~notifiers.core.Response` or :class:`~notifiers.core.CompactResponse` object
+        :raises: :class:`~notifiers.exceptions.NotificationError` if ``raise_on_errors`` is set to True and response
+         contained errors
+        :raises: :class:`~notifiers.exceptions.RateLimitExceeded` if the provider's rate limiter rejected the send
+        """
+        start = perf_counter()
+        try:
+            with timings_context(Timings()) as timings, tracing.span("notifiers.notify", self.name) as span:
+                data = self._process_data(**kwargs)
+                send_start = perf_counter()
+                timings["process"] = send_start - start
+                rsp = await self._acall_with_hooks(data, self._asend)
+                end = perf_counter()
+                span.set_attribute("notifiers.status", rsp.status)
+        except Exception as e:
+            if metrics.enabled:
+                metrics.record_send(self.name, error=e)
+            raise
+        timings["send"] = end - send_start - timings.get("rate_limit", 0.0)
+        timings["total"] = end - start
+        rsp.timings = timings
+        if metrics.enabled:
+            metrics.record_send(self.name, rsp)
         if raise_on_errors:
             rsp.raise_on_errors()
+        if compact or (compact is None and self.compact_responses):
+            return rsp.compact()
         return rsp
 
+    def _hook_result(self, event: str, result) -> Response:
+        """
+        Providers only accept a :class:`Response` from hooks. A copy of it is returned, since the response of a send
+        gets the send's timings and a hook may return the same response for many sends, for example from a cache
+
+        :param event: The hook event that returned ``result``
+        :param result: The hook's result
+        :return: A copy of ``result``
+        :raises: :class:`TypeError` if ``result`` is not a :class:`Response`
+        """
+        if not isinstance(result, Response):
+            raise TypeError(f"{event} hooks of provider '{self.name}' must return a Response or None, got {type(result).__name__}")
+        result = copy.copy(result)
+        result.sensitive_keys = self.sensitive_keys
+        return result
+
+    def _send(self, data: dict) -> Response:
+        """Waits for the rate limiter and sends the processed data"""
+        if self.rate_limits:
+            wait_start = perf_counter()
+            self.rate_limiter.acquire(self.name, self.rate_limits, data)
+            record_timing("rate_limit", perf_counter() - wait_start)
+        with self._send_context(data), tracing.span("notifiers.send_notification", self.name):
+            return self._send_notification(data)
+
+    async def _asend(self, data: dict) -> Response:
+        """The coroutine version of :meth:`_send`"""
+        import asyncio
+
+        from .utils.aio import run_sync
+
+        if self.rate_limits:
+            wait_start = perf_counter()
+            wait = self.rate_limiter.reserve(self.name, self.rate_limits, data)
+            if wait:
+                await asyncio.sleep(wait)
+            record_timing("rate_limit", perf_counter() - wait_start)
+        with self._send_context(data), tracing.span("notifiers.send_notification", self.name):
+            return await run_sync(self._send_notification, data)
+
+    def _warmup_urls(self, data: dict) -> list:
+        """
+        Returns the URLs of the hosts that notifications are sent to, based on :attr:`base_url`. Override if the
+        hosts depend on notification data in other ways
+
+        :param data: Warmup configuration, merged with defaults
+        :return: A list of URLs
+        """
+        url = self.base_url
+        if "{" in url:
+            with contextlib.suppress(KeyError, IndexError):
+                url = url.format(**data)
+        parts = urlsplit(url)
+        if parts.scheme not in {"http", "https"} or "{" in parts.netloc:
+            return []
+        return [url]
+
+    def _warmup(self, data: dict):
+        """
+        Opens connections to the provider hosts via the current transport. Override for providers that don't send
+        over HTTP
+
+        :param data: Warmup configuration, merged with defaults
+        """
+        transport = get_transport()
+        for url in self._warmup_urls(data):
+            transport.warmup(url)
+
+    def warmup(self, keepalive: float | None = None, **config):
+        """
+        Opens connections to the provider ahead of sending, so the first notification doesn't pay for DNS, TCP and TLS
+        setup, or SMTP login. Connections are pooled and reused by later notifications.
+
+        :param keepalive: Seconds between pings that keep the connections alive. Connections are not pinged if not set
+        :param config: Notification data that determines the connections, such as ``host`` and credentials for SMTP
+         or ``domain`` for Zulip. Environs and defaults are used as in :meth:`notify`
+        :raises: The transport error, such as :class:`requests.ConnectionError` or :class:`smtplib.SMTPException`,
+         if connecting failed
+        """
+        env_prefix = config.pop("env_prefix", None)
+        data = self._merge_defaults(merge_dicts(config, self._get_environs(env_prefix)))
+
+        def ping():
+            with self._send_context(data):
+                self._warmup(data)
+
+        ping()
+        if keepalive is not None:
+            key = (self.name, id(self.transport), repr(sorted(data.items())))
+            keepalive_scheduler.schedule(key, ping, keepalive)
+
 
 class ProviderResource(SchemaResource, ABC):
     """The base class that is used to fetch provider related resources like rooms, channels, users etc."""
@@ -310,8 +766,43 @@ class ProviderResource(SchemaResource, ABC):
         pass
 
     def __call__(self, **kwargs):
-        data = self._process_data(**kwargs)
-        return self._get_resource(data)
+        start = perf_counter()
+        try:
+            with tracing.span("notifiers.resource", self.name, **{"notifiers.resource": self.resource_name}):
+                data = self._process_data(**kwargs)
+                result = self._call_with_hooks(data, self._call_resource)
+        except Exception as e:
+            if metrics.enabled:
+                metrics.record_resource_call(self.name, self.resource_name, perf_counter() - start, error=e)
+            raise
+        if metrics.enabled:
+            metrics.record_resource_call(self.name, self.resource_name, perf_counter() - start)
+        return result
+
+    async def acall(self, **kwargs):
+        """The coroutine version of calling the resource, runs :meth:`_get_resource` on a shared executor"""
+        start = perf_counter()
+        try:
+            with tracing.span("notifiers.resource", self.name, **{"notifiers.resource": self.resource_name}):
+                data = self._process_data(**kwargs)
+                result = await self._acall_with_hooks(data, self._acall_resource)
+        except Exception as e:
+            if metrics.enabled:
+                metrics.record_resource_call(self.name, self.resource_name, perf_counter() - start, error=e)
+            raise
+        if metrics.enabled:
+            metrics.record_resource_call(self.name, self.resource_name, perf_counter() - start)
+        return result
+
+    def _call_resource(self, data: dict):
+        with self._send_context(data):
+            return self._get_resource(data)
+
+    async def _acall_resource(self, data: dict):
+        from .utils.aio import run_sync
+
+        with self._send_context(data):
+            return await run_sync(self._get_resource, data)
 
     def __repr__(self):
         return f"<ProviderResource,provider={self.name},resource={self.resource_name}>"
@@ -321,22 +812,11 @@ class ProviderResource(SchemaResource, ABC):
 from .providers import _all_providers  # noqa: E402
 
 
-def get_notifier(provider_name: str, strict: bool = False) -> Provider:
-    """
-    Convenience method to return an instantiated :class:`~notifiers.core.Provider` object according to it ``name``
+def entry_points(**kwargs):
+    """Lazy wrapper around :func:`importlib_metadata.entry_points`"""
+    from importlib_metadata import entry_points as metadata_entry_points
 
-    :param provider_name: The ``name`` of the requested :class:`~notifiers.core.Provider`
-    :param strict: Raises a :class:`ValueError` if the given provider string was not found
-    :return: :class:`Provider` or None
-    :raises ValueError: In case ``strict`` is True and provider not found
-    """
-    providers = get_all_providers()
-    if provider_name in providers:
-        log.debug("found a match for '%s', returning", provider_name)
-        return _all_providers[provider_name]()
-    if strict:
-        raise NoSuchNotifierError(name=provider_name)
-    return None
+    return metadata_entry_points(**kwargs)
 
 
 def load_provider_from_points(entry_points: str) -> Provider:
@@ -400,21 +880,124 @@ def get_providers_from_entry_points(group_name: str = "notifiers") -> dict:
     return {point.name: load_provider_from_points(point.value) for point in entry_points(group=group_name)}
 
 
+class ProviderRegistry:
+    """
+    Holds all known providers, both the built in ones and plugins registered via entry points.
+    Entry points are scanned once, plugin classes are loaded only when first requested and provider instances are
+    created once and reused
+
+    :param group_name: The entry points group name to search plugins in
+    """
+
+    def __init__(self, group_name: str = "notifiers"):
+        self.group_name = group_name
+        self._lock = threading.RLock()
+        self._entry_points = None
+        self._plugins = {}
+        self._instances = {}
+
+    def __repr__(self):
+        return f"<ProviderRegistry,group={self.group_name}>"
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._scan() or name in _all_providers
+
+    def _scan(self) -> dict:
+        if self._entry_points is None:
+            with self._lock:
+                if self._entry_points is None:
+                    log.debug("scanning entry points group '%s'", self.group_name)
+                    self._entry_points = {point.name: point.value for point in entry_points(group=self.group_name)}
+        return self._entry_points
+
+    def names(self) -> list:
+        """Returns a list of all provider names without loading any plugin"""
+        return list(dict.fromkeys([*_all_providers, *self._scan()]))
+
+    def get_class(self, name: str) -> type | None:
+        """
+        Returns a provider class by its name, loading it from its entry point if needed.
+        Plugins take precedence over built in providers with the same name
+
+        :param name: Provider name
+        :return: :class:`Provider` subclass or None
+        """
+        points = self._scan()
+        if name in points:
+            provider_class = self._plugins.get(name)
+            if provider_class is None:
+                with self._lock:
+                    provider_class = self._plugins.get(name)
+                    if provider_class is None:
+                        log.debug("loading provider '%s' from entry point %s", name, points[name])
+                        provider_class = self._plugins[name] = load_provider_from_points(points[name])
+            return provider_class
+        return _all_providers.get(name)
+
+    def get(self, name: str) -> Provider | None:
+        """
+        Returns a reusable provider instance by its name
+
+        :param name: Provider name
+        :return: :class:`Provider` or None
+        """
+        provider_class = self.get_class(name)
+        if provider_class is None:
+            return None
+        provider = self._instances.get(name)
+        if type(provider) is not provider_class:
+            with self._lock:
+                provider = self._instances.get(name)
+                if type(provider) is not provider_class:
+                    provider = self._instances[name] = provider_class()
+        return provider
+
+    def all(self) -> dict:
+        """Returns a dict of all provider names and classes, loading all plugins"""
+        return {name: self.get_class(name) for name in self.names()}
+
+    def refresh(self):
+        """Forgets scanned entry points, loaded plugins and provider instances, to pick up newly installed plugins"""
+        with self._lock:
+            self._entry_points = None
+            self._plugins.clear()
+            self._instances.clear()
+
+
+provider_registry = ProviderRegistry()
+
+
 def get_all_providers() -> dict:
     """Get all providers from the entry points and the default providers.
 
     :return: Dict: A dictionary containing the entry point names as keys and their corresponding values as values.
 
     """
-    default_providers = _all_providers.copy()
-    entry_point_providers = get_providers_from_entry_points()
-    default_providers.update(entry_point_providers)
-    return default_providers
+    return provider_registry.all()
 
 
 def all_providers() -> list:
     """Returns a list of all :class:`~notifiers.core.Provider` names"""
-    return list(get_all_providers().keys())
+    return provider_registry.names()
+
+
+def get_notifier(provider_name: str, strict: bool = False) -> Provider:
+    """
+    Convenience method to return an instantiated :class:`~notifiers.core.Provider` object according to it ``name``.
+    Provider instances are reused across calls, see :class:`ProviderRegistry`
+
+    :param provider_name: The ``name`` of the requested :class:`~notifiers.core.Provider`
+    :param strict: Raises a :class:`ValueError` if the given provider string was not found
+    :return: :class:`Provider` or None
+    :raises ValueError: In case ``strict`` is True and provider not found
+    """
+    provider = provider_registry.get(provider_name)
+    if provider is not None:
+        log.debug("found a match for '%s', returning", provider_name)
+        return provider
+    if strict:
+        raise NoSuchNotifierError(name=provider_name)
+    return None
 
 
 def notify(provider_name: str, **kwargs) -> Response:
@@ -428,3 +1011,137 @@ def notify(provider_name: str, **kwargs) -> Response:
      will raise notification error
     """
     return get_notifier(provider_name=provider_name, strict=True).notify(**kwargs)
+
+
+def _notify_job(job: tuple) -> Response:
+    provider_name, kwargs = job
+    return get_notifier(provider_name=provider_name, strict=True).notify(**kwargs)
+
+
+def notify_many(jobs, max_workers: int | None = None, timeout: float | None = None, ordered: bool = True):
+    """
+    Sends many notifications concurrently on a bounded thread pool. Provider instances and HTTP connections are
+    reused across jobs. A job that raised an exception has that exception as its result, and a job that did not
+    finish within ``timeout`` has a :class:`concurrent.futures.TimeoutError` as its result
+
+    :param jobs: An iterable of ``(provider_name, kwargs)`` pairs
+    :param max_workers: Max number of concurrent sends. Defaults to the number of jobs, up to ``DEFAULT_MAX_WORKERS``
+    :param timeout: Seconds to wait for all jobs to finish. Waits indefinitely if not set
+    :param ordered: If **True** returns a list of results in the order of ``jobs``, otherwise returns an iterator
+     yielding ``(index, result)`` pairs as jobs complete
+    :return: A list of :class:`Response` or exceptions, or an iterator of ``(index, result)`` pairs
+    """
+    import contextvars
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    jobs = list(jobs)
+    max_workers = max_workers or min(DEFAULT_MAX_WORKERS, len(jobs)) or 1
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notifiers-fanout")
+    futures = {executor.submit(contextvars.copy_context().run, _notify_job, job): index for index, job in enumerate(jobs)}
+    results = _iter_results(executor, futures, deadline)
+    if not ordered:
+        return results
+    ordered_results = [None] * len(jobs)
+    for index, result in results:
+        ordered_results[index] = result
+    return ordered_results
+
+
+def notify_stream(jobs, max_workers: int = DEFAULT_MAX_WORKERS):
+    """
+    Sends notifications from an iterable of jobs that does not need to fit in memory, such as lines read from a file.
+    Jobs are read as workers free up, with at most twice ``max_workers`` jobs in flight. Provider instances and HTTP
+    connections are reused across jobs. A job that raised an exception has that exception as its result
+
+    :param jobs: An iterable of ``(provider_name, kwargs)`` pairs
+    :param max_workers: Max number of concurrent sends
+    :return: An iterator yielding ``(index, result)`` pairs as jobs complete
+    """
+    import contextvars
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notifiers-fanout")
+    pending = {}
+
+    def completed():
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in sorted(done, key=pending.get):
+            index = pending.pop(future)
+            error = future.exception()
+            yield index, error if error is not None else future.result()
+
+    try:
+        for index, job in enumerate(jobs):
+            pending[executor.submit(contextvars.copy_context().run, _notify_job, job)] = index
+            if len(pending) >= 2 * max_workers:
+                yield from completed()
+        while pending:
+            yield from completed()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_results(executor, futures: dict, deadline: float | None):
+    import time
+    from concurrent.futures import TimeoutError as FuturesTimeoutError
+    from concurrent.futures import as_completed
+
+    pending = set(futures)
+    timeout = max(deadline - time.monotonic(), 0) if deadline is not None else None
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            pending.discard(future)
+            error = future.exception()
+            yield futures[future], error if error is not None else future.result()
+    except FuturesTimeoutError:
+        log.debug("%s jobs did not finish in time", len(pending))
+        for future in sorted(pending, key=futures.get):
+            future.cancel()
+            yield futures[future], FuturesTimeoutError("Job did not finish in time")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def anotify(provider_name: str, **kwargs) -> Response:
+    """
+    The coroutine version of :func:`notify`
+
+    :param provider_name: Name of the notifier to use
+    :param kwargs: Notification data, dependant on provider
+    :return: :class:`Response`
+    :raises: :class:`~notifiers.exceptions.NoSuchNotifierError` If ``provider_name`` is unknown
+    """
+    return await get_notifier(provider_name=provider_name, strict=True).anotify(**kwargs)
+
+
+def _warmup_job(target, keepalive: float | None):
+    provider_name, config = (target, {}) if isinstance(target, str) else target
+    try:
+        get_notifier(provider_name=provider_name, strict=True).warmup(keepalive=keepalive, **config)
+    except Exception as e:
+        log.warning("warming up %s failed: %s", provider_name, e)
+        return e
+    return None
+
+
+def warmup(targets, keepalive: float | None = None, max_workers: int | None = None) -> list:
+    """
+    Opens connections to several providers concurrently, for example at service startup so the first notifications
+    of an incident are as fast as later ones. See :meth:`Provider.warmup`
+
+    :param targets: An iterable of provider names or ``(provider_name, config)`` pairs
+    :param keepalive: Seconds between pings that keep the connections alive
+    :param max_workers: Max number of concurrent warmups. Defaults to the number of targets, up to ``DEFAULT_MAX_WORKERS``
+    :return: A list with an exception for each target that failed to warm up, or None for each one that succeeded,
+     in the order of ``targets``
+    """
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+
+    targets = list(targets)
+    max_workers = max_workers or min(DEFAULT_MAX_WORKERS, len(targets)) or 1
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notifiers-warmup") as executor:
+        futures = [executor.submit(contextvars.copy_context().run, _warmup_job, target, keepalive) for target in targets]
+        return [future.result() for future in futures]
@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+
 class NotifierException(Exception):
     """Base notifier exception. Catch this to catch all of :mod:`notifiers` errors"""
 
@@ -97,3 +100,45 @@ class NoSuchNotifierError(NotifierException):
 
     def __repr__(self):
         return f"<NoSuchNotifierError: {self.name}>"
+
+
+class RateLimitExceeded(NotifierException):
+    """
+    Raised when a notification is rejected by the client side rate limiter
+
+    :param retry_after: Seconds until the notification would be allowed
+    :param args: Exception arguments
+    :param kwargs: Exception kwargs
+    """
+
+    def __init__(self, *args, retry_after: float | None = None, **kwargs):
+        self.retry_after = retry_after
+        kwargs["message"] = f"Rate limit of {kwargs.get('provider')} exceeded"
+        if retry_after is not None:
+            kwargs["message"] += f", retry after {retry_after:.2f} seconds"
+        super().__init__(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<RateLimitExceeded: {self.message}>"
+
+
+class CircuitOpenError(NotifierException):
+    """
+    Raised instead of sending a request to a provider endpoint whose circuit breaker is open
+
+    :param endpoint: The ``provider:host`` name of the endpoint
+    :param retry_after: Seconds until the circuit lets a probe request through
+    :param args: Exception arguments
+    :param kwargs: Exception kwargs
+    """
+
+    def __init__(self, *args, endpoint: str | None = None, retry_after: float | None = None, **kwargs):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        kwargs["message"] = f"Circuit of {endpoint} is open"
+        if retry_after is not None:
+            kwargs["message"] += f", retry after {retry_after:.2f} seconds"
+        super().__init__(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<CircuitOpenError: {self.message}>"
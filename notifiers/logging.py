@@ -1,30 +1,76 @@
 from __future__ import annotations
 
+import contextvars
 import copy
 import logging
+import queue
 import sys
+import threading
+import time
 
 import notifiers
 from notifiers.exceptions import NotifierException
 
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_CLOSE_TIMEOUT = 10.0
+
+DROP = "drop"
+BLOCK = "block"
+
+_STOP = object()
+
 
 class NotificationHandler(logging.Handler):
     """A :class:`logging.Handler` that enables directly sending log messages to notifiers"""
 
-    def __init__(self, provider: str, defaults: dict | None = None, **kwargs):
+    def __init__(
+        self,
+        provider: str,
+        defaults: dict | None = None,
+        background: bool = False,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        workers: int = 1,
+        on_full: str = DROP,
+        **kwargs,
+    ):
         """
         Sets ups the handler
 
         :param provider: Provider name to use
         :param defaults: Default provider data to use. Can fallback to environs
+        :param background: Send notifications from background worker threads instead of the logging thread
+        :param queue_size: Max number of records waiting to be sent in background mode
+        :param workers: Number of background worker threads
+        :param on_full: What to do when the queue is full, ``drop`` the record or ``block`` until there's room
         :param kwargs: Additional kwargs
         """
+        if on_full not in {DROP, BLOCK}:
+            raise ValueError(f"on_full must be one of '{DROP}' or '{BLOCK}', got '{on_full}'")
         self.defaults = defaults or {}
         self.provider = None
         self.fallback = None
         self.fallback_defaults = None
+        self.on_full = on_full
+        self.dropped = 0
+        self.queue = None
+        self._workers = []
         self.init_providers(provider, kwargs)
         super().__init__(**kwargs)
+        if background:
+            self.start_workers(queue_size, workers)
+
+    def start_workers(self, queue_size: int, workers: int):
+        """
+        Starts the background delivery queue and worker threads
+
+        :param queue_size: Max number of records waiting to be sent
+        :param workers: Number of worker threads
+        """
+        self.queue = queue.Queue(maxsize=queue_size)
+        for index in range(workers):
+            worker = threading.Thread(target=self._work, name=f"notifiers-handler-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
 
     def init_providers(self, provider, kwargs):
         """
@@ -48,11 +94,81 @@ class NotificationHandler(logging.Handler):
         """
         data = copy.deepcopy(self.defaults)
         data["message"] = self.format(record)
+        if self.queue is None:
+            self._deliver(record, data)
+            return
+        try:
+            # The context is sent along so the record is delivered under the trace that logged it
+            self.queue.put((contextvars.copy_context(), record, data), block=self.on_full == BLOCK)
+        except queue.Full:
+            self.dropped += 1
+
+    def _deliver(self, record, data: dict):
         try:
             self.provider.notify(raise_on_errors=True, **data)
         except Exception:
             self.handleError(record)
 
+    def _work(self):
+        # Kept locally, workers still sending when close() times out outlive self.queue
+        work_queue = self.queue
+        while True:
+            item = work_queue.get()
+            try:
+                if item is _STOP:
+                    return
+                context, record, data = item
+                try:
+                    context.run(self._deliver, record, data)
+                except Exception:
+                    # A failing fallback must not kill the worker, or the queue would never drain
+                    logging.Handler.handleError(self, record)
+            finally:
+                work_queue.task_done()
+
+    def flush(self, timeout: float | None = 0) -> bool:
+        """
+        Waits for all queued records to be sent when in background mode. Doesn't wait by default, since
+        :func:`logging.shutdown` calls it right before :meth:`close`, which waits for the queue itself
+
+        :param timeout: Max seconds to wait. Waits indefinitely if None
+        :return: **True** if the queue was drained
+        """
+        if self.queue is None:
+            return True
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = DEFAULT_CLOSE_TIMEOUT):
+        """
+        Sends all queued records and stops background workers before closing the handler.
+        Called automatically by :func:`logging.shutdown` on interpreter exit
+
+        :param timeout: Max seconds to wait for queued records to be sent
+        """
+        if self.queue is not None:
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            self.flush(timeout)
+            for _ in self._workers:
+                remaining = max(deadline - time.monotonic(), 0) if deadline is not None else None
+                try:
+                    self.queue.put(_STOP, timeout=remaining)
+                except queue.Full:
+                    # Still full after the timeout. Workers are daemon threads, so busy ones don't block exiting
+                    break
+            for worker in self._workers:
+                remaining = max(deadline - time.monotonic(), 0) if deadline is not None else None
+                worker.join(remaining)
+            self._workers = []
+            self.queue = None
+        super().close()
+
     def __repr__(self):
         level = logging.getLevelName(self.level)
         name = self.provider.name
@@ -69,7 +185,6 @@ class NotificationHandler(logging.Handler):
             t, v, tb = sys.exc_info()
             if issubclass(t, NotifierException) and self.fallback:
                 msg = f"Could not log msg to provider '{self.provider.name}'!\n{v}"
-                self.fallback_defaults["message"] = msg
-                self.fallback.notify(**self.fallback_defaults)
+                self.fallback.notify(**{**self.fallback_defaults, "message": msg})
             else:
                 super().handleError(record)
@@ -1,43 +1,70 @@
-from . import (
-    dingtalk,
-    email,
-    gitter,
-    gmail,
-    icloud,
-    join,
-    mailgun,
-    notify,
-    pagerduty,
-    popcornnotify,
-    pushbullet,
-    pushover,
-    simplepush,
-    slack,
-    statuspage,
-    telegram,
-    twilio,
-    victorops,
-    zulip,
-)
-
-_all_providers = {
-    "pushover": pushover.Pushover,
-    "simplepush": simplepush.SimplePush,
-    "slack": slack.Slack,
-    "email": email.SMTP,
-    "dingtalk": dingtalk.DingTalk,
-    "gmail": gmail.Gmail,
-    "icloud": icloud.iCloud,
-    "telegram": telegram.Telegram,
-    "gitter": gitter.Gitter,
-    "pushbullet": pushbullet.Pushbullet,
-    "join": join.Join,
-    "zulip": zulip.Zulip,
-    "twilio": twilio.Twilio,
-    "pagerduty": pagerduty.PagerDuty,
-    "mailgun": mailgun.MailGun,
-    "popcornnotify": popcornnotify.PopcornNotify,
-    "statuspage": statuspage.Statuspage,
-    "victorops": victorops.VictorOps,
-    "notify": notify.Notify,
+from __future__ import annotations
+
+import importlib
+from collections.abc import MutableMapping
+
+_provider_paths = {
+    "pushover": "notifiers.providers.pushover:Pushover",
+    "simplepush": "notifiers.providers.simplepush:SimplePush",
+    "slack": "notifiers.providers.slack:Slack",
+    "email": "notifiers.providers.email:SMTP",
+    "dingtalk": "notifiers.providers.dingtalk:DingTalk",
+    "gmail": "notifiers.providers.gmail:Gmail",
+    "icloud": "notifiers.providers.icloud:iCloud",
+    "telegram": "notifiers.providers.telegram:Telegram",
+    "gitter": "notifiers.providers.gitter:Gitter",
+    "pushbullet": "notifiers.providers.pushbullet:Pushbullet",
+    "join": "notifiers.providers.join:Join",
+    "zulip": "notifiers.providers.zulip:Zulip",
+    "twilio": "notifiers.providers.twilio:Twilio",
+    "pagerduty": "notifiers.providers.pagerduty:PagerDuty",
+    "mailgun": "notifiers.providers.mailgun:MailGun",
+    "popcornnotify": "notifiers.providers.popcornnotify:PopcornNotify",
+    "statuspage": "notifiers.providers.statuspage:Statuspage",
+    "victorops": "notifiers.providers.victorops:VictorOps",
+    "notify": "notifiers.providers.notify:Notify",
 }
+
+
+class LazyProviders(MutableMapping):
+    """
+    A mapping of provider names to provider classes. Values can be given as ``module_path:class_name`` strings, in
+    which case the provider module is imported only when that provider is first looked up
+
+    :param providers: Mapping of provider names to classes or ``module_path:class_name`` strings
+    """
+
+    def __init__(self, providers: dict):
+        self._providers = dict(providers)
+
+    def __repr__(self):
+        return f"<LazyProviders,providers={list(self._providers)}>"
+
+    def __getitem__(self, name: str) -> type:
+        provider = self._providers[name]
+        if isinstance(provider, str):
+            module_path, class_name = provider.split(":", 1)
+            provider = self._providers[name] = getattr(importlib.import_module(module_path), class_name)
+        return provider
+
+    def __setitem__(self, name: str, provider):
+        self._providers[name] = provider
+
+    def __delitem__(self, name: str):
+        del self._providers[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._providers
+
+    def __iter__(self):
+        return iter(self._providers)
+
+    def __len__(self) -> int:
+        return len(self._providers)
+
+    def copy(self) -> dict:
+        """Returns a regular dict of all providers, importing all of them"""
+        return dict(self.items())
+
+
+_all_providers = LazyProviders(_provider_paths)
@@ -1,5 +1,8 @@
+import json
+
 from ..core import Provider, Response
 from ..utils import requests
+from ..utils.ratelimit import RateLimit
 
 
 class DingTalk(Provider):
@@ -9,10 +12,10 @@ class DingTalk(Provider):
     site_url = "https://open.dingtalk.com/document/"
     name = "dingtalk"
     path_to_errors = ("errmsg",)
+    rate_limits = (RateLimit(20, per=60, key="access_token"),)
 
     _required = {
         "required": ["access_token", "msg_data"],
-        "oneOf": [{"required": ["msg_data.text"]}, {"required": ["msg_data.markdown"]}, {"required": ["msg_data.link"]}, {"required": ["msg_data.actionCard"]}],
     }
 
     _schema = {
@@ -63,6 +66,7 @@ class DingTalk(Provider):
                     },
                 },
                 "required": ["msgtype"],
+                "oneOf": [{"required": ["text"]}, {"required": ["markdown"]}, {"required": ["link"]}, {"required": ["actionCard"]}],
                 "additionalProperties": False,
             },
             "at": {
@@ -89,7 +93,11 @@ class DingTalk(Provider):
         构造钉钉机器人要求的消息格式
         文档: https://open.dingtalk.com/document/orgapp-server/custom-robot-access
         """
-        payload = {"msgtype": data["msg_data"]["msgtype"], data["msg_data"]["msgtype"]: data["msg_data"][data["msg_data"]["msgtype"]]}
+        payload = {
+            "access_token": data["access_token"],
+            "msgtype": data["msg_data"]["msgtype"],
+            data["msg_data"]["msgtype"]: data["msg_data"][data["msg_data"]["msgtype"]],
+        }
 
         if "at" in data:
             payload["at"] = data["at"]
@@ -104,8 +112,22 @@ class DingTalk(Provider):
     def _send_notification(self, data: dict) -> Response:
         url = self._prepare_url()
         params = {"access_token": data["access_token"]}
-        payload = self._prepare_data(data)
-
-        response = requests.post(url, params=params, json=payload, headers={"Content-Type": "application/json", "Accept": "application/json"})
+        payload = {key: value for key, value in data.items() if key != "access_token"}
 
-        return self._create_response(response)
+        response, errors = requests.post(
+            url,
+            params=params,
+            json=payload,
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+            path_to_errors=self.path_to_errors,
+        )
+        # 钉钉在请求失败时同样返回200, 错误信息在errcode中
+        if not errors:
+            try:
+                rsp = response.json()
+            except json.decoder.JSONDecodeError:
+                errors = [response.text]
+            else:
+                if rsp.get("errcode"):
+                    errors = [rsp.get("errmsg", "Unknown error")]
+        return self.create_response(data, response, errors)
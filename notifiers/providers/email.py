@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import logging
 import mimetypes
 import smtplib
 import socket
@@ -9,13 +12,29 @@ from pathlib import Path
 from smtplib import SMTPAuthenticationError, SMTPSenderRefused, SMTPServerDisconnected
 
 from ..core import Provider, Response
+from ..transports import get_transport
+from ..utils.circuit import circuit_breakers
 from ..utils.schema.helpers import list_to_commas, one_or_more
+from ..utils.timings import timed
+
+log = logging.getLogger("notifiers")
 
 DEFAULT_SUBJECT = "New email from 'notifiers'!"
-DEFAULT_FROM = f"notifiers@{socket.getfqdn()}"
 DEFAULT_SMTP_HOST = "localhost"
 
 
+@functools.lru_cache(maxsize=None)
+def default_from() -> str:
+    """Returns the default FROM address. Resolved on first use since :func:`socket.getfqdn` can block on DNS"""
+    return f"notifiers@{socket.getfqdn()}"
+
+
+def __getattr__(name: str):
+    if name == "DEFAULT_FROM":
+        return default_from()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class SMTP(Provider):
     """Send emails via SMTP"""
 
@@ -108,16 +127,11 @@ class SMTP(Provider):
         maintype, subtype = ctype.split("/", 1)
         return maintype, subtype
 
-    def __init__(self):
-        super().__init__()
-        self.smtp_server = None
-        self.configuration = None
-
     @property
     def defaults(self) -> dict:
         return {
             "subject": DEFAULT_SUBJECT,
-            "from": DEFAULT_FROM,
+            "from": default_from(),
             "host": DEFAULT_SMTP_HOST,
             "port": 25,
             "tls": False,
@@ -160,31 +174,59 @@ class SMTP(Provider):
                 filename=attachment.name,
             )
 
-    def _connect_to_server(self, data: dict):
-        self.smtp_server = smtplib.SMTP_SSL if data["ssl"] else smtplib.SMTP
-        self.smtp_server = self.smtp_server(data["host"], data["port"])
-        self.configuration = self._get_configuration(data)
+    def _connect_to_server(self, data: dict) -> smtplib.SMTP:
+        smtp_server = smtplib.SMTP_SSL if data["ssl"] else smtplib.SMTP
+        with timed("connect"):
+            smtp_server = smtp_server(data["host"], data["port"])
         if data["tls"] and not data["ssl"]:
-            self.smtp_server.ehlo()
-            self.smtp_server.starttls()
+            with timed("tls"):
+                smtp_server.ehlo()
+                smtp_server.starttls()
 
         if data["login"] and data.get("username"):
-            self.smtp_server.login(data["username"], data["password"])
+            smtp_server.login(data["username"], data["password"])
+        return smtp_server
 
     @staticmethod
     def _get_configuration(data: dict) -> tuple:
-        return data["host"], data["port"], data.get("username")
+        """
+        Returns the key of pooled connections that can be used for this data. It holds a digest of the password, so
+        connections authenticated with another password are never reused
+        """
+        password = data.get("password")
+        password_digest = hashlib.sha256(password.encode()).hexdigest() if password else None
+        return data["host"], data["port"], data.get("username"), password_digest, data["tls"], data["ssl"], data["login"]
+
+    def _send_message(self, data: dict, email: EmailMessage):
+        if not circuit_breakers.enabled:
+            self._send_pooled(data, email)
+            return
+        breaker = circuit_breakers.get(self.name, f"{data['host']}:{data['port']}")
+        breaker.before_request()
+        success = False
+        try:
+            self._send_pooled(data, email)
+            success = True
+        except smtplib.SMTPException as e:
+            # The server is up if it responded, unless it refused or dropped the connection
+            success = not isinstance(e, (smtplib.SMTPConnectError, SMTPServerDisconnected))
+            raise
+        finally:
+            breaker.record(success)
+
+    def _warmup(self, data: dict):
+        get_transport().warmup_mail(self._get_configuration(data), lambda: self._connect_to_server(data))
+
+    def _send_pooled(self, data: dict, email: EmailMessage):
+        get_transport().send_mail(self._get_configuration(data), lambda: self._connect_to_server(data), email)
 
     def _send_notification(self, data: dict) -> Response:
         errors = None
         try:
-            configuration = self._get_configuration(data)
-            if not self.configuration or not self.smtp_server or self.configuration != configuration:
-                self._connect_to_server(data)
             email = self._build_email(data)
             if data.get("attachments"):
                 self._add_attachments(data["attachments"], email)
-            self.smtp_server.send_message(email)
+            self._send_message(data, email)
         except (
             SMTPServerDisconnected,
             SMTPSenderRefused,
@@ -65,7 +65,7 @@ class Gitter(GitterMixin, Provider):
     message_url = "/{room_id}/chatMessages"
     site_url = "https://gitter.im"
 
-    _resources = {"rooms": GitterRooms()}
+    _resources = {"rooms": GitterRooms}
 
     _required = {"required": ["message", "token", "room_id"]}
     _schema = {
@@ -1,9 +1,8 @@
 import json
 
-import requests
-
 from ..core import Provider, ProviderResource, Response
 from ..exceptions import ResourceError
+from ..utils import requests
 from ..utils.schema.helpers import list_to_commas, one_or_more
 
 
@@ -15,25 +14,16 @@ class JoinMixin:
 
     @staticmethod
     def _join_request(url: str, data: dict) -> tuple:
-        # Can 't use generic requests util since API doesn't always return error status
-        errors = None
-        try:
-            response = requests.get(url, params=data)
-            response.raise_for_status()
-            rsp = response.json()
-            if not rsp["success"]:
-                errors = [rsp["errorMessage"]]
-        except requests.RequestException as e:
-            if e.response is not None:
-                response = e.response
-                try:
-                    errors = [response.json()["errorMessage"]]
-                except json.decoder.JSONDecodeError:
-                    errors = [response.text]
+        # The API doesn't always return an error status, failures are flagged in the response body as well
+        response, errors = requests.get(url, params=data, path_to_errors=("errorMessage",))
+        if not errors:
+            try:
+                rsp = response.json()
+            except json.decoder.JSONDecodeError:
+                errors = [response.text]
             else:
-                response = None
-                errors = [str(e)]
-
+                if not rsp.get("success"):
+                    errors = [rsp.get("errorMessage", "Unknown error")]
         return response, errors
 
 
@@ -70,7 +60,7 @@ class Join(JoinMixin, Provider):
     push_url = "/sendPush"
     site_url = "https://joaoapps.com/join/api/"
 
-    _resources = {"devices": JoinDevices()}
+    _resources = {"devices": JoinDevices}
 
     _required = {
         "dependencies": {"smstext": ["smsnumber"], "callnumber": ["smsnumber"]},
@@ -192,7 +182,6 @@ class Join(JoinMixin, Provider):
         return data
 
     def _send_notification(self, data: dict) -> Response:
-        # Can 't use generic requests util since API doesn't always return error status
         url = self.base_url + self.push_url
         response, errors = self._join_request(url, data)
         return self.create_response(data, response, errors)
@@ -2,6 +2,7 @@ import json
 
 from ..core import Provider, Response
 from ..utils import requests
+from ..utils.multipart import MultipartEncoder
 from ..utils.schema.helpers import one_or_more
 
 
@@ -193,17 +194,19 @@ class MailGun(Provider):
         domain = data.pop("domain")
         url = f"{base_url}/v3/{domain}/messages"
         auth = "api", data.pop("api_key")
-        files = []
-        if data.get("attachment"):
-            files += requests.file_list_for_request(data["attachment"], "attachment")
-        if data.get("inline"):
-            files += requests.file_list_for_request(data["inline"], "inline")
+        headers = {}
+        body = data
+        if data.get("attachment") or data.get("inline"):
+            fields = {key: value for key, value in data.items() if key not in ("attachment", "inline")}
+            files = [(key, path) for key in ("attachment", "inline") for path in data.get(key) or []]
+            body = MultipartEncoder(fields, files)
+            headers["Content-Type"] = body.content_type
 
         response, errors = requests.post(
             url=url,
-            data=data,
+            data=body,
             auth=auth,
-            files=files,
+            headers=headers,
             path_to_errors=self.path_to_errors,
         )
         return self.create_response(data, response, errors)
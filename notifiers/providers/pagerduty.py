@@ -9,6 +9,7 @@ class PagerDuty(Provider):
     base_url = "https://events.pagerduty.com/v2/enqueue"
     site_url = "https://v2.developer.pagerduty.com/"
     path_to_errors = ("errors",)
+    idempotency_key = "dedup_key"
 
     __payload_attributes = [
         "message",
@@ -45,6 +45,7 @@ class Pushbullet(PushbulletMixin, Provider):
 
     base_url = "https://api.pushbullet.com/v2/pushes"
     site_url = "https://www.pushbullet.com"
+    idempotency_key = "guid"
 
     __type = {
         "type": "string",
@@ -52,7 +53,7 @@ class Pushbullet(PushbulletMixin, Provider):
         "enum": ["note", "link"],
     }
 
-    _resources = {"devices": PushbulletDevices()}
+    _resources = {"devices": PushbulletDevices}
     _required = {"required": ["message", "token"]}
     _schema = {
         "type": "object",
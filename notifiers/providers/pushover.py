@@ -1,6 +1,10 @@
+import time
+
 from ..core import Provider, ProviderResource, Response
 from ..exceptions import ResourceError
 from ..utils import requests
+from ..utils.multipart import MultipartEncoder
+from ..utils.ratelimit import RateLimit, TokenBucket
 from ..utils.schema.helpers import list_to_commas, one_or_more
 
 
@@ -64,8 +68,14 @@ class Pushover(PushoverMixin, Provider):
     site_url = "https://pushover.net/"
     name = "pushover"
 
-    _resources = {"sounds": PushoverSounds(), "limits": PushoverLimits()}
+    _resources = {"sounds": PushoverSounds, "limits": PushoverLimits}
+
+    # Monthly message quota per application token, only applied once seeded via seed_rate_limits()
+    quota = RateLimit(None, key="token")
+    rate_limits = (quota,)
 
+    # User and group keys identify recipients and let anyone with the app token message them
+    _sensitive_keys = ("user",)
     _required = {"required": ["user", "message", "token"]}
     _schema = {
         "type": "object",
@@ -151,18 +161,33 @@ class Pushover(PushoverMixin, Provider):
     def _send_notification(self, data: dict) -> Response:
         url = self.base_url + self.message_url
         headers = {}
-        files = []
+        body = data
         if data.get("attachment"):
-            files = requests.file_list_for_request(data["attachment"], "attachment")
+            fields = {key: value for key, value in data.items() if key != "attachment"}
+            body = MultipartEncoder(fields, [("attachment", path) for path in data["attachment"]])
+            headers["Content-Type"] = body.content_type
         response, errors = requests.post(
             url,
-            data=data,
+            data=body,
             headers=headers,
-            files=files,
             path_to_errors=self.path_to_errors,
         )
         return self.create_response(data, response, errors)
 
+    def seed_rate_limits(self, **kwargs) -> dict:
+        """
+        Fetches the application's remaining message quota via the ``limits`` resource and limits sends with the same
+        token to it until the quota resets
+
+        :param kwargs: ``limits`` resource data, usually ``token``
+        :return: The ``limits`` resource response
+        """
+        limits = self.limits(**kwargs)
+        data = self.limits._process_data(**kwargs)
+        bucket = TokenBucket(rate=0, capacity=limits["remaining"], expires_in=max(limits["reset"] - time.time(), 0))
+        self.rate_limiter.seed(self.name, self.quota, data, bucket)
+        return limits
+
     @property
     def metadata(self) -> dict:
         m = super().metadata
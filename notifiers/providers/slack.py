@@ -1,5 +1,6 @@
 from ..core import Provider, Response
 from ..utils import requests
+from ..utils.ratelimit import RateLimit
 
 
 class Slack(Provider):
@@ -8,6 +9,7 @@ class Slack(Provider):
     base_url = "https://hooks.slack.com/services/"
     site_url = "https://api.slack.com/incoming-webhooks"
     name = "slack"
+    rate_limits = (RateLimit(1, key="webhook_url"),)
 
     __fields = {
         "type": "array",
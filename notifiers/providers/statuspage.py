@@ -49,7 +49,7 @@ class Statuspage(StatuspageMixin, Provider):
 
     incidents_url = "incidents.json"
 
-    _resources = {"components": StatuspageComponents()}
+    _resources = {"components": StatuspageComponents}
 
     realtime_statuses = ["investigating", "identified", "monitoring", "resolved"]
 
@@ -1,6 +1,8 @@
 from ..core import Provider, ProviderResource, Response
 from ..exceptions import ResourceError
 from ..utils import requests
+from ..utils.ratelimit import RateLimit
+from ..utils.retry import RetryPolicy
 
 
 class TelegramMixin:
@@ -9,6 +11,8 @@ class TelegramMixin:
     base_url = "https://api.telegram.org/bot{token}"
     name = "telegram"
     path_to_errors = ("description",)
+    # Telegram returns the flood control wait time in the response body
+    retry_policy = RetryPolicy(retry_after_path=("parameters", "retry_after"))
 
 
 class TelegramUpdates(TelegramMixin, ProviderResource):
@@ -44,8 +48,9 @@ class Telegram(TelegramMixin, Provider):
 
     site_url = "https://core.telegram.org/"
     push_endpoint = "/sendMessage"
+    rate_limits = (RateLimit(30, key="token"), RateLimit(1, key=("token", "chat_id")))
 
-    _resources = {"updates": TelegramUpdates()}
+    _resources = {"updates": TelegramUpdates}
 
     _required = {"required": ["message", "chat_id", "token"]}
     _schema = {
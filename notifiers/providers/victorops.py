@@ -9,6 +9,8 @@ class VictorOps(Provider):
     site_url = "https://portal.victorops.com/dash/{ORGANIZATION_ID}#/advanced/rest"
     name = "victorops"
 
+    # The REST URL holds the routing key
+    _sensitive_keys = ("rest_url",)
     _required = {
         "required": [
             "rest_url",
@@ -54,6 +54,9 @@ class Zulip(Provider):
     def defaults(self) -> dict:
         return {"type": "stream"}
 
+    def _warmup_urls(self, data: dict) -> list:
+        return [data["server"]] if data.get("server") else super()._warmup_urls(data)
+
     def _prepare_data(self, data: dict) -> dict:
         base_url = self.base_url.format(domain=data.pop("domain")) if data.get("domain") else data.pop("server")
         data["url"] = base_url + self.api_endpoint
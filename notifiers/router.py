@@ -0,0 +1,282 @@
+"""Failover routing of notifications across several providers"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+
+from .core import Response, get_notifier
+from .exceptions import NotifierException
+
+log = logging.getLogger("notifiers")
+
+ORDERED = "ordered"
+WEIGHTED = "weighted"
+FASTEST = "fastest"
+
+DEFAULT_WINDOW = 100
+DEFAULT_MIN_SAMPLES = 5
+DEFAULT_MAX_ERROR_RATE = 0.5
+DEFAULT_HEDGE_DELAY = 2.0
+DEFAULT_MAX_WORKERS = 8
+
+
+class TargetStats:
+    """
+    Rolling latency and error stats of a routing target over its last ``window`` sends
+
+    :param window: Number of sends to keep
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self._lock = threading.Lock()
+        self._sends = deque(maxlen=window)
+
+    def __repr__(self):
+        return f"<TargetStats,sends={len(self._sends)},error_rate={self.error_rate:.2f}>"
+
+    def __len__(self):
+        return len(self._sends)
+
+    def record(self, latency: float, ok: bool):
+        with self._lock:
+            self._sends.append((latency, ok))
+
+    @property
+    def error_rate(self) -> float:
+        """Rate of failed sends, 0 if there were none"""
+        sends = list(self._sends)
+        return sum(not ok for _, ok in sends) / len(sends) if sends else 0.0
+
+    def percentile(self, percent: float) -> float | None:
+        """
+        Returns a latency percentile of successful sends, using the nearest rank method
+
+        :param percent: The percentile, between 0 and 100
+        :return: Latency in seconds, or None if there were no successful sends
+        """
+        latencies = sorted(latency for latency, ok in list(self._sends) if ok)
+        if not latencies:
+            return None
+        return latencies[max(math.ceil(percent / 100 * len(latencies)) - 1, 0)]
+
+    def snapshot(self) -> dict:
+        return {"sends": len(self._sends), "error_rate": self.error_rate, "p50": self.percentile(50), "p95": self.percentile(95)}
+
+
+class Target:
+    """
+    A routing target, a provider and the data to send with it
+
+    :param provider: Provider name
+    :param defaults: Provider data, merged with the data of each notification
+    :param weight: Relative share of notifications sent to this target first when using ``weighted`` routing
+    :param window: Number of sends to keep stats of
+    :param name: Target name used in stats. Defaults to the provider name
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        defaults: dict | None = None,
+        weight: float = 1.0,
+        window: int = DEFAULT_WINDOW,
+        name: str | None = None,
+    ):
+        self.provider = get_notifier(provider, strict=True)
+        self.defaults = defaults or {}
+        self.weight = weight
+        self.name = name or self.provider.name
+        self.stats = TargetStats(window)
+
+    def __repr__(self):
+        return f"<Target,name={self.name},weight={self.weight}>"
+
+    def notify(self, **kwargs) -> Response:
+        """Sends a notification via the target provider and records its outcome"""
+        start = time.monotonic()
+        try:
+            rsp = self.provider.notify(**{**self.defaults, **kwargs})
+        except NotifierException:
+            self.stats.record(time.monotonic() - start, ok=False)
+            raise
+        self.stats.record(time.monotonic() - start, ok=rsp.ok)
+        return rsp
+
+
+class Router:
+    """
+    Sends each notification to the first target that delivers it. Targets are tried in an order that depends on the
+    ``strategy``, with unhealthy targets, whose recent error rate is above ``max_error_rate``, tried last:
+
+    - ``ordered``: in the given order
+    - ``weighted``: in a random order, where targets with a higher weight are more likely to be first
+    - ``fastest``: by their p95 latency, targets without enough stats first so they get measured
+
+    A target fails over to the next one when its response has errors or it raised a
+    :class:`~notifiers.exceptions.NotifierException`. When ``hedge`` is set, the next target is also sent to if a
+    target hasn't answered within its p95 latency, and the first one to deliver wins.
+
+    :param targets: A list of :class:`Target` objects or ``(provider_name, defaults)`` pairs
+    :param strategy: ``ordered``, ``weighted`` or ``fastest``
+    :param hedge: Send to the next target if a target is slow to answer. Default is **False**
+    :param hedge_delay: Seconds to wait for a target without enough stats before hedging
+    :param max_error_rate: Error rate above which a target is considered unhealthy
+    :param min_samples: Number of sends needed before a target's stats are used
+    :param max_workers: Max number of concurrent sends when hedging
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        targets: list,
+        strategy: str = ORDERED,
+        hedge: bool = False,
+        hedge_delay: float = DEFAULT_HEDGE_DELAY,
+        max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        if strategy not in {ORDERED, WEIGHTED, FASTEST}:
+            raise ValueError(f"strategy must be one of '{ORDERED}', '{WEIGHTED}' or '{FASTEST}', got '{strategy}'")
+        if not targets:
+            raise ValueError("at least one target is required")
+        self.targets = [target if isinstance(target, Target) else Target(*target) for target in targets]
+        self.strategy = strategy
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<Router,strategy={self.strategy},targets={[target.name for target in self.targets]}>"
+
+    def _has_stats(self, target: Target) -> bool:
+        return len(target.stats) >= self.min_samples
+
+    def _is_healthy(self, target: Target) -> bool:
+        return not self._has_stats(target) or target.stats.error_rate <= self.max_error_rate
+
+    def _weighted_order(self) -> list:
+        # Weighted random sampling without replacement (Efraimidis-Spirakis)
+        return sorted(self.targets, key=lambda target: random.random() ** (1 / target.weight) if target.weight > 0 else 0, reverse=True)
+
+    def ordered_targets(self) -> list:
+        """Returns the targets in the order they are tried for the next notification"""
+        if self.strategy == WEIGHTED:
+            targets = self._weighted_order()
+        elif self.strategy == FASTEST:
+            targets = sorted(self.targets, key=lambda target: (target.stats.percentile(95) or 0.0) if self._has_stats(target) else -1.0)
+        else:
+            targets = list(self.targets)
+        # Sorting is stable, so healthy targets keep their order
+        return sorted(targets, key=lambda target: not self._is_healthy(target))
+
+    def _hedge_delay(self, target: Target) -> float:
+        p95 = target.stats.percentile(95) if self._has_stats(target) else None
+        return p95 if p95 is not None else self.hedge_delay
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="notifiers-router")
+        return self._executor
+
+    def notify(self, raise_on_errors: bool = False, **kwargs) -> Response:
+        """
+        Sends a notification via the first target that delivers it
+
+        :param kwargs: Notification data, merged over each target's defaults
+        :param raise_on_errors: Should the :meth:`~notifiers.core.Response.raise_on_errors` be invoked if all
+         targets failed
+        :return: The :class:`~notifiers.core.Response` of the target that delivered the notification, or of the last
+         target that failed
+        :raises: The :class:`~notifiers.exceptions.NotifierException` of the last target if all targets failed and
+         none of them returned a response
+        """
+        targets = self.ordered_targets()
+        rsp, error = self._send_hedged(targets, kwargs) if self.hedge and len(targets) > 1 else self._send(targets, kwargs)
+        if rsp is None:
+            raise error
+        if raise_on_errors:
+            rsp.raise_on_errors()
+        return rsp
+
+    def _send(self, targets: list, data: dict) -> tuple:
+        rsp, error = None, None
+        for target in targets:
+            try:
+                result = target.notify(**data)
+            except NotifierException as e:
+                log.debug("routing target %s failed: %s", target.name, e)
+                error = e
+                continue
+            if result.ok:
+                return result, None
+            log.debug("routing target %s failed: %s", target.name, result.errors)
+            rsp = result
+        return rsp, error
+
+    def _send_hedged(self, targets: list, data: dict) -> tuple:
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        executor = self._get_executor()
+        remaining = iter(targets)
+        pending = {}
+        rsp, error = None, None
+
+        def start_next() -> Target | None:
+            target = next(remaining, None)
+            if target is not None:
+                pending[executor.submit(contextvars.copy_context().run, target.notify, **data)] = target
+            return target
+
+        last_started = start_next()
+        while pending:
+            timeout = self._hedge_delay(last_started) if last_started is not None else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                log.debug("routing target %s is slow to answer, hedging", last_started.name)
+                last_started = start_next()
+                continue
+            for future in done:
+                target = pending.pop(future)
+                try:
+                    result = future.result()
+                except NotifierException as e:
+                    log.debug("routing target %s failed: %s", target.name, e)
+                    error = e
+                else:
+                    if result.ok:
+                        # Slower targets that are still sending finish in the background
+                        return result, None
+                    log.debug("routing target %s failed: %s", target.name, result.errors)
+                    rsp = result
+            if not pending:
+                last_started = start_next()
+        return rsp, error
+
+    def stats(self) -> dict:
+        """
+        Returns the stats of all targets, for example for health checks
+
+        :return: A dict of target names to dicts of ``sends``, ``error_rate``, ``p50`` and ``p95`` latency
+        """
+        return {target.name: target.stats.snapshot() for target in self.targets}
+
+    def close(self):
+        """Shuts down the executor used for hedging, waiting for running sends to finish"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
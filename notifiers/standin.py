@@ -0,0 +1,430 @@
+"""
+Local stand-in servers that emulate the provider APIs, for load testing and offline benchmarks. Point providers at a
+:class:`StandInHTTPServer` via a :class:`~notifiers.transports.RedirectTransport`, and the email provider at a
+:class:`StandInSMTPServer` via its ``host`` and ``port``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+import socketserver
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .utils.ratelimit import TokenBucket
+
+log = logging.getLogger("notifiers")
+
+DEFAULT_RETRY_AFTER = 1
+# Seconds between shutdown checks of the serving threads
+POLL_INTERVAL = 0.05
+
+
+class Endpoint:
+    """
+    An emulated provider API endpoint
+
+    :param name: Endpoint name, used in stats
+    :param host: Host of the real API, matched against the ``X-Forwarded-Host`` header if sent. An empty host matches
+     all hosts
+    :param path: A regex the request path must fully match
+    :param body: Response body of successful requests, a dict sent as JSON or a string
+    :param error: A callable getting an error message, status code and the retry after seconds, and returning the
+     provider's error response body
+    :param method: HTTP method of the endpoint
+    :param status: Status code of successful requests
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        host: str,
+        path: str,
+        body: dict | str,
+        error: callable,
+        method: str = "POST",
+        status: int = 200,
+    ):
+        self.name = name
+        self.host = host
+        self.path = re.compile(path)
+        self.body = body
+        self.error = error
+        self.method = method
+        self.status = status
+
+    def __repr__(self):
+        return f"<Endpoint,name={self.name},method={self.method},host={self.host}>"
+
+    def matches(self, method: str, host: str, path: str) -> bool:
+        hosts_match = not host or not self.host or host == self.host
+        return method == self.method and hosts_match and self.path.fullmatch(path) is not None
+
+
+def _telegram_error(message: str, status: int, retry_after: int) -> dict:
+    error = {"ok": False, "error_code": status, "description": message}
+    if status == 429:
+        error["parameters"] = {"retry_after": retry_after}
+    return error
+
+
+ENDPOINTS = (
+    Endpoint(
+        "pushover",
+        "api.pushover.net",
+        r"/1/messages\.json",
+        {"status": 1, "request": "647d2300-702c-4b38-8b2f-d56326ae460b"},
+        lambda message, *_: {"status": 0, "errors": [message], "request": "647d2300-702c-4b38-8b2f-d56326ae460b"},
+    ),
+    Endpoint(
+        "telegram",
+        "api.telegram.org",
+        r"/bot[^/]+/sendMessage",
+        {"ok": True, "result": {"message_id": 1, "date": 0, "chat": {"id": 1}, "text": ""}},
+        _telegram_error,
+    ),
+    Endpoint("slack", "hooks.slack.com", r"/services/.+", "ok", lambda message, *_: message),
+    Endpoint(
+        "mailgun",
+        "api.mailgun.net",
+        r"/v3/[^/]+/messages",
+        {"id": "<20240101000000.1.standin@mailgun.org>", "message": "Queued. Thank you."},
+        lambda message, *_: {"message": message},
+    ),
+    Endpoint(
+        "twilio",
+        "api.twilio.com",
+        r"/2010-04-01/Accounts/[^/]+/Messages\.json",
+        {"sid": "SM00000000000000000000000000000000", "status": "queued"},
+        lambda message, status, _: {"code": 20000 + status, "message": message, "status": status},
+        status=201,
+    ),
+    Endpoint(
+        "pagerduty",
+        "events.pagerduty.com",
+        r"/v2/enqueue",
+        {"status": "success", "message": "Event processed", "dedup_key": "standin"},
+        lambda message, *_: {"status": "invalid event", "message": message, "errors": [message]},
+        status=202,
+    ),
+    Endpoint(
+        "pushbullet",
+        "api.pushbullet.com",
+        r"/v2/pushes",
+        {"active": True, "iden": "ujpah72o0sjAoRtnM0jc", "type": "note"},
+        lambda message, *_: {"error": {"code": "invalid_request", "message": message, "type": "invalid_request"}},
+    ),
+    Endpoint(
+        "gitter",
+        "api.gitter.im",
+        r"/v1/rooms/[^/]+/chatMessages",
+        {"id": "53316dc47bfc1a000000000f", "text": ""},
+        lambda message, *_: {"error": message},
+    ),
+    Endpoint(
+        "zulip",
+        "",
+        r"/api/v1/messages",
+        {"result": "success", "msg": "", "id": 42},
+        lambda message, *_: {"result": "error", "msg": message},
+    ),
+)
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "notifiers-standin"
+
+    def log_message(self, format: str, *args):
+        log.debug("stand-in HTTP server: " + format, *args)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int(self.rfile.readline().split(b";")[0], 16):
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            self.rfile.readline()
+            return b"".join(chunks)
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _send(self, status: int, body: dict | str, headers: dict | None = None):
+        content_type = "text/plain; charset=utf-8" if isinstance(body, str) else "application/json"
+        content = (body if isinstance(body, str) else json.dumps(body)).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+    def _handle(self):
+        self._read_body()
+        host = self.headers.get("X-Forwarded-Host", "").split(":")[0]
+        path = self.path.split("?")[0]
+        self.server.standin.handle(self, host, path)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _handle
+
+
+class StandInHTTPServer:
+    """
+    A threaded local HTTP server emulating provider API endpoints. Requests are routed by their path and original
+    host, which :class:`~notifiers.transports.RedirectTransport` sends in the ``X-Forwarded-Host`` header. Requests
+    sent to it directly, for example by setting the Mailgun ``base_url`` or the Slack ``webhook_url`` to its
+    :attr:`url`, are routed by their path only. ``HEAD`` requests, sent when warming up connections, always succeed.
+
+    :param host: Interface to listen on
+    :param port: Port to listen on. A free port is used if ``0``
+    :param latency: Seconds to wait before responding
+    :param jitter: Up to this many seconds are randomly added to ``latency``
+    :param error_rate: Rate of requests, between 0 and 1, that get a ``500`` error
+    :param throttle_rate: Rate of requests, between 0 and 1, that get a ``429`` error
+    :param rate_limit: Requests per second allowed, with a burst of as many. Requests above it get a ``429`` error
+    :param retry_after: Seconds sent in the ``Retry-After`` header and body of ``429`` errors
+    :param endpoints: The emulated :class:`Endpoint` objects
+    :param seed: Seed of the random generator used for errors and jitter, for reproducible runs
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        rate_limit: float | None = None,
+        retry_after: int = DEFAULT_RETRY_AFTER,
+        endpoints: tuple = ENDPOINTS,
+        seed: int | None = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.endpoints = endpoints
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._bucket = TokenBucket(rate_limit, max(rate_limit, 1)) if rate_limit else None
+        self._stats = Counter()
+        self._server = ThreadingHTTPServer((host, port), _HTTPHandler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self._thread = None
+
+    def __repr__(self):
+        return f"<StandInHTTPServer,url={self.url}>"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """The server URL, to be passed to :class:`~notifiers.transports.RedirectTransport`"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> dict:
+        """Request counts, by endpoint name and by ``status:<code>``, and the total number of ``requests``"""
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self) -> StandInHTTPServer:
+        """Starts serving on a daemon thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(POLL_INTERVAL,), name="notifiers-standin-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server and closes its socket"""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def _outcome(self) -> int | None:
+        with self._lock:
+            if self._bucket is not None:
+                if self._bucket.wait_time(time.monotonic()) > 0:
+                    return 429
+                self._bucket.tokens -= 1
+            roll = self._random.random()
+            delay = self.latency + self._random.uniform(0, self.jitter) if self.jitter else self.latency
+        if delay:
+            time.sleep(delay)
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+    def _count(self, name: str, status: int):
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats[name] += 1
+            self._stats[f"status:{status}"] += 1
+
+    def handle(self, request: BaseHTTPRequestHandler, host: str, path: str):
+        """Responds to a request, called by the request handler"""
+        if request.command == "HEAD":
+            self._count("head", 200)
+            request._send(200, "")
+            return
+        endpoint = next((endpoint for endpoint in self.endpoints if endpoint.matches(request.command, host, path)), None)
+        if endpoint is None:
+            self._count("unknown", 404)
+            request._send(404, {"errors": [f"No stand-in endpoint for {request.command} {host}{path}"]})
+            return
+        status = self._outcome()
+        self._count(endpoint.name, status or endpoint.status)
+        if status == 429:
+            body = endpoint.error(f"Too Many Requests: retry after {self.retry_after}", 429, self.retry_after)
+            request._send(429, body, {"Retry-After": str(self.retry_after)})
+        elif status == 500:
+            request._send(500, endpoint.error("Internal Server Error", 500, self.retry_after))
+        else:
+            request._send(endpoint.status, endpoint.body)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def _read_data(self) -> bytes:
+        lines = []
+        while (line := self.rfile.readline()) not in {b".\r\n", b".\n", b""}:
+            # Undo dot stuffing
+            lines.append(line[1:] if line.startswith(b".") else line)
+        return b"".join(lines)
+
+    def handle(self):
+        standin = self.server.standin
+        self._reply("220 notifiers-standin ESMTP")
+        while line := self.rfile.readline():
+            command = line.decode(errors="replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._reply("250-notifiers-standin")
+                self._reply("250-AUTH PLAIN")
+                self._reply("250 8BITMIME")
+            elif verb == "AUTH":
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                if standin.fails():
+                    self._reply("451 4.3.0 Temporary server error, try again later")
+                else:
+                    self._reply("250 2.1.0 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                standin.receive(self._read_data())
+                self._reply("250 2.0.0 OK queued")
+            elif verb == "QUIT":
+                self._reply("221 2.0.0 Bye")
+                return
+            elif verb in {"HELO", "RCPT", "RSET", "NOOP"}:
+                self._reply("250 2.0.0 OK")
+            else:
+                self._reply("502 5.5.2 Command not recognized")
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class StandInSMTPServer:
+    """
+    A threaded local SMTP server that accepts all messages. It accepts any ``AUTH PLAIN`` login and doesn't support
+    ``STARTTLS``, so send to it with ``tls`` and ``ssl`` disabled
+
+    :param host: Interface to listen on
+    :param port: Port to listen on. A free port is used if ``0``
+    :param latency: Seconds to wait before accepting a message
+    :param error_rate: Rate of messages, between 0 and 1, whose sender is refused with a temporary error
+    :param keep_messages: Keep received messages in :attr:`messages`. Disable for long load tests
+    :param seed: Seed of the random generator used for errors, for reproducible runs
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        keep_messages: bool = True,
+        seed: int | None = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.keep_messages = keep_messages
+        self.messages = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = Counter()
+        self._server = _ThreadingTCPServer((host, port), _SMTPHandler)
+        self._server.standin = self
+        self._thread = None
+
+    def __repr__(self):
+        return f"<StandInSMTPServer,host={self.host},port={self.port}>"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def stats(self) -> dict:
+        """Numbers of ``received`` and ``refused`` messages"""
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self) -> StandInSMTPServer:
+        """Starts serving on a daemon thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(POLL_INTERVAL,), name="notifiers-standin-smtp", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server and closes its socket"""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def fails(self) -> bool:
+        """Decides if the next message is refused, called by the request handler"""
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self._stats["refused"] += 1
+        return failed
+
+    def receive(self, message: bytes):
+        """Accepts a message, called by the request handler"""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self._stats["received"] += 1
+            if self.keep_messages:
+                self.messages.append(message)
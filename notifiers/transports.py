@@ -0,0 +1,447 @@
+"""
+Transports send the requests and emails that providers build. Every provider sends through the transport of the send
+in progress, so connection pooling, timeouts and test doubles apply to all of them the same way.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from time import perf_counter
+from urllib.parse import urlsplit, urlunsplit
+
+from .utils.context import current_context
+from .utils.helpers import SENSITIVE_KEYS, redact_data, redact_url
+from .utils.metrics import metrics
+from .utils.tracing import tracing
+
+log = logging.getLogger("notifiers")
+
+DEFAULT_WARMUP_TIMEOUT = 10.0
+
+
+class Transport(ABC):
+    """The base class of transports. Subclasses send HTTP requests and emails, or pretend to"""
+
+    def __repr__(self):
+        return f"<{type(self).__name__}>"
+
+    @abstractmethod
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Sends an HTTP request
+
+        :param method: HTTP method
+        :param url: Request URL
+        :param kwargs: :meth:`requests.Session.request` arguments
+        :return: A :class:`requests.Response`
+        :raises: :class:`requests.RequestException` if no response was received
+        """
+
+    @abstractmethod
+    def send_mail(self, key: tuple, connect: callable, message):
+        """
+        Sends an email message
+
+        :param key: The SMTP connection configuration, used to pool connections
+        :param connect: A callable returning a new connected and authenticated :class:`smtplib.SMTP` object
+        :param message: An :class:`email.message.EmailMessage`
+        """
+
+    def warmup(self, url: str):
+        """
+        Opens a connection to the host of ``url`` ahead of sending, or keeps an open one alive. Does nothing unless
+        overridden
+
+        :param url: A URL of the host to connect to
+        """
+        log.debug("%s doesn't warm up connections, skipping %s", self, url)
+
+    def warmup_mail(self, key: tuple, connect: callable):
+        """
+        Opens an SMTP connection ahead of sending, or keeps an open one alive. Does nothing unless overridden
+
+        :param key: The SMTP connection configuration, used to pool connections
+        :param connect: A callable returning a new connected and authenticated :class:`smtplib.SMTP` object
+        """
+        log.debug("%s doesn't warm up connections, skipping %s", self, key[:2])
+
+
+class HTTPTransport(Transport):
+    """
+    The default transport. Sends HTTP requests via pooled :class:`requests.Session` objects and emails via pooled SMTP
+    connections
+
+    :param session_pool: A :class:`~notifiers.utils.requests.SessionPool`. Defaults to the process wide one
+    :param smtp_pool: A :class:`~notifiers.utils.smtp.SMTPConnectionPool`. Defaults to the process wide one
+    """
+
+    def __init__(self, session_pool=None, smtp_pool=None):
+        self.session_pool = session_pool
+        self.smtp_pool = smtp_pool
+
+    def request(self, method: str, url: str, *args, session=None, **kwargs):
+        """
+        Sends an HTTP request
+
+        :param method: HTTP method
+        :param url: Request URL
+        :param args: :meth:`requests.Session.request` arguments
+        :param session: A :class:`requests.Session` to use instead of a pooled one
+        :param kwargs: :meth:`requests.Session.request` arguments
+        :return: A :class:`requests.Response`
+        """
+        if session is None:
+            from .utils import requests as requests_utils
+
+            session = (self.session_pool or requests_utils.session_pool).get(url)
+        if metrics.enabled or tracing.enabled:
+            return self._instrumented_request(session, method, url, *args, **kwargs)
+        return session.request(method, url, *args, **kwargs)
+
+    @staticmethod
+    def _instrumented_request(session, method: str, url: str, *args, **kwargs):
+        provider = _provider_name()
+        # The URL itself is left out of the span since some providers send credentials in it
+        attributes = {"http.request.method": method.upper(), "server.address": urlsplit(url).hostname}
+        start = perf_counter()
+        with tracing.span("notifiers.http_request", provider, **attributes) as span:
+            try:
+                response = session.request(method, url, *args, **kwargs)
+            except Exception:
+                if metrics.enabled:
+                    metrics.record_request(provider, "http", perf_counter() - start)
+                raise
+            span.set_attribute("http.response.status_code", response.status_code)
+        if metrics.enabled:
+            metrics.record_request(provider, "http", perf_counter() - start, _body_size(response.request))
+        return response
+
+    def warmup(self, url: str):
+        """
+        Resolves the host of ``url`` and opens a pooled connection to it, including the TLS handshake, by sending a
+        ``HEAD`` request to its root. The response status doesn't matter, the connection is kept for later requests
+
+        :param url: A URL of the host to connect to
+        """
+        from .utils import requests as requests_utils
+
+        parts = urlsplit(url)
+        origin = urlunsplit((parts.scheme, parts.netloc, "/", "", ""))
+        session = (self.session_pool or requests_utils.session_pool).get(origin)
+        session.head(origin, timeout=DEFAULT_WARMUP_TIMEOUT, allow_redirects=False).close()
+
+    def warmup_mail(self, key: tuple, connect: callable):
+        """
+        Opens a pooled SMTP connection, including ``STARTTLS`` and login, or checks an idle one via ``NOOP``
+
+        :param key: The SMTP connection configuration, used to pool connections
+        :param connect: A callable returning a new connected and authenticated :class:`smtplib.SMTP` object
+        """
+        from .utils import smtp
+
+        (self.smtp_pool or smtp.smtp_pool).ping(key, connect)
+
+    def send_mail(self, key: tuple, connect: callable, message):
+        from smtplib import SMTPServerDisconnected
+
+        from .utils import smtp
+
+        pool = self.smtp_pool or smtp.smtp_pool
+        start = perf_counter() if metrics.enabled else None
+        try:
+            with pool.connection(key, connect) as server:
+                server.send_message(message)
+        except SMTPServerDisconnected:
+            # The server may drop a pooled connection right after it passed its health check, retry on a new one
+            log.debug("SMTP server disconnected, retrying on a new connection")
+            with pool.connection(key, connect) as server:
+                server.send_message(message)
+        finally:
+            if start is not None:
+                metrics.record_request(_provider_name(), "smtp", perf_counter() - start, len(message.as_bytes()))
+
+
+def _provider_name() -> str | None:
+    context = current_context()
+    return context.provider if context is not None else None
+
+
+def _sensitive_keys():
+    context = current_context()
+    return context.sensitive_keys if context is not None and context.sensitive_keys is not None else SENSITIVE_KEYS
+
+
+def _body_size(request) -> int | None:
+    """Returns the size of a sent :class:`requests.PreparedRequest` body, None if it was streamed without a length"""
+    length = request.headers.get("Content-Length")
+    if length is not None:
+        return int(length)
+    body = request.body
+    if body is None:
+        return 0
+    return len(body) if isinstance(body, (bytes, str)) else None
+
+
+def make_response(method: str, url: str, status_code: int = 200, content: bytes = b"", headers: dict | None = None):
+    """
+    Creates a :class:`requests.Response` without sending a request
+
+    :param method: HTTP method of the request
+    :param url: Request URL
+    :param status_code: Response status code
+    :param content: Response body
+    :param headers: Response headers
+    :return: A :class:`requests.Response`
+    """
+    import requests
+
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    response.url = url
+    response.encoding = "utf-8"
+    response.request = requests.Request(method.upper(), url).prepare()
+    return response
+
+
+def _strip_query(url: str) -> str:
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+class MockTransport(Transport):
+    """
+    An in memory transport that sends nothing. Requests, emails and warmups are recorded, and requests get the queued
+    responses registered via :meth:`add` for their method and URL, or a default ``200`` response with an empty JSON
+    object
+
+    :param strict: Raise :class:`requests.ConnectionError` for requests without a registered response instead
+    """
+
+    def __init__(self, strict: bool = False):
+        self.strict = strict
+        self.requests = []
+        self.messages = []
+        self.warmed_up = []
+        self._responses = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<MockTransport,requests={len(self.requests)},messages={len(self.messages)}>"
+
+    def add(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str,
+        status_code: int = 200,
+        json: dict | list | None = None,
+        text: str = "",
+        headers: dict | None = None,
+        repeat: bool = False,
+    ):
+        """
+        Queues a response for requests to ``url``, ignoring its query string
+
+        :param method: HTTP method to respond to
+        :param url: URL to respond to
+        :param status_code: Response status code
+        :param json: JSON response body
+        :param text: Text response body, used if ``json`` is not set
+        :param headers: Response headers
+        :param repeat: Keep responding with this response instead of using it once
+        """
+        import json as json_module
+
+        content = json_module.dumps(json).encode() if json is not None else text.encode()
+        with self._lock:
+            self._responses.setdefault((method.lower(), _strip_query(url)), deque()).append((status_code, content, headers, repeat))
+
+    def request(self, method: str, url: str, **kwargs):
+        kwargs.pop("session", None)
+        with self._lock:
+            self.requests.append((method.lower(), url, kwargs))
+            queue = self._responses.get((method.lower(), _strip_query(url)))
+            response = None
+            if queue:
+                response = queue[0]
+                if not response[3]:
+                    queue.popleft()
+        if response is None:
+            if self.strict:
+                import requests
+
+                raise requests.ConnectionError(f"No mock response for {method.upper()} {url}")
+            return make_response(method, url, 200, b"{}", {"Content-Type": "application/json"})
+        status_code, content, headers, _ = response
+        return make_response(method, url, status_code, content, headers)
+
+    def warmup(self, url: str):
+        with self._lock:
+            self.warmed_up.append(url)
+
+    def warmup_mail(self, key: tuple, connect: callable):
+        with self._lock:
+            self.warmed_up.append(key)
+
+    def send_mail(self, key: tuple, connect: callable, message):
+        with self._lock:
+            self.messages.append(message)
+
+
+def _encode_body(kwargs: dict, sensitive_keys):
+    body = redact_data(kwargs.get("json", kwargs.get("data")), sensitive_keys)
+    try:
+        json.dumps(body)
+    except TypeError:
+        return repr(body)
+    return body
+
+
+class RecordingTransport(Transport):
+    """
+    Sends requests via another transport and appends each request and its response to a JSON lines file, which can
+    later be replayed by :class:`ReplayTransport`. Emails are sent and recorded as well. Credentials are redacted
+    before writing: values of sensitive data, params and header keys, including the sensitive keys the sending
+    provider declares, and URL parts that look like tokens, see :func:`~notifiers.utils.helpers.redact_url`
+
+    :param path: Path of the recording file
+    :param transport: The transport to send with. Defaults to :class:`HTTPTransport`
+    """
+
+    def __init__(self, path: str | Path, transport: Transport | None = None):
+        self.path = Path(path)
+        self.transport = transport or HTTPTransport()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<RecordingTransport,path={self.path}>"
+
+    def _write(self, interaction: dict):
+        with self._lock, self.path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(interaction) + "\n")
+
+    def request(self, method: str, url: str, **kwargs):
+        response = self.transport.request(method, url, **kwargs)
+        sensitive_keys = _sensitive_keys()
+        self._write(
+            {
+                "type": "http",
+                "method": method.lower(),
+                "url": redact_url(url, sensitive_keys),
+                "params": redact_data(kwargs.get("params"), sensitive_keys),
+                "body": _encode_body(kwargs, sensitive_keys),
+                "status_code": response.status_code,
+                "headers": redact_data(dict(response.headers)),
+                "content": base64.b64encode(response.content).decode(),
+            }
+        )
+        return response
+
+    def warmup(self, url: str):
+        self.transport.warmup(url)
+
+    def warmup_mail(self, key: tuple, connect: callable):
+        self.transport.warmup_mail(key, connect)
+
+    def send_mail(self, key: tuple, connect: callable, message):
+        self.transport.send_mail(key, connect, message)
+        self._write({"type": "mail", "host": key[0], "port": key[1], "to": message["To"], "subject": message["Subject"]})
+
+
+class RedirectTransport(Transport):
+    """
+    Sends HTTP requests to another server instead of the provider's, for example a
+    :class:`~notifiers.standin.StandInHTTPServer` or a staging proxy. The scheme and host of each request URL are
+    replaced by those of ``base_url`` and the original host is sent in the ``X-Forwarded-Host`` header. Emails are
+    sent unchanged
+
+    :param base_url: URL of the server to send requests to, for example ``http://127.0.0.1:8025``
+    :param transport: The transport to send with. Defaults to :class:`HTTPTransport`
+    """
+
+    def __init__(self, base_url: str, transport: Transport | None = None):
+        self.base_url = base_url.rstrip("/")
+        self.transport = transport or HTTPTransport()
+
+    def __repr__(self):
+        return f"<RedirectTransport,base_url={self.base_url}>"
+
+    def _redirect(self, url: str) -> tuple:
+        parts = urlsplit(url)
+        target = urlsplit(self.base_url)
+        path = target.path + parts.path
+        return urlunsplit((target.scheme, target.netloc, path, parts.query, parts.fragment)), parts.netloc
+
+    def request(self, method: str, url: str, **kwargs):
+        url, host = self._redirect(url)
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "X-Forwarded-Host": host}
+        return self.transport.request(method, url, **kwargs)
+
+    def warmup(self, url: str):
+        self.transport.warmup(self._redirect(url)[0])
+
+    def warmup_mail(self, key: tuple, connect: callable):
+        self.transport.warmup_mail(key, connect)
+
+    def send_mail(self, key: tuple, connect: callable, message):
+        self.transport.send_mail(key, connect, message)
+
+
+class ReplayTransport(Transport):
+    """
+    Replays responses recorded by :class:`RecordingTransport` without sending anything. Each request gets the next
+    unused recorded response with the same method and redacted URL. Requests without one raise
+    :class:`requests.ConnectionError`, so they fail like unreachable endpoints. Emails are recorded in :attr:`messages`
+
+    :param path: Path of the recording file
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.messages = []
+        self._lock = threading.Lock()
+        self._interactions = {}
+        with self.path.open(encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                interaction = json.loads(line)
+                if interaction["type"] == "http":
+                    key = (interaction["method"], redact_url(interaction["url"]))
+                    self._interactions.setdefault(key, deque()).append(interaction)
+
+    def __repr__(self):
+        return f"<ReplayTransport,path={self.path}>"
+
+    def request(self, method: str, url: str, **kwargs):
+        redacted_url = redact_url(url, _sensitive_keys())
+        with self._lock:
+            interactions = self._interactions.get((method.lower(), redacted_url))
+            if not interactions:
+                import requests
+
+                raise requests.ConnectionError(f"No recorded response left for {method.upper()} {redacted_url}")
+            interaction = interactions.popleft()
+        return make_response(method, url, interaction["status_code"], base64.b64decode(interaction["content"]), interaction["headers"])
+
+    def send_mail(self, key: tuple, connect: callable, message):
+        with self._lock:
+            self.messages.append(message)
+
+
+default_transport = HTTPTransport()
+
+
+def get_transport() -> Transport:
+    """Returns the transport of the send in progress, or the default transport"""
+    context = current_context()
+    if context is not None and context.transport is not None:
+        return context.transport
+    return default_transport
@@ -0,0 +1,82 @@
+"""Helpers for running the blocking notification pipeline from :mod:`asyncio` code"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+log = logging.getLogger("notifiers")
+
+DEFAULT_MAX_WORKERS = 32
+
+_executor = None
+_executor_lock = threading.Lock()
+_max_workers = DEFAULT_MAX_WORKERS
+# Executors set via set_executor() belong to the caller and are never shut down here
+_owned = True
+
+
+def get_executor() -> Executor:
+    """
+    Returns the process wide executor used to run blocking sends. Unless set via :func:`set_executor`, it is a
+    :class:`~concurrent.futures.ThreadPoolExecutor` of up to :data:`DEFAULT_MAX_WORKERS` threads, created on first use
+
+    :return: The shared executor
+    """
+    global _executor  # noqa: PLW0603
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                log.debug("creating async executor with %s workers", _max_workers)
+                _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="notifiers-async")
+    return _executor
+
+
+def set_max_workers(max_workers: int):
+    """
+    Sets the maximum number of concurrent blocking sends. An existing executor is shut down after its pending work
+
+    :param max_workers: Max number of worker threads
+    """
+    global _executor, _max_workers, _owned  # noqa: PLW0603
+    with _executor_lock:
+        _max_workers = max_workers
+        executor, _executor = _executor, None
+        owned, _owned = _owned, True
+    if executor is not None and owned:
+        executor.shutdown(wait=False)
+
+
+def set_executor(executor: Executor | None):
+    """
+    Sets the executor used to run blocking sends, for example one shared with the rest of the application. The
+    caller is responsible for shutting it down. An executor created by notifiers is shut down after its pending work
+
+    :param executor: The executor to use, or None to go back to a shared one of :func:`set_max_workers` size
+    """
+    global _executor, _owned
+    with _executor_lock:
+        previous, _executor = _executor, executor
+        owned, _owned = _owned, executor is None
+    if previous is not None and owned:
+        previous.shutdown(wait=False)
+
+
+async def run_sync(func: callable, *args, **kwargs):
+    """
+    Runs a blocking callable on the shared executor without blocking the running event loop.
+    The current :mod:`contextvars` context is propagated to the worker thread
+
+    :param func: Callable to run
+    :param args: Positional args for ``func``
+    :param kwargs: Keyword args for ``func``
+    :return: The return value of ``func``
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
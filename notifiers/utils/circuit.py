@@ -0,0 +1,227 @@
+"""Circuit breakers that fail fast when a provider endpoint is down"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+
+from ..exceptions import CircuitOpenError
+
+log = logging.getLogger("notifiers")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_RATE = 0.5
+DEFAULT_MIN_REQUESTS = 5
+DEFAULT_WINDOW = 60.0
+DEFAULT_COOLDOWN = 30.0
+
+
+class CircuitBreaker:
+    """
+    A thread safe circuit breaker for a single endpoint.
+
+    While ``closed``, requests are sent and their outcome is tracked over a rolling window. Once at least
+    ``min_requests`` were made in the window and the rate of failed ones reaches ``failure_rate``, the circuit opens.
+    While ``open``, requests fail fast with :class:`~notifiers.exceptions.CircuitOpenError`. After ``cooldown``
+    seconds the circuit is ``half_open`` and a single probe request is let through. It closes the circuit if it
+    succeeds and opens it again if it fails.
+
+    :param name: Name of the endpoint, used in errors and logs
+    :param failure_rate: Rate of failed requests, between 0 and 1, that opens the circuit
+    :param min_requests: Minimum number of requests in the window before the circuit can open
+    :param window: Seconds of request history that is taken into account
+    :param cooldown: Seconds an open circuit waits before letting a probe request through
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = DEFAULT_FAILURE_RATE,
+        min_requests: int = DEFAULT_MIN_REQUESTS,
+        window: float = DEFAULT_WINDOW,
+        cooldown: float = DEFAULT_COOLDOWN,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._outcomes = deque()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def __repr__(self):
+        return f"<CircuitBreaker,name={self.name},state={self.state}>"
+
+    @property
+    def state(self) -> str:
+        """The current state, ``closed``, ``open`` or ``half_open``"""
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.cooldown:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def _expire(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            _, failed = self._outcomes.popleft()
+            self._failures -= failed
+
+    def _open(self, now: float):
+        log.warning("circuit of %s opened, failing fast for %ss", self.name, self.cooldown)
+        self._state = OPEN
+        self._opened_at = now
+        self._probing = False
+        self._outcomes.clear()
+        self._failures = 0
+
+    def before_request(self):
+        """
+        Checks if a request may be sent. Every allowed request must be followed by a call to :meth:`record`
+
+        :raises: :class:`~notifiers.exceptions.CircuitOpenError` if the circuit is open
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            retry_after = max(self.cooldown - (now - self._opened_at), 0.0)
+        raise CircuitOpenError(endpoint=self.name, retry_after=retry_after)
+
+    def record(self, success: bool):
+        """
+        Records the outcome of a request
+
+        :param success: Did the endpoint respond normally
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if state == HALF_OPEN:
+                if success:
+                    log.info("circuit of %s closed", self.name)
+                    self._state = CLOSED
+                else:
+                    self._open(now)
+                return
+            if state == OPEN:
+                # A request that started before the circuit opened, its outcome is no longer relevant
+                return
+            self._expire(now)
+            self._outcomes.append((now, not success))
+            self._failures += not success
+            requests = len(self._outcomes)
+            if requests >= self.min_requests and self._failures / requests >= self.failure_rate:
+                self._open(now)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the circuit state for health checks
+
+        :return: A dict with the ``state``, the number of ``requests`` and ``failures`` in the current window and
+         ``retry_after``, the seconds until an open circuit lets a probe request through
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            self._expire(now)
+            return {
+                "state": state,
+                "requests": len(self._outcomes),
+                "failures": self._failures,
+                "retry_after": max(self.cooldown - (now - self._opened_at), 0.0) if state == OPEN else 0.0,
+            }
+
+    def reset(self):
+        """Closes the circuit and forgets all recorded requests"""
+        with self._lock:
+            self._state = CLOSED
+            self._outcomes.clear()
+            self._failures = 0
+            self._probing = False
+
+
+class CircuitBreakerRegistry:
+    """
+    A registry of :class:`CircuitBreaker` objects, one per provider and endpoint host
+
+    :param enabled: Should circuit breakers be used. Default is **False**, so sends to a failing endpoint keep returning
+     failed responses until circuit breakers are enabled
+    :param settings: Default :class:`CircuitBreaker` settings
+    """
+
+    def __init__(self, enabled: bool = False, **settings):
+        self.enabled = enabled
+        self.settings = settings
+        self._provider_settings = {}
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def __repr__(self):
+        return f"<CircuitBreakerRegistry,breakers={len(self._breakers)}>"
+
+    def get(self, provider: str, host: str) -> CircuitBreaker:
+        """
+        Returns the circuit breaker of a provider endpoint, creating it if needed
+
+        :param provider: Provider name
+        :param host: Endpoint host, for example ``hooks.slack.com`` or ``smtp.gmail.com:587``
+        :return: A :class:`CircuitBreaker`
+        """
+        key = (provider, host)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    settings = {**self.settings, **self._provider_settings.get(provider, {})}
+                    breaker = self._breakers[key] = CircuitBreaker(f"{provider}:{host}", **settings)
+        return breaker
+
+    def configure(self, provider: str | None = None, **settings):
+        """
+        Changes circuit breaker settings. Existing circuit breakers are discarded so the settings apply to all endpoints
+
+        :param provider: Provider name to change settings of. Changes the default settings if not set
+        :param settings: Any of the :class:`CircuitBreaker` settings
+        """
+        with self._lock:
+            if provider is None:
+                self.settings.update(settings)
+            else:
+                self._provider_settings.setdefault(provider, {}).update(settings)
+            self._breakers.clear()
+
+    def states(self, provider: str | None = None) -> dict:
+        """
+        Returns the state of all circuits, for health checks
+
+        :param provider: Only return circuits of this provider
+        :return: A dict of ``provider:host`` names to :meth:`CircuitBreaker.snapshot` dicts
+        """
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {breaker.name: breaker.snapshot() for (name, _), breaker in breakers if provider is None or name == provider}
+
+    def reset(self):
+        """Discards all circuit breakers"""
+        with self._lock:
+            self._breakers.clear()
+
+
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,56 @@
+"""Per send state, shared between a provider and the helpers it sends with"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+
+_current_context = contextvars.ContextVar("notifiers_send_context", default=None)
+
+
+class SendContext:
+    """
+    Holds the state of a single notification send. It is set by the provider for the duration of the send, so helpers
+    such as :class:`~notifiers.utils.requests.RequestsHelper` can apply provider settings without them being passed
+    through every provider method
+
+    :param provider: Name of the sending provider
+    :param retry_policy: The :class:`~notifiers.utils.retry.RetryPolicy` to send with, if any
+    :param idempotent: Can the request be safely repeated, for example because it carries an idempotency key
+    :param transport: The :class:`~notifiers.transports.Transport` to send with. Uses the default one if not set
+    :param sensitive_keys: A pattern matching the names of the provider's credential data keys. Defaults to
+     :data:`~notifiers.utils.helpers.SENSITIVE_KEYS`
+    """
+
+    def __init__(self, provider: str, retry_policy=None, idempotent: bool = False, transport=None, sensitive_keys=None):
+        self.provider = provider
+        self.retry_policy = retry_policy
+        self.idempotent = idempotent
+        self.transport = transport
+        self.sensitive_keys = sensitive_keys
+        self.attempts = []
+
+    def __repr__(self):
+        return f"<SendContext,provider={self.provider},attempts={len(self.attempts)}>"
+
+
+def current_context() -> SendContext | None:
+    """Returns the :class:`SendContext` of the send in progress, or None if called outside of a send"""
+    return _current_context.get()
+
+
+@contextlib.contextmanager
+def send_context(provider: str, **kwargs):
+    """
+    A context manager that sets a new :class:`SendContext` as the current one
+
+    :param provider: Name of the sending provider
+    :param kwargs: Additional :class:`SendContext` arguments
+    :return: The new :class:`SendContext`
+    """
+    context = SendContext(provider, **kwargs)
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
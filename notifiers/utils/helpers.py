@@ -1,9 +1,34 @@
+import functools
 import logging
 import os
+import re
 from pathlib import Path
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
 
 log = logging.getLogger("notifiers")
 
+REDACTED = "********"
+# Data keys whose values are credentials, such as ``token``, ``api_key``, ``password`` or ``webhook_url``
+SENSITIVE_KEYS = re.compile(r"token|secret|passw|api_?key|routing_key|webhook|authorization|cookie|^key$|^sign$", re.IGNORECASE)
+# URL path segments that look like credentials, such as bot tokens and webhook keys: long, or fairly long and holding
+# a digit
+SECRET_PATH_SEGMENT = re.compile(r"^(?:(?=.*\d)[\w\-:.~%]{16,}|[\w\-:.~%]{20,})$")
+
+
+@functools.lru_cache(maxsize=None)
+def sensitive_keys_pattern(keys: tuple = ()) -> re.Pattern:
+    """
+    Returns a pattern matching :data:`SENSITIVE_KEYS` and the exact names of additional keys, such as the sensitive
+    keys a provider declares
+
+    :param keys: Names of additional keys to match
+    :return: A compiled pattern
+    """
+    if not keys:
+        return SENSITIVE_KEYS
+    names = "|".join(f"^{re.escape(key)}$" for key in keys)
+    return re.compile(f"{SENSITIVE_KEYS.pattern}|{names}", re.IGNORECASE)
+
 
 def text_to_bool(value: str) -> bool:
     """
@@ -73,3 +98,38 @@ def valid_file(path: str) -> bool:
     path = Path(path).expanduser()
     log.debug("checking if %s is a valid file", path)
     return path.exists() and path.is_file()
+
+
+def redact_data(data, sensitive_keys: re.Pattern = SENSITIVE_KEYS):
+    """
+    Returns a copy of notification data with the values of sensitive keys replaced, for example before it's kept for
+    auditing
+
+    :param data: Notification data. Nested dicts and lists are redacted as well
+    :param sensitive_keys: A pattern matching the names of keys to redact
+    :return: The redacted data
+    """
+    if isinstance(data, dict):
+        return {key: REDACTED if isinstance(key, str) and sensitive_keys.search(key) and value is not None else redact_data(value, sensitive_keys) for key, value in data.items()}
+    if isinstance(data, list):
+        return [redact_data(value, sensitive_keys) for value in data]
+    return data
+
+
+def redact_url(url: str, sensitive_keys: re.Pattern = SENSITIVE_KEYS) -> str:
+    """
+    Returns a URL with the credentials it may hold replaced: path segments that look like tokens or keys, the values
+    of sensitive query string keys and the user info
+
+    :param url: The URL to redact
+    :param sensitive_keys: A pattern matching the names of query string keys to redact
+    :return: The redacted URL
+    """
+    parts = urlsplit(url)
+    netloc = f"{REDACTED}@{parts.netloc.rpartition('@')[2]}" if "@" in parts.netloc else parts.netloc
+    path = "/".join(REDACTED if SECRET_PATH_SEGMENT.match(segment) else segment for segment in parts.path.split("/"))
+    pairs = []
+    for pair in parts.query.split("&") if parts.query else ():
+        key, separator, value = pair.partition("=")
+        pairs.append(f"{key}{separator}{REDACTED if separator and sensitive_keys.search(unquote_plus(key)) else value}")
+    return urlunsplit((parts.scheme, netloc, path, "&".join(pairs), parts.fragment))
@@ -0,0 +1,155 @@
+"""
+Lifecycle hooks that add behavior to every send, such as caching, deduplication or payload compression, without
+subclassing providers. Hooks are registered globally on :data:`hooks` or on a single provider or resource via its
+:attr:`~notifiers.core.SchemaResource.hooks`
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+log = logging.getLogger("notifiers")
+
+# Called with ``(resource, data)`` before sending. Returning anything but None skips the send and uses it as the result
+PRE_SEND = "pre_send"
+# Called with ``(resource, data, result)`` after a successful send. Returning anything but None replaces the result
+POST_SEND = "post_send"
+# Called with ``(resource, data, error)`` when the send raised. Returning anything but None uses it as the result
+# instead of raising
+ON_ERROR = "on_error"
+
+EVENTS = (PRE_SEND, POST_SEND, ON_ERROR)
+
+
+class HookRegistry:
+    """
+    Holds the hooks of each lifecycle event, called in the order they were registered.
+
+    - ``pre_send`` hooks are called with the resource and the processed data before sending. Data can be changed in
+      place. If a hook returns anything but None, the send and the remaining hooks are skipped and the returned value
+      is the result, for example a cached :class:`~notifiers.core.Response`
+    - ``post_send`` hooks are called with the resource, data and the result of a send. If a hook returns anything but
+      None it replaces the result
+    - ``on_error`` hooks are called with the resource, data and the exception raised by a send. If a hook returns
+      anything but None it is used as the result instead of raising the exception
+
+    Results returned by the hooks of a provider must be a :class:`~notifiers.core.Response`, of which the provider
+    returns a copy. Hooks of a resource may return any result
+    """
+
+    def __init__(self):
+        self.active = False
+        self._hooks = dict.fromkeys(EVENTS, ())
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<HookRegistry,{','.join(f'{event}={len(hooks)}' for event, hooks in self._hooks.items())}>"
+
+    def register(self, event: str, hook: callable | None = None):
+        """
+        Registers a hook, can be used as a decorator:
+
+        .. code-block:: python
+
+            @hooks.register("pre_send")
+            def dedup(resource, data):
+                ...
+
+        :param event: ``pre_send``, ``post_send`` or ``on_error``
+        :param hook: The hook callable. If not set, returns a decorator that registers the decorated callable
+        :return: ``hook``
+        :raises: :class:`ValueError` if ``event`` is unknown
+        """
+        if event not in self._hooks:
+            raise ValueError(f"Unknown hook event '{event}', must be one of {', '.join(EVENTS)}")
+        if hook is None:
+            return lambda decorated: self.register(event, decorated)
+        with self._lock:
+            self._hooks[event] = (*self._hooks[event], hook)
+            self.active = True
+        return hook
+
+    def unregister(self, event: str, hook: callable):
+        """
+        Removes a registered hook
+
+        :param event: The event the hook was registered for
+        :param hook: The hook callable
+        """
+        with self._lock:
+            self._hooks[event] = tuple(registered for registered in self._hooks[event] if registered is not hook)
+            self.active = any(self._hooks.values())
+
+    def clear(self):
+        """Removes all hooks"""
+        with self._lock:
+            self._hooks = dict.fromkeys(EVENTS, ())
+            self.active = False
+
+    def get(self, event: str) -> tuple:
+        """
+        Returns the hooks of an event
+
+        :param event: Event name
+        :return: A tuple of hook callables
+        """
+        return self._hooks[event]
+
+
+def pre_send(registries: tuple, resource, data: dict):
+    """
+    Calls the ``pre_send`` hooks of ``registries`` until one of them returns a result
+
+    :param registries: :class:`HookRegistry` objects, in the order they are called
+    :param resource: The sending provider or resource
+    :param data: Processed data
+    :return: The result of the first hook that returned one, or None
+    """
+    for registry in registries:
+        for hook in registry.get(PRE_SEND):
+            result = hook(resource, data)
+            if result is not None:
+                log.debug("%s hook %s skipped sending", PRE_SEND, hook)
+                return result
+    return None
+
+
+def post_send(registries: tuple, resource, data: dict, result):
+    """
+    Calls the ``post_send`` hooks of ``registries``, each one with the result of the previous one
+
+    :param registries: :class:`HookRegistry` objects, in the order they are called
+    :param resource: The sending provider or resource
+    :param data: Processed data
+    :param result: The result of the send
+    :return: The final result
+    """
+    for registry in registries:
+        for hook in registry.get(POST_SEND):
+            replaced = hook(resource, data, result)
+            if replaced is not None:
+                result = replaced
+    return result
+
+
+def on_error(registries: tuple, resource, data: dict, error: Exception):
+    """
+    Calls the ``on_error`` hooks of ``registries`` until one of them returns a result
+
+    :param registries: :class:`HookRegistry` objects, in the order they are called
+    :param resource: The sending provider or resource
+    :param data: Processed data
+    :param error: The exception raised by the send
+    :return: The result of the first hook that returned one, or None
+    """
+    for registry in registries:
+        for hook in registry.get(ON_ERROR):
+            result = hook(resource, data, error)
+            if result is not None:
+                log.debug("%s hook %s recovered from %r", ON_ERROR, hook, error)
+                return result
+    return None
+
+
+hooks = HookRegistry()
@@ -0,0 +1,82 @@
+"""Periodic keepalive pings that keep warmed up connections open between notifications"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+log = logging.getLogger("notifiers")
+
+
+class KeepAlive:
+    """
+    Runs scheduled pings on a single daemon thread, started on first use. A failing ping is logged and retried on
+    its next run
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._pings = {}
+        self._thread = None
+
+    def __repr__(self):
+        return f"<KeepAlive,pings={len(self._pings)}>"
+
+    def __len__(self):
+        return len(self._pings)
+
+    def schedule(self, key, ping: callable, interval: float):
+        """
+        Schedules a ping to run every ``interval`` seconds, replacing a ping scheduled under the same key
+
+        :param key: A hashable key of the ping, used to replace or cancel it
+        :param ping: The callable to run
+        :param interval: Seconds between pings
+        """
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        with self._condition:
+            self._pings[key] = (ping, interval, time.monotonic() + interval)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="notifiers-keepalive", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def cancel(self, key=None):
+        """
+        Cancels a scheduled ping
+
+        :param key: Key of the ping to cancel. Cancels all pings if not set
+        """
+        with self._condition:
+            if key is None:
+                self._pings.clear()
+            else:
+                self._pings.pop(key, None)
+            self._condition.notify()
+
+    def _due(self) -> list:
+        # Called with the condition held, waits until at least one ping is due
+        while True:
+            now = time.monotonic()
+            due = [(key, ping, interval) for key, (ping, interval, next_run) in self._pings.items() if next_run <= now]
+            if due:
+                for key, ping, interval in due:
+                    self._pings[key] = (ping, interval, now + interval)
+                return due
+            timeout = min((next_run for _, _, next_run in self._pings.values()), default=None)
+            self._condition.wait(timeout - now if timeout is not None else None)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due = self._due()
+            for key, ping, _ in due:
+                try:
+                    ping()
+                except Exception as e:
+                    log.debug("keepalive ping %s failed: %s", key, e)
+
+
+keepalive = KeepAlive()
@@ -0,0 +1,367 @@
+"""
+Counters and histograms of sends, resource calls and transport requests, labelled by provider. Nothing is collected
+until an exporter is added to :data:`metrics`, so the instrumented code only checks :attr:`MetricsRegistry.enabled`
+while metrics are unused.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+log = logging.getLogger("notifiers")
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+DEFAULT_PREFIX = "notifiers"
+DEFAULT_STATSD_HOST = "127.0.0.1"
+DEFAULT_STATSD_PORT = 8125
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Metric:
+    """
+    The definition of a metric
+
+    :param name: Metric name, without a prefix
+    :param kind: ``counter`` or ``histogram``
+    :param help: A description of the metric
+    :param labels: Names of the metric labels, in the order their values are passed
+    :param buckets: Upper bounds of the histogram buckets
+    """
+
+    def __init__(self, name: str, kind: str, help: str, labels: tuple = ("provider",), buckets: tuple = ()):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+
+    def __repr__(self):
+        return f"<Metric:{self.name}>"
+
+
+SENDS = Metric("sends_total", COUNTER, "Notifications sent, by outcome", ("provider", "status"))
+FAILURES = Metric("failures_total", COUNTER, "Failed notifications, by error class", ("provider", "error"))
+SEND_DURATION = Metric("send_duration_seconds", HISTOGRAM, "Duration of notify calls", buckets=SECONDS_BUCKETS)
+RETRIES = Metric("retries_total", COUNTER, "Requests that were retried")
+RATE_LIMIT_WAIT = Metric("rate_limit_wait_seconds", HISTOGRAM, "Time spent waiting for the client side rate limiter", buckets=SECONDS_BUCKETS)
+RESOURCE_CALLS = Metric("resource_calls_total", COUNTER, "Provider resource calls, by outcome", ("provider", "resource", "status"))
+RESOURCE_DURATION = Metric("resource_duration_seconds", HISTOGRAM, "Duration of resource calls", ("provider", "resource"), SECONDS_BUCKETS)
+REQUESTS = Metric("transport_requests_total", COUNTER, "Requests and emails sent by transports", ("provider", "transport"))
+REQUEST_DURATION = Metric("transport_duration_seconds", HISTOGRAM, "Duration of transport requests", ("provider", "transport"), SECONDS_BUCKETS)
+PAYLOAD_SIZE = Metric("payload_bytes", HISTOGRAM, "Size of request bodies and email messages", ("provider", "transport"), BYTES_BUCKETS)
+
+METRICS = (SENDS, FAILURES, SEND_DURATION, RETRIES, RATE_LIMIT_WAIT, RESOURCE_CALLS, RESOURCE_DURATION, REQUESTS, REQUEST_DURATION, PAYLOAD_SIZE)
+
+
+def error_class(rsp=None, error: Exception | None = None) -> str:
+    """
+    Returns the label of a failure, the class name of the raised exception or the response status code
+
+    :param rsp: A failed :class:`~notifiers.core.Response`
+    :param error: The raised exception
+    :return: A label such as ``BadArguments`` or ``http_500``
+    """
+    if error is not None:
+        return type(error).__name__
+    status_code = getattr(rsp.response, "status_code", None) if rsp is not None else None
+    return f"http_{status_code}" if status_code is not None else "no_response"
+
+
+class Exporter:
+    """The base class of exporters, which receive every metric update while added to a :class:`MetricsRegistry`"""
+
+    def __repr__(self):
+        return f"<{type(self).__name__}>"
+
+    def inc(self, metric: Metric, labels: tuple, value: float):
+        """
+        Increments a counter
+
+        :param metric: The counter :class:`Metric`
+        :param labels: Label values, in the order of :attr:`Metric.labels`
+        :param value: Increment
+        """
+        log.debug("%s ignores %s", self, metric)
+
+    def observe(self, metric: Metric, labels: tuple, value: float):
+        """
+        Adds an observation to a histogram
+
+        :param metric: The histogram :class:`Metric`
+        :param labels: Label values, in the order of :attr:`Metric.labels`
+        :param value: Observed value
+        """
+        log.debug("%s ignores %s", self, metric)
+
+
+class MetricsRegistry:
+    """
+    Dispatches metric updates to its exporters. Instrumented code checks :attr:`enabled` before measuring anything, which
+    is only set while there are exporters
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.exporters = ()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<MetricsRegistry,exporters={len(self.exporters)}>"
+
+    def add_exporter(self, exporter: Exporter) -> Exporter:
+        """
+        Starts sending metric updates to ``exporter``
+
+        :param exporter: An :class:`Exporter`
+        :return: ``exporter``
+        """
+        with self._lock:
+            self.exporters = (*self.exporters, exporter)
+            self.enabled = True
+        return exporter
+
+    def remove_exporter(self, exporter: Exporter):
+        """
+        Stops sending metric updates to ``exporter``. Metrics are disabled once there are no exporters left
+
+        :param exporter: A previously added :class:`Exporter`
+        """
+        with self._lock:
+            self.exporters = tuple(added for added in self.exporters if added is not exporter)
+            self.enabled = bool(self.exporters)
+
+    def clear(self):
+        """Removes all exporters"""
+        with self._lock:
+            self.exporters = ()
+            self.enabled = False
+
+    def inc(self, metric: Metric, labels: tuple, value: float = 1):
+        for exporter in self.exporters:
+            exporter.inc(metric, labels, value)
+
+    def observe(self, metric: Metric, labels: tuple, value: float):
+        for exporter in self.exporters:
+            exporter.observe(metric, labels, value)
+
+    def record_send(self, provider: str, rsp=None, error: Exception | None = None):
+        """
+        Records a :meth:`~notifiers.core.Provider.notify` call
+
+        :param provider: Provider name
+        :param rsp: The returned :class:`~notifiers.core.Response`, if any
+        :param error: The raised exception, if any
+        """
+        if rsp is not None and rsp.ok:
+            self.inc(SENDS, (provider, "success"))
+        else:
+            self.inc(SENDS, (provider, "failure"))
+            self.inc(FAILURES, (provider, error_class(rsp, error)))
+        if rsp is None:
+            return
+        self.observe(SEND_DURATION, (provider,), rsp.timings.get("total", 0.0))
+        if "rate_limit" in rsp.timings:
+            self.observe(RATE_LIMIT_WAIT, (provider,), rsp.timings["rate_limit"])
+        if len(rsp.attempts) > 1:
+            self.inc(RETRIES, (provider,), len(rsp.attempts) - 1)
+
+    def record_resource_call(self, provider: str, resource: str, seconds: float, error: Exception | None = None):
+        """
+        Records a :class:`~notifiers.core.ProviderResource` call
+
+        :param provider: Provider name
+        :param resource: Resource name
+        :param seconds: Duration of the call
+        :param error: The raised exception, if any
+        """
+        self.inc(RESOURCE_CALLS, (provider, resource, "success" if error is None else type(error).__name__))
+        self.observe(RESOURCE_DURATION, (provider, resource), seconds)
+
+    def record_request(self, provider: str | None, transport: str, seconds: float, size: int | None = None):
+        """
+        Records a request or email sent by a transport
+
+        :param provider: Name of the sending provider, None outside of a send
+        :param transport: ``http`` or ``smtp``
+        :param seconds: Duration of the request
+        :param size: Size of the request body or email message in bytes, if known
+        """
+        labels = (provider or "unknown", transport)
+        self.inc(REQUESTS, labels)
+        self.observe(REQUEST_DURATION, labels, seconds)
+        if size is not None:
+            self.observe(PAYLOAD_SIZE, labels, size)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class PrometheusExporter(Exporter):
+    """
+    Aggregates metrics in memory and renders them in the Prometheus text exposition format, via :meth:`render` or the
+    HTTP endpoint started by :meth:`serve`
+
+    :param prefix: Prefix of all metric names
+    """
+
+    def __init__(self, prefix: str = DEFAULT_PREFIX):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, metric: Metric, labels: tuple, value: float):
+        key = (metric, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, metric: Metric, labels: tuple, value: float):
+        key = (metric, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # Per bucket counts, followed by the total count and sum
+                histogram = self._histograms[key] = [0] * (len(metric.buckets) + 2)
+            for index, bound in enumerate(metric.buckets):
+                if value <= bound:
+                    histogram[index] += 1
+                    break
+            histogram[-2] += 1
+            histogram[-1] += value
+
+    def reset(self):
+        """Discards all collected values"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Returns the collected metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(histogram) for key, histogram in self._histograms.items()}
+        lines = []
+        for metric in METRICS:
+            values = counters if metric.kind == COUNTER else histograms
+            series = sorted((labels, value) for (defined, labels), value in values.items() if defined is metric)
+            if not series:
+                continue
+            name = f"{self.prefix}_{metric.name}" if self.prefix else metric.name
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, value in series:
+                if metric.kind == COUNTER:
+                    lines.append(f"{name}{_format_labels(metric.labels, labels)} {value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets, value):
+                    cumulative += count
+                    bucket_labels = _format_labels(metric.labels, labels, f'le="{bound}"')
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                inf_labels = _format_labels(metric.labels, labels, 'le="+Inf"')
+                lines.append(f"{name}_bucket{inf_labels} {value[-2]}")
+                lines.append(f"{name}_sum{_format_labels(metric.labels, labels)} {value[-1]}")
+                lines.append(f"{name}_count{_format_labels(metric.labels, labels)} {value[-2]}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """
+        Serves :meth:`render` over HTTP on a daemon thread, for Prometheus to scrape
+
+        :param port: Port to listen on, 0 picks a free one
+        :param host: Address to listen on
+        :return: The running :class:`http.server.ThreadingHTTPServer`, call its ``shutdown`` method to stop it
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = exporter.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                log.debug("metrics endpoint: " + format, *args)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="notifiers-metrics", daemon=True).start()
+        return server
+
+
+class StatsDExporter(Exporter):
+    """
+    Sends every metric update as a StatsD datagram over UDP, usually to a local agent. Durations are sent as timers in
+    milliseconds. Sending is fire and forget, datagrams that can't be sent are dropped
+
+    :param host: Agent host
+    :param port: Agent port
+    :param prefix: Prefix of all metric names
+    :param tags: Send labels as DogStatsD tags instead of appending their values to the metric name
+    """
+
+    def __init__(self, host: str = DEFAULT_STATSD_HOST, port: int = DEFAULT_STATSD_PORT, prefix: str = DEFAULT_PREFIX, tags: bool = False):
+        import socket
+
+        self.address = (host, port)
+        self.prefix = prefix
+        self.tags = tags
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def __repr__(self):
+        return f"<StatsDExporter,address={self.address[0]}:{self.address[1]}>"
+
+    def _name(self, metric: Metric, labels: tuple) -> str:
+        name = metric.name
+        for suffix in ("_total", "_seconds"):
+            if name.endswith(suffix):
+                name = name[: -len(suffix)]
+        if self.prefix:
+            name = f"{self.prefix}.{name}"
+        if self.tags:
+            return name
+        return ".".join([name, *(str(value).replace(".", "_") for value in labels)])
+
+    def _send(self, metric: Metric, labels: tuple, value: str):
+        line = f"{self._name(metric, labels)}:{value}"
+        if self.tags and labels:
+            line += "|#" + ",".join(f"{name}:{value}" for name, value in zip(metric.labels, labels))
+        try:
+            self._socket.sendto(line.encode(), self.address)
+        except OSError as e:
+            log.debug("could not send metric %s: %s", line, e)
+
+    def inc(self, metric: Metric, labels: tuple, value: float):
+        self._send(metric, labels, f"{value:g}|c")
+
+    def observe(self, metric: Metric, labels: tuple, value: float):
+        if metric.name.endswith("_seconds"):
+            self._send(metric, labels, f"{value * 1000:g}|ms")
+        else:
+            self._send(metric, labels, f"{value:g}|h")
+
+    def close(self):
+        """Closes the UDP socket"""
+        self._socket.close()
+
+
+metrics = MetricsRegistry()
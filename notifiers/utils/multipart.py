@@ -0,0 +1,121 @@
+"""Streaming ``multipart/form-data`` request bodies"""
+
+from __future__ import annotations
+
+import mimetypes
+import os
+import uuid
+from collections.abc import Mapping
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _quote(name: str) -> str:
+    # Same escaping browsers and urllib3 use for names in Content-Disposition headers
+    return name.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def _encode_value(value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf-8")
+
+
+class MultipartEncoder:
+    """
+    A ``multipart/form-data`` request body that streams files instead of loading them into memory. Its length is known
+    up front, so requests are sent with a ``Content-Length`` header rather than chunked.
+
+    Files given by path are opened while their part is being sent and closed right after, even if sending fails
+    midway. File objects are read from their start and left open for their owner to close. The body can be iterated
+    more than once, so it can be sent again when a request is retried.
+
+    :param fields: Form fields, a dict or a list of ``(name, value)`` pairs. List values are sent as repeated fields and
+     ``None`` values are skipped
+    :param files: A list of ``(name, path)`` or ``(name, (filename, path_or_file, mimetype))`` pairs. The filename
+     defaults to the base name of the path and the mimetype is guessed from it if not set
+    :param boundary: Part boundary. A random one is used if not set
+    :param chunk_size: Number of bytes read from files at a time
+    """
+
+    def __init__(
+        self,
+        fields: Mapping | list | None = None,
+        files: list | None = None,
+        boundary: str | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self._parts = []
+        items = fields.items() if isinstance(fields, Mapping) else fields or []
+        for name, value in items:
+            for item in value if isinstance(value, (list, tuple)) else [value]:
+                if item is not None:
+                    self._add_field(name, item)
+        for name, file in files or []:
+            self._add_file(name, file)
+        self._end = f"--{self.boundary}--\r\n".encode()
+        self._length = sum(len(header) + size + 2 for header, _, size in self._parts) + len(self._end)
+
+    def __repr__(self):
+        return f"<MultipartEncoder,parts={len(self._parts)},length={self._length}>"
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def content_type(self) -> str:
+        """The ``Content-Type`` header value to send the body with"""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _header(self, name: str, filename: str | None = None, mimetype: str | None = None) -> bytes:
+        disposition = f'form-data; name="{_quote(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{_quote(filename)}"'
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if mimetype:
+            header += f"Content-Type: {mimetype}\r\n"
+        return (header + "\r\n").encode("utf-8")
+
+    def _add_field(self, name: str, value):
+        content = _encode_value(value)
+        self._parts.append((self._header(name), content, len(content)))
+
+    def _add_file(self, name: str, file):
+        filename, mimetype = None, None
+        if isinstance(file, tuple):
+            filename, file, *rest = file
+            mimetype = rest[0] if rest else None
+        if hasattr(file, "read"):
+            file.seek(0, os.SEEK_END)
+            size = file.tell()
+            path = getattr(file, "name", None)
+        else:
+            path = file = os.fspath(file)
+            size = os.path.getsize(file)
+        if filename is None:
+            filename = os.path.basename(path) if isinstance(path, str) else name
+        if mimetype is None:
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        self._parts.append((self._header(name, filename, mimetype), file, size))
+
+    def _read_file(self, file):
+        if hasattr(file, "read"):
+            file.seek(0)
+            while chunk := file.read(self.chunk_size):
+                yield chunk
+            return
+        with open(file, "rb") as opened:
+            while chunk := opened.read(self.chunk_size):
+                yield chunk
+
+    def __iter__(self):
+        for header, content, _ in self._parts:
+            yield header
+            if isinstance(content, bytes):
+                yield content
+            else:
+                yield from self._read_file(content)
+            yield b"\r\n"
+        yield self._end
@@ -0,0 +1,209 @@
+"""Client side rate limiting of notifications via token buckets"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+
+from ..exceptions import RateLimitExceeded
+
+log = logging.getLogger("notifiers")
+
+BLOCK = "block"
+REJECT = "reject"
+
+DEFAULT_MAX_BUCKETS = 10000
+# Max seconds a send blocks on a rate limit before raising, so a backlog never stalls callers indefinitely
+DEFAULT_MAX_WAIT = 30.0
+
+
+class TokenBucket:
+    """
+    A token bucket. Holds up to ``capacity`` tokens and refills at ``rate`` tokens per second. Not thread safe by
+    itself, :class:`RateLimiter` guards its buckets with a lock
+
+    :param rate: Tokens added per second. ``0`` means the bucket never refills
+    :param capacity: Maximum number of tokens, which is the allowed burst size
+    :param tokens: Initial number of tokens. Defaults to ``capacity``
+    :param expires_in: Seconds after which the bucket is discarded. ``None`` means it never expires
+    """
+
+    def __init__(self, rate: float, capacity: float, tokens: float | None = None, expires_in: float | None = None):
+        now = time.monotonic()
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity if tokens is None else tokens
+        self.expires_at = now + expires_in if expires_in is not None else None
+        self._updated = now
+
+    def __repr__(self):
+        return f"<TokenBucket,rate={self.rate},capacity={self.capacity},tokens={self.tokens:.2f}>"
+
+    def refill(self, now: float):
+        if now <= self._updated:
+            return
+        if self.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Returns the seconds until a token is available, which may be infinite if the bucket never refills"""
+        self.refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        if not self.rate:
+            return math.inf
+        return (1 - self.tokens) / self.rate
+
+    def expired(self, now: float) -> bool:
+        return self.expires_at is not None and now >= self.expires_at
+
+    def is_full(self, now: float) -> bool:
+        self.refill(now)
+        return self.tokens >= self.capacity
+
+
+class RateLimit:
+    """
+    A rate limit rule. Sends with the same values for the ``key`` data fields share a bucket, so a rule keyed by
+    ``token`` limits a bot while one keyed by ``("token", "chat_id")`` limits a single chat of that bot.
+    A rule without a ``rate`` only applies to buckets seeded via :meth:`RateLimiter.seed`
+
+    :param rate: Number of sends allowed per ``per`` seconds
+    :param per: The period in seconds. Default is 1
+    :param key: Data field name or names the limit is keyed by. An empty key limits the provider as a whole
+    :param burst: Number of sends allowed at once. Default is 1, which evenly spaces sends
+    """
+
+    def __init__(self, rate: float | None, per: float = 1.0, key: str | tuple = (), burst: int = 1):
+        self.rate = rate
+        self.per = per
+        self.key = (key,) if isinstance(key, str) else tuple(key)
+        self.burst = burst
+
+    def __repr__(self):
+        return f"<RateLimit,rate={self.rate},per={self.per},key={self.key}>"
+
+    def bucket_key(self, provider: str, data: dict) -> tuple | None:
+        """Returns the bucket key for ``data``, or None if data is missing any of the key fields"""
+        try:
+            return (provider, self.key, tuple(str(data[field]) for field in self.key))
+        except KeyError:
+            return None
+
+    def create_bucket(self) -> TokenBucket | None:
+        if self.rate is None:
+            return None
+        return TokenBucket(rate=self.rate / self.per, capacity=self.burst)
+
+
+class RateLimiter:
+    """
+    A thread safe registry of token buckets that limits sends according to :class:`RateLimit` rules
+
+    :param mode: ``block`` to wait until a send is allowed, or ``reject`` to raise
+     :class:`~notifiers.exceptions.RateLimitExceeded` instead
+    :param max_wait: When blocking, max seconds to wait before raising instead. ``None`` waits as long as needed
+    :param max_buckets: Number of buckets after which full, unused buckets are discarded. Seeded buckets are only
+     discarded once expired
+    """
+
+    def __init__(self, mode: str = BLOCK, max_wait: float | None = DEFAULT_MAX_WAIT, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        if mode not in {BLOCK, REJECT}:
+            raise ValueError(f"mode must be one of '{BLOCK}' or '{REJECT}', got '{mode}'")
+        self.mode = mode
+        self.max_wait = max_wait
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets = {}
+        # Keys of seeded buckets, which hold state that can't be recreated and are only discarded once expired
+        self._seeded = set()
+
+    def __repr__(self):
+        return f"<RateLimiter,mode={self.mode},buckets={len(self._buckets)}>"
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _bucket(self, key: tuple, rule: RateLimit, now: float) -> TokenBucket | None:
+        bucket = self._buckets.get(key)
+        if bucket is not None and bucket.expired(now):
+            del self._buckets[key]
+            self._seeded.discard(key)
+            bucket = None
+        if bucket is None:
+            bucket = rule.create_bucket()
+            if bucket is not None:
+                if len(self._buckets) >= self.max_buckets:
+                    self._prune(now)
+                self._buckets[key] = bucket
+        return bucket
+
+    def _prune(self, now: float):
+        # Full buckets hold no state worth keeping, they're recreated as needed. Seeded buckets are kept until they
+        # expire, even when full, since their quota comes from the provider
+        for key, bucket in list(self._buckets.items()):
+            if bucket.expired(now) or (key not in self._seeded and bucket.is_full(now)):
+                del self._buckets[key]
+                self._seeded.discard(key)
+
+    def reserve(self, provider: str, rules: tuple, data: dict) -> float:
+        """
+        Takes a token from every bucket that applies to the send and returns how long to wait before sending
+
+        :param provider: Provider name
+        :param rules: The provider's :class:`RateLimit` rules
+        :param data: The processed notification data
+        :return: Seconds to wait before sending
+        :raises: :class:`~notifiers.exceptions.RateLimitExceeded` when rejecting or if the wait is too long
+        """
+        now = time.monotonic()
+        with self._lock:
+            buckets = []
+            for rule in rules:
+                key = rule.bucket_key(provider, data)
+                bucket = self._bucket(key, rule, now) if key is not None else None
+                if bucket is not None:
+                    buckets.append(bucket)
+            wait = max((bucket.wait_time(now) for bucket in buckets), default=0.0)
+            if wait and (self.mode == REJECT or wait == math.inf or (self.max_wait is not None and wait > self.max_wait)):
+                raise RateLimitExceeded(provider=provider, data=data, retry_after=wait)
+            # Tokens may go negative, which queues up blocked senders behind each other
+            for bucket in buckets:
+                bucket.tokens -= 1
+        if wait:
+            log.debug("rate limit of %s reached, waiting %.2fs", provider, wait)
+        return wait
+
+    def acquire(self, provider: str, rules: tuple, data: dict):
+        """Like :meth:`reserve`, but sleeps until the send is allowed"""
+        wait = self.reserve(provider, rules, data)
+        if wait:
+            time.sleep(wait)
+
+    def seed(self, provider: str, rule: RateLimit, data: dict, bucket: TokenBucket):
+        """
+        Sets the bucket used by ``rule`` for sends matching ``data``, for example from a provider reported quota
+
+        :param provider: Provider name
+        :param rule: The :class:`RateLimit` rule the bucket belongs to
+        :param data: Data holding the rule key fields
+        :param bucket: The :class:`TokenBucket` to use
+        """
+        key = rule.bucket_key(provider, data)
+        if key is None:
+            raise ValueError(f"data is missing rate limit key fields {rule.key}")
+        with self._lock:
+            self._buckets[key] = bucket
+            self._seeded.add(key)
+
+    def reset(self):
+        """Discards all buckets"""
+        with self._lock:
+            self._buckets.clear()
+            self._seeded.clear()
+
+
+rate_limiter = RateLimiter()
@@ -1,12 +1,199 @@
 from __future__ import annotations
 
+import http.cookiejar
 import json
 import logging
+import threading
+import time
+from time import perf_counter
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from ..transports import Transport, get_transport
+from .circuit import circuit_breakers
+from .context import current_context
+from .retry import IDEMPOTENT_METHODS, NO_RETRY, Attempt
+from .timings import record_timing
 
 log = logging.getLogger("notifiers")
 
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+
+class _TimedConnectionMixin:
+    """Records the ``connect`` and ``first_byte`` phases of the send in progress"""
+
+    _tcp_time = 0.0
+
+    def _new_conn(self):
+        start = perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            self._tcp_time = perf_counter() - start
+            record_timing("connect", self._tcp_time)
+
+    def getresponse(self, *args, **kwargs):
+        start = perf_counter()
+        try:
+            return super().getresponse(*args, **kwargs)
+        finally:
+            record_timing("first_byte", perf_counter() - start)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    """Also records the ``tls`` phase, the part of connecting that isn't opening the TCP connection"""
+
+    def connect(self):
+        start = perf_counter()
+        super().connect()
+        record_timing("tls", perf_counter() - start - self._tcp_time)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    An :class:`~requests.adapters.HTTPAdapter` whose connections record the time spent connecting, in the TLS
+    handshake and waiting for the response headers to the :class:`~notifiers.utils.timings.Timings` of the send in
+    progress. Requests sent outside of a send are not timed
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool, "https": _TimedHTTPSConnectionPool}
+
+
+class SessionPool:
+    """
+    A thread safe registry of :class:`requests.Session` objects, one per scheme and host. Reusing a session keeps the
+    underlying connections alive between notifications, so consecutive requests to the same provider skip the TCP
+    and TLS handshakes. Sessions reject cookies, since a session is shared by every account that sends to the host.
+
+    :param pool_connections: Number of connection pools to cache per session
+    :param pool_maxsize: Maximum number of connections to keep per pool
+    :param keep_alive: Should connections be kept alive between requests. Default is **True**
+    :param idle_timeout: Seconds after which an unused session is closed and evicted. ``None`` disables eviction
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keep_alive: bool = True,
+        idle_timeout: float | None = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._last_sweep = time.monotonic()
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.idle_timeout = idle_timeout
+
+    def __repr__(self):
+        return f"<SessionPool,sessions={len(self._sessions)}>"
+
+    def __len__(self):
+        return len(self._sessions)
+
+    @staticmethod
+    def _key(url: str) -> tuple:
+        parts = urlsplit(url)
+        return parts.scheme.lower(), parts.netloc.lower()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        # A cookie set by a response to one account's request must not be sent with another account's requests
+        session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        adapter = TimedHTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def get(self, url: str) -> requests.Session:
+        """
+        Returns the session matching the scheme and host of ``url``, creating one if needed
+
+        :param url: The URL that is about to be requested
+        :return: A pooled :class:`requests.Session`
+        """
+        key = self._key(url)
+        now = time.monotonic()
+        with self._lock:
+            if self.idle_timeout is not None and now - self._last_sweep >= self.idle_timeout:
+                self._evict(now)
+            entry = self._sessions.get(key)
+            if entry is None:
+                log.debug("creating a new pooled session for %s://%s", *key)
+                entry = self._sessions[key] = [self._create_session(), now]
+            else:
+                entry[1] = now
+            return entry[0]
+
+    def _evict(self, now: float) -> int:
+        self._last_sweep = now
+        expired = [key for key, (_, last_used) in self._sessions.items() if now - last_used >= self.idle_timeout]
+        for key in expired:
+            log.debug("evicting idle pooled session for %s://%s", *key)
+            self._sessions.pop(key)[0].close()
+        return len(expired)
+
+    def evict_idle(self) -> int:
+        """
+        Closes and removes all sessions that were idle for longer than ``idle_timeout``
+
+        :return: Number of evicted sessions
+        """
+        if self.idle_timeout is None:
+            return 0
+        with self._lock:
+            return self._evict(time.monotonic())
+
+    def configure(self, **kwargs):
+        """
+        Changes pool settings. Existing sessions are closed so new settings apply to all future requests
+
+        :param kwargs: Any of the :class:`SessionPool` init arguments
+        """
+        with self._lock:
+            for key, value in kwargs.items():
+                if key not in {"pool_connections", "pool_maxsize", "keep_alive", "idle_timeout"}:
+                    raise ValueError(f"Unknown session pool setting: {key}")
+                setattr(self, key, value)
+            self._close_all()
+
+    def _close_all(self):
+        for session, _ in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+    def close(self):
+        """Closes all pooled sessions"""
+        with self._lock:
+            self._close_all()
+
+
+session_pool = SessionPool()
+
 
 class RequestsHelper:
     """A wrapper around :class:`requests.Session` which enables generically handling HTTP requests"""
@@ -22,16 +209,22 @@ class RequestsHelper:
         **kwargs,
     ) -> tuple:
         """
-        A wrapper method for :meth:`~requests.Session.request``, which adds some defaults and logging
+        A wrapper method for :meth:`~requests.Session.request``, which adds some defaults and logging.
+        When called during a notification send, failed requests are retried according to the provider's
+        :class:`~notifiers.utils.retry.RetryPolicy` and each attempt is recorded in the current
+        :class:`~notifiers.utils.context.SendContext`. Requests to an endpoint that is down fail fast once its
+        :class:`~notifiers.utils.circuit.CircuitBreaker` opens. Requests are sent via the
+        :class:`~notifiers.transports.Transport` of the send in progress, or the default one
 
         :param url: The URL to send the reply to
         :param method: The method to use
         :param raise_for_status: Should an exception be raised for a failed response. Default is **True**
         :param args: Additional args to be sent to the request
-        :param kwargs: Additional args to be sent to the request
+        :param kwargs: Additional args to be sent to the request. Pass ``session`` to use a specific
+         :class:`requests.Session` instead of the one from :data:`session_pool` with the default transport
         :return: Dict of response body or original :class:`requests.Response`
+        :raises: :class:`~notifiers.exceptions.CircuitOpenError` if the endpoint's circuit is open
         """
-        session = kwargs.get("session", requests.Session())
         if "timeout" not in kwargs:
             kwargs["timeout"] = (5, 20)
         log.debug(
@@ -42,33 +235,99 @@ class RequestsHelper:
             kwargs,
         )
 
-        if raise_for_status:
+        context = current_context()
+        transport = get_transport()
+        policy = context.retry_policy if context is not None and context.retry_policy is not None else NO_RETRY
+        idempotent = method.lower() in IDEMPOTENT_METHODS or (context is not None and context.idempotent)
+        breaker = None
+        if context is not None and circuit_breakers.enabled:
+            breaker = circuit_breakers.get(context.provider, urlsplit(url).netloc.lower())
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_start = time.monotonic()
+            if breaker is not None:
+                breaker.before_request()
+            rsp = None
             try:
-                rsp = session.request(method, url, *args, **kwargs)
-                log.debug("response: %s", rsp.text)
-                errors = None
+                rsp, errors, error = self._attempt(transport, url, method, raise_for_status, path_to_errors, *args, **kwargs)
+            finally:
+                if breaker is not None:
+                    # Client errors mean the endpoint is up, only missing or server error responses count as failures.
+                    # Always recorded, even when the attempt raised, so a half open circuit doesn't wait for a probe
+                    # result forever
+                    breaker.record(rsp is not None and rsp.status_code < 500)
+            now = time.monotonic()
+            delay = None if errors is None else policy.next_delay(attempt, rsp, error, idempotent, now - start)
+            if context is not None:
+                context.attempts.append(
+                    Attempt(
+                        attempt,
+                        status_code=rsp.status_code if rsp is not None else None,
+                        error=str(error) if rsp is None and error is not None else None,
+                        elapsed=now - attempt_start,
+                        delay=delay,
+                    )
+                )
+            if delay is None:
+                break
+            log.debug("attempt %s to access %s failed, retrying in %.2fs", attempt, url, delay)
+            _rewind_files(kwargs.get("files"))
+            time.sleep(delay)
+
+        log.debug("returning response %s, errors %s", rsp, errors)
+        return rsp, errors
+
+    @classmethod
+    def _attempt(
+        self,
+        transport: Transport,
+        url: str,
+        method: str,
+        raise_for_status: bool,
+        path_to_errors: tuple | None,
+        *args,
+        **kwargs,
+    ) -> tuple:
+        rsp, errors, error = None, None, None
+        try:
+            rsp = transport.request(method, url, *args, **kwargs)
+            log.debug("response: %s", rsp.text)
+            if raise_for_status:
                 rsp.raise_for_status()
-            except requests.RequestException as e:
-                if e.response is not None:
-                    rsp = e.response
-                    if path_to_errors:
-                        try:
-                            errors = rsp.json()
-                            for arg in path_to_errors:
-                                if errors.get(arg):
-                                    errors = errors[arg]
-                        except json.decoder.JSONDecodeError:
-                            errors = [rsp.text]
-                    else:
+        except requests.RequestException as e:
+            error = e
+            if e.response is not None:
+                rsp = e.response
+                if path_to_errors:
+                    try:
+                        errors = rsp.json()
+                        for arg in path_to_errors:
+                            if errors.get(arg):
+                                errors = errors[arg]
+                    except json.decoder.JSONDecodeError:
                         errors = [rsp.text]
-                    if not isinstance(errors, list):
-                        errors = [errors]
                 else:
-                    rsp = None
-                    errors = [str(e)]
-                log.debug("errors when trying to access %s: %s", url, errors)
-        log.debug("returning response %s, errors %s", rsp, errors)
-        return rsp, errors
+                    errors = [rsp.text]
+                if not isinstance(errors, list):
+                    errors = [errors]
+            else:
+                rsp = None
+                errors = [str(e)]
+            log.debug("errors when trying to access %s: %s", url, errors)
+        return rsp, errors, error
+
+
+def _rewind_files(files):
+    """Seeks request files back to their start so they can be sent again"""
+    if not files:
+        return
+    entries = files.values() if isinstance(files, dict) else (entry for _, entry in files)
+    for entry in entries:
+        file = entry[1] if isinstance(entry, tuple) else entry
+        if hasattr(file, "seek"):
+            file.seek(0)
 
 
 def get(url: str, *args, **kwargs) -> tuple:
@@ -88,7 +347,8 @@ def file_list_for_request(list_of_paths: list, key_name: str, mimetype: str | No
     :param list_of_paths: Lists of strings to include in files. Should be pre validated for correctness
     :param key_name: The key name to use for the file list in the request
     :param mimetype: If specified, will be included in the requests
-    :return: List of open files ready to be used in a request
+    :return: List of open files ready to be used in a request. The caller must close them, consider using a
+     :class:`~notifiers.utils.multipart.MultipartEncoder` instead, which streams files and closes them once sent
     """
     if mimetype:
         return [(key_name, (file, open(file, mode="rb"), mimetype)) for file in list_of_paths]
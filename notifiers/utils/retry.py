@@ -0,0 +1,181 @@
+"""Retry policies for provider HTTP requests"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+
+log = logging.getLogger("notifiers")
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 10.0
+DEFAULT_TOTAL_TIMEOUT = 30.0
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Statuses that mean the request was rejected before being processed, so repeating it can't create a duplicate
+REJECTED_STATUSES = frozenset({429})
+
+IDEMPOTENT_METHODS = frozenset({"get", "head", "options", "put", "delete"})
+
+
+class Attempt:
+    """
+    A record of a single request attempt
+
+    :param number: Attempt number, starting at 1
+    :param status_code: HTTP status code of the response, or None if no response was received
+    :param error: A string of the connection error, if any
+    :param elapsed: Seconds the attempt took
+    :param delay: Seconds waited before the next attempt, or None if this was the last one
+    """
+
+    def __init__(
+        self,
+        number: int,
+        status_code: int | None = None,
+        error: str | None = None,
+        elapsed: float = 0.0,
+        delay: float | None = None,
+    ):
+        self.number = number
+        self.status_code = status_code
+        self.error = error
+        self.elapsed = elapsed
+        self.delay = delay
+
+    def __repr__(self):
+        return f"<Attempt,number={self.number},status_code={self.status_code},error={self.error}>"
+
+
+class RetryPolicy:
+    """
+    Decides if and when a failed request is retried.
+
+    Responses with a status in ``retry_statuses`` and connection errors are retried with exponential backoff. A
+    ``Retry-After`` header, or a value found in the response JSON under ``retry_after_path``, takes precedence over the
+    backoff. Requests that are not idempotent, such as a ``POST`` without an idempotency key, are only retried when
+    the server surely did not process them: on a ``429`` response or a connection timeout.
+
+    :param max_attempts: Maximum number of attempts, including the first one. ``1`` disables retries
+    :param backoff: Base delay in seconds, doubled on every attempt
+    :param max_backoff: Maximum delay in seconds between attempts
+    :param jitter: Should the delay be randomized between zero and the backoff. Default is **True**
+    :param total_timeout: Seconds after which no more attempts are made. ``None`` disables the limit
+    :param retry_statuses: HTTP status codes that can be retried
+    :param retry_after_path: Keys leading to a retry delay in the response JSON, for example
+     ``("parameters", "retry_after")``
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        jitter: bool = True,
+        total_timeout: float | None = DEFAULT_TOTAL_TIMEOUT,
+        retry_statuses: frozenset = DEFAULT_RETRY_STATUSES,
+        retry_after_path: tuple | None = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.total_timeout = total_timeout
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_after_path = retry_after_path
+
+    def __repr__(self):
+        return f"<RetryPolicy,max_attempts={self.max_attempts},backoff={self.backoff},total_timeout={self.total_timeout}>"
+
+    def is_retryable(self, response, error: Exception | None, idempotent: bool) -> bool:
+        """
+        Checks if a failed attempt can be retried
+
+        :param response: The :class:`requests.Response` of the attempt, if one was received
+        :param error: The :class:`requests.RequestException` raised by the attempt, if any
+        :param idempotent: Can the request be safely repeated
+        :return: **True** if the request can be retried
+        """
+        if response is None:
+            if error is None:
+                return False
+            import requests
+
+            if isinstance(error, requests.ConnectTimeout):
+                return True
+            return idempotent and isinstance(error, (requests.ConnectionError, requests.Timeout))
+        if response.status_code not in self.retry_statuses:
+            return False
+        return idempotent or response.status_code in REJECTED_STATUSES
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Returns the delay before the next attempt when the server didn't ask for a specific one
+
+        :param attempt: The number of the attempt that failed
+        :return: Delay in seconds
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def retry_after(self, response) -> float | None:
+        """
+        Returns the delay the server asked for via the ``Retry-After`` header or the response JSON
+
+        :param response: A :class:`requests.Response`
+        :return: Delay in seconds or None if the server did not ask for one
+        """
+        if response is None:
+            return None
+        if self.retry_after_path:
+            try:
+                value = response.json()
+                for key in self.retry_after_path:
+                    value = value[key]
+                return max(float(value), 0.0)
+            except (ValueError, TypeError, KeyError, IndexError):
+                pass
+        header = response.headers.get("Retry-After")
+        if not header:
+            return None
+        try:
+            return max(float(header), 0.0)
+        except ValueError:
+            pass
+        from email.utils import parsedate_to_datetime
+
+        try:
+            retry_at = parsedate_to_datetime(header)
+        except (TypeError, ValueError):
+            return None
+        return max(retry_at.timestamp() - time.time(), 0.0)
+
+    def next_delay(self, attempt: int, response, error: Exception | None, idempotent: bool, elapsed: float) -> float | None:
+        """
+        Returns the delay before the next attempt, or None if the request should not be retried
+
+        :param attempt: The number of the attempt that failed
+        :param response: The :class:`requests.Response` of the attempt, if one was received
+        :param error: The :class:`requests.RequestException` raised by the attempt, if any
+        :param idempotent: Can the request be safely repeated
+        :param elapsed: Seconds since the first attempt started
+        :return: Delay in seconds or None
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(response, error, idempotent):
+            return None
+        delay = self.retry_after(response)
+        if delay is None:
+            delay = self.backoff_delay(attempt)
+        if self.total_timeout is not None and elapsed + delay > self.total_timeout:
+            log.debug("not retrying, a delay of %.2fs would exceed the total timeout of %ss", delay, self.total_timeout)
+            return None
+        return delay
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,304 @@
+"""
+Compiles provider JSON schemas into plain Python validation functions.
+
+A compiled validator only answers whether data is valid. It is used as a fast path before falling back to the full
+:mod:`jsonschema` validator, which is still used to produce error messages. Schemas that use keywords the compiler
+does not support are not compiled, and such providers always use the full validator.
+"""
+
+from __future__ import annotations
+
+import numbers
+import re
+
+TYPE_CHECKS = {
+    "string": lambda instance: isinstance(instance, str),
+    "integer": lambda instance: isinstance(instance, int) and not isinstance(instance, bool),
+    "number": lambda instance: isinstance(instance, numbers.Number) and not isinstance(instance, bool),
+    "boolean": lambda instance: isinstance(instance, bool),
+    "object": lambda instance: isinstance(instance, dict),
+    "array": lambda instance: isinstance(instance, list),
+    "null": lambda instance: instance is None,
+}
+
+is_number = TYPE_CHECKS["number"]
+
+
+class Unsupported(Exception):
+    """Raised when compiling a schema that uses a keyword or construct the compiler does not support"""
+
+
+class Undecided(Exception):
+    """Raised by a compiled check that cannot give an exact answer for a given instance"""
+
+
+def always_valid(_instance) -> bool:
+    return True
+
+
+class SchemaCompiler:
+    """
+    Compiles draft 4 JSON schemas into validation functions. Each supported keyword is compiled once into a small
+    check, and the checks of a schema are chained into a single function
+
+    :param format_checker: A :class:`jsonschema.FormatChecker` to check ``format`` with. If not set, formats are ignored
+    """
+
+    # Draft 4 keywords that are deliberately not compiled
+    unsupported_keywords = frozenset({"$ref", "multipleOf"})
+
+    keywords = {
+        "type": "_compile_type",
+        "enum": "_compile_enum",
+        "format": "_compile_format",
+        "pattern": "_compile_pattern",
+        "minLength": "_compile_min_length",
+        "maxLength": "_compile_max_length",
+        "minimum": "_compile_minimum",
+        "maximum": "_compile_maximum",
+        "properties": "_compile_properties",
+        "patternProperties": "_compile_pattern_properties",
+        "additionalProperties": "_compile_additional_properties",
+        "required": "_compile_required",
+        "minProperties": "_compile_min_properties",
+        "maxProperties": "_compile_max_properties",
+        "dependencies": "_compile_dependencies",
+        "items": "_compile_items",
+        "additionalItems": "_compile_additional_items",
+        "minItems": "_compile_min_items",
+        "maxItems": "_compile_max_items",
+        "uniqueItems": "_compile_unique_items",
+        "allOf": "_compile_all_of",
+        "anyOf": "_compile_any_of",
+        "oneOf": "_compile_one_of",
+        "not": "_compile_not",
+    }
+
+    def __init__(self, format_checker=None):
+        self.format_checker = format_checker
+
+    def compile(self, schema: dict) -> callable:
+        """
+        Compiles a schema into a function that returns whether an instance is valid
+
+        :param schema: JSON schema to compile
+        :return: A validation function
+        :raises: :class:`Unsupported` if the schema uses unsupported keywords
+        """
+        if not isinstance(schema, dict):
+            raise Unsupported(f"schema {schema!r}")
+        checks = []
+        for keyword, value in schema.items():
+            if keyword in self.unsupported_keywords:
+                raise Unsupported(keyword)
+            method = self.keywords.get(keyword)
+            if method is None:
+                # Annotations, custom error messages and unknown keywords have no effect on validation
+                continue
+            check = getattr(self, method)(value, schema)
+            if check is not always_valid:
+                checks.append(check)
+
+        if not checks:
+            return always_valid
+        if len(checks) == 1:
+            return checks[0]
+        checks = tuple(checks)
+        return lambda instance: all(check(instance) for check in checks)
+
+    def _compile_type(self, value, schema: dict) -> callable:
+        types = value if isinstance(value, list) else [value]
+        try:
+            checks = tuple(TYPE_CHECKS[type_] for type_ in types)
+        except (KeyError, TypeError) as e:
+            raise Unsupported(f"type {value!r}") from e
+        if len(checks) == 1:
+            return checks[0]
+        return lambda instance: any(check(instance) for check in checks)
+
+    def _compile_enum(self, value, schema: dict) -> callable:
+        strings = frozenset(item for item in value if isinstance(item, str))
+        only_strings = len(strings) == len(value)
+
+        def check(instance) -> bool:
+            if isinstance(instance, str):
+                return instance in strings
+            if only_strings:
+                return False
+            # Non string equality follows jsonschema's own rules (bool is not int, etc.), let it decide
+            raise Undecided
+
+        return check
+
+    def _compile_format(self, value, schema: dict) -> callable:
+        if self.format_checker is None:
+            return always_valid
+        return lambda instance: self.format_checker.conforms(instance, value)
+
+    def _compile_pattern(self, value, schema: dict) -> callable:
+        search = re.compile(value).search
+        return lambda instance: not isinstance(instance, str) or search(instance) is not None
+
+    def _compile_min_length(self, value, schema: dict) -> callable:
+        return lambda instance: not isinstance(instance, str) or len(instance) >= value
+
+    def _compile_max_length(self, value, schema: dict) -> callable:
+        return lambda instance: not isinstance(instance, str) or len(instance) <= value
+
+    def _compile_minimum(self, value, schema: dict) -> callable:
+        if schema.get("exclusiveMinimum", False):
+            return lambda instance: not is_number(instance) or instance > value
+        return lambda instance: not is_number(instance) or instance >= value
+
+    def _compile_maximum(self, value, schema: dict) -> callable:
+        if schema.get("exclusiveMaximum", False):
+            return lambda instance: not is_number(instance) or instance < value
+        return lambda instance: not is_number(instance) or instance <= value
+
+    def _compile_properties(self, value, schema: dict) -> callable:
+        properties = {name: self.compile(subschema) for name, subschema in value.items()}
+
+        def check(instance) -> bool:
+            if not isinstance(instance, dict):
+                return True
+            for key, item in instance.items():
+                check_property = properties.get(key)
+                if check_property is not None and not check_property(item):
+                    return False
+            return True
+
+        return check
+
+    def _compile_pattern_properties(self, value, schema: dict) -> callable:
+        patterns = tuple((re.compile(pattern).search, self.compile(subschema)) for pattern, subschema in value.items())
+
+        def check(instance) -> bool:
+            if not isinstance(instance, dict):
+                return True
+            for key, item in instance.items():
+                for search, check_property in patterns:
+                    if search(key) and not check_property(item):
+                        return False
+            return True
+
+        return check
+
+    def _compile_additional_properties(self, value, schema: dict) -> callable:
+        if value is True:
+            return always_valid
+        allowed = frozenset(schema.get("properties", {}))
+        patterns = tuple(re.compile(pattern).search for pattern in schema.get("patternProperties", {}))
+
+        def is_additional(key: str) -> bool:
+            return key not in allowed and not any(search(key) for search in patterns)
+
+        if value is False:
+            return lambda instance: not isinstance(instance, dict) or not any(is_additional(key) for key in instance)
+        check_additional = self.compile(value)
+        return lambda instance: not isinstance(instance, dict) or all(check_additional(item) for key, item in instance.items() if is_additional(key))
+
+    def _compile_required(self, value, schema: dict) -> callable:
+        if not isinstance(value, list):
+            raise Unsupported(f"required {value!r}")
+        return lambda instance: not isinstance(instance, dict) or all(key in instance for key in value)
+
+    def _compile_min_properties(self, value, schema: dict) -> callable:
+        return lambda instance: not isinstance(instance, dict) or len(instance) >= value
+
+    def _compile_max_properties(self, value, schema: dict) -> callable:
+        return lambda instance: not isinstance(instance, dict) or len(instance) <= value
+
+    def _compile_dependencies(self, value, schema: dict) -> callable:
+        dependencies = []
+        for key, dependency in value.items():
+            if isinstance(dependency, list):
+                dependencies.append((key, lambda instance, dependency=dependency: all(item in instance for item in dependency)))
+            elif isinstance(dependency, dict):
+                dependencies.append((key, self.compile(dependency)))
+            else:
+                raise Unsupported(f"dependency {dependency!r}")
+
+        def check(instance) -> bool:
+            if not isinstance(instance, dict):
+                return True
+            return all(check_dependency(instance) for key, check_dependency in dependencies if key in instance)
+
+        return check
+
+    def _compile_items(self, value, schema: dict) -> callable:
+        if not isinstance(value, dict):
+            raise Unsupported("tuple validation via items")
+        check_item = self.compile(value)
+        return lambda instance: not isinstance(instance, list) or all(check_item(item) for item in instance)
+
+    def _compile_additional_items(self, value, schema: dict) -> callable:
+        # Only relevant alongside tuple validation, which is unsupported
+        return always_valid
+
+    def _compile_min_items(self, value, schema: dict) -> callable:
+        return lambda instance: not isinstance(instance, list) or len(instance) >= value
+
+    def _compile_max_items(self, value, schema: dict) -> callable:
+        return lambda instance: not isinstance(instance, list) or len(instance) <= value
+
+    def _compile_unique_items(self, value, schema: dict) -> callable:
+        if not value:
+            return always_valid
+
+        def check(instance) -> bool:
+            if not isinstance(instance, list):
+                return True
+            if not all(isinstance(item, str) for item in instance):
+                raise Undecided
+            return len(set(instance)) == len(instance)
+
+        return check
+
+    def _compile_all_of(self, value, schema: dict) -> callable:
+        checks = tuple(self.compile(subschema) for subschema in value)
+        return lambda instance: all(check(instance) for check in checks)
+
+    def _compile_any_of(self, value, schema: dict) -> callable:
+        checks = tuple(self.compile(subschema) for subschema in value)
+        return lambda instance: any(check(instance) for check in checks)
+
+    def _compile_one_of(self, value, schema: dict) -> callable:
+        checks = tuple(self.compile(subschema) for subschema in value)
+
+        def check(instance) -> bool:
+            matches = 0
+            for check_subschema in checks:
+                if check_subschema(instance):
+                    matches += 1
+                    if matches > 1:
+                        return False
+            return matches == 1
+
+        return check
+
+    def _compile_not(self, value, schema: dict) -> callable:
+        check_subschema = self.compile(value)
+        return lambda instance: not check_subschema(instance)
+
+
+def compile_schema(schema: dict, format_checker=None) -> callable | None:
+    """
+    Compiles a draft 4 JSON schema into a function that returns **True** only if data is valid.
+    A **False** result means the data should be checked by the full validator, which decides and reports errors
+
+    :param schema: JSON schema to compile
+    :param format_checker: A :class:`jsonschema.FormatChecker` to check ``format`` with. If not set, formats are ignored
+    :return: A validation function, or None if the schema uses unsupported keywords
+    """
+    try:
+        check = SchemaCompiler(format_checker).compile(schema)
+    except Unsupported:
+        return None
+
+    def validate(instance) -> bool:
+        try:
+            return check(instance)
+        except Undecided:
+            return False
+
+    return validate
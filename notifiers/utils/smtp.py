@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import smtplib
+import threading
+import time
+from collections import defaultdict, deque
+
+log = logging.getLogger("notifiers")
+
+DEFAULT_MAX_CONNECTIONS = 5
+DEFAULT_MAX_MESSAGES = 100
+DEFAULT_CHECK_AFTER = 10.0
+
+
+class PooledConnection:
+    """
+    A pooled SMTP connection and its usage stats
+
+    :param server: Connected and authenticated :class:`smtplib.SMTP` or :class:`smtplib.SMTP_SSL` object
+    """
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+    def __repr__(self):
+        return f"<PooledConnection,messages={self.messages}>"
+
+    def is_alive(self) -> bool:
+        """Checks the connection via an SMTP ``NOOP`` command"""
+        try:
+            return self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close(self):
+        """Politely closes the connection, ignoring errors from an already dropped connection"""
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            with contextlib.suppress(OSError):
+                self.server.close()
+
+
+class SMTPConnectionPool:
+    """
+    A thread safe pool of connected and authenticated SMTP connections, keyed by connection configuration
+    such as ``(host, port, username, password digest, tls, ssl)``
+
+    :param max_connections: Maximum number of open connections per key. Additional senders wait for a free connection
+    :param max_messages: Number of messages after which a connection is closed and replaced
+    :param check_after: Seconds of idleness after which a connection is checked via ``NOOP`` before it's reused
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_messages: int = DEFAULT_MAX_MESSAGES,
+        check_after: float = DEFAULT_CHECK_AFTER,
+    ):
+        self.max_connections = max_connections
+        self.max_messages = max_messages
+        self.check_after = check_after
+        self._condition = threading.Condition()
+        self._idle = defaultdict(deque)
+        self._open = defaultdict(int)
+
+    def __repr__(self):
+        return f"<SMTPConnectionPool,open={sum(self._open.values())}>"
+
+    def open_connections(self, key: tuple) -> int:
+        """Returns the number of open connections, idle or in use, for a given key"""
+        return self._open[key]
+
+    def _acquire(self, key: tuple, connect: callable) -> PooledConnection:
+        with self._condition:
+            while not self._idle[key] and self._open[key] >= self.max_connections:
+                self._condition.wait()
+            connection = self._idle[key].pop() if self._idle[key] else None
+            if connection is None:
+                # Reserve a slot before connecting outside of the lock
+                self._open[key] += 1
+
+        if connection is not None:
+            if time.monotonic() - connection.last_used < self.check_after or connection.is_alive():
+                return connection
+            log.debug("pooled SMTP connection to %s is dead, reconnecting", key[:2])
+            connection.close()
+
+        try:
+            return PooledConnection(connect())
+        except BaseException:
+            self._discard_slot(key)
+            raise
+
+    def _discard_slot(self, key: tuple):
+        with self._condition:
+            self._open[key] -= 1
+            self._condition.notify()
+
+    def _release(self, key: tuple, connection: PooledConnection, healthy: bool):
+        connection.last_used = time.monotonic()
+        if healthy and connection.messages < self.max_messages:
+            with self._condition:
+                self._idle[key].append(connection)
+                self._condition.notify()
+            return
+        connection.close()
+        self._discard_slot(key)
+
+    @contextlib.contextmanager
+    def connection(self, key: tuple, connect: callable):
+        """
+        A context manager that yields a pooled SMTP connection, creating one via ``connect`` if none is available.
+        A connection that raised a connection related error is closed instead of being returned to the pool
+
+        :param key: The connection configuration key
+        :param connect: A callable returning a new connected and authenticated :class:`smtplib.SMTP` object
+        :return: A :class:`smtplib.SMTP` object
+        """
+        connection = self._acquire(key, connect)
+        healthy = True
+        try:
+            yield connection.server
+            connection.messages += 1
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException, OSError):
+            healthy = False
+            raise
+        finally:
+            self._release(key, connection, healthy)
+
+    def ping(self, key: tuple, connect: callable) -> bool:
+        """
+        Opens a pooled connection if none is open, or checks an idle one via ``NOOP`` so it's kept alive. Used to warm
+        up connections before sending
+
+        :param key: The connection configuration key
+        :param connect: A callable returning a new connected and authenticated :class:`smtplib.SMTP` object
+        :return: Is the connection alive. A dead connection is closed
+        """
+        connection = self._acquire(key, connect)
+        healthy = connection.is_alive()
+        self._release(key, connection, healthy)
+        return healthy
+
+    def close(self):
+        """Closes all idle connections"""
+        with self._condition:
+            idle = [(key, connection) for key, connections in self._idle.items() for connection in connections]
+            self._idle.clear()
+            for key, _ in idle:
+                self._open[key] -= 1
+            self._condition.notify_all()
+        for _, connection in idle:
+            connection.close()
+
+
+smtp_pool = SMTPConnectionPool()
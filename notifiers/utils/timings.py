@@ -0,0 +1,104 @@
+"""Per phase timings of a notification send, measured with :func:`time.perf_counter`"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+from time import perf_counter
+
+_current_timings = contextvars.ContextVar("notifiers_timings", default=None)
+
+# Phases in the order they happen, used to order the output of :meth:`Timings.format`
+PHASES = (
+    "environs",
+    "defaults",
+    "validate",
+    "prepare",
+    "process",
+    "rate_limit",
+    "connect",
+    "tls",
+    "first_byte",
+    "send",
+    "total",
+)
+
+
+class Timings(dict):
+    """
+    A dict of phase names to the seconds spent in them during a single send. Phases that didn't happen are missing,
+    for example ``connect`` and ``tls`` when a pooled connection was reused. Phases that happened more than once, such
+    as ``first_byte`` when a request was retried, hold their sum.
+
+    - ``environs``, ``defaults``, ``validate`` and ``prepare`` are the steps of processing the notification data,
+      ``process`` is all of them together
+    - ``rate_limit`` is the time spent waiting for the client side rate limiter
+    - ``connect`` is opening the TCP connection, ``tls`` is the TLS handshake. For SMTP, ``connect`` includes the
+      handshake of an SSL connection and ``tls`` is ``STARTTLS``
+    - ``first_byte`` is the time between sending an HTTP request and receiving the response headers
+    - ``send`` is the whole provider send, including connecting and reading responses
+    - ``total`` is the whole :meth:`~notifiers.core.Provider.notify` call
+    """
+
+    def __repr__(self):
+        return f"<Timings,{self.format()}>"
+
+    def add(self, phase: str, seconds: float):
+        """
+        Adds ``seconds`` to ``phase``
+
+        :param phase: Phase name
+        :param seconds: Time spent in the phase
+        """
+        self[phase] = self.get(phase, 0.0) + seconds
+
+    def format(self) -> str:
+        """Returns the phases as a single line of milliseconds, in the order they happen"""
+        ordered = [phase for phase in PHASES if phase in self] + [phase for phase in self if phase not in PHASES]
+        return ", ".join(f"{phase}={self[phase] * 1000:.2f}ms" for phase in ordered)
+
+
+def current_timings() -> Timings | None:
+    """Returns the :class:`Timings` of the send in progress, or None if called outside of a timed send"""
+    return _current_timings.get()
+
+
+def record_timing(phase: str, seconds: float):
+    """
+    Adds ``seconds`` to ``phase`` of the send in progress. Does nothing if called outside of a timed send
+
+    :param phase: Phase name
+    :param seconds: Time spent in the phase
+    """
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextlib.contextmanager
+def timed(phase: str):
+    """
+    A context manager that records the time spent in its block as ``phase`` of the send in progress
+
+    :param phase: Phase name
+    """
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(phase, perf_counter() - start)
+
+
+@contextlib.contextmanager
+def timings_context(timings: Timings):
+    """
+    A context manager that sets ``timings`` as the one phases are recorded to
+
+    :param timings: The :class:`Timings` of the send
+    :return: ``timings``
+    """
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
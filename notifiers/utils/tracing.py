@@ -0,0 +1,91 @@
+"""
+Optional tracing spans around the notification pipeline. Spans are created via an OpenTelemetry compatible tracer,
+any object with a ``start_as_current_span(name, attributes=...)`` method, once tracing is enabled via :data:`tracing`.
+"""
+
+from __future__ import annotations
+
+import logging
+
+log = logging.getLogger("notifiers")
+
+PROVIDER_ATTRIBUTE = "notifiers.provider"
+
+
+class _NoopSpan:
+    """Stands in for a span while tracing is disabled. A single instance is reused for all of them"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key: str, value):
+        pass
+
+
+_noop_span = _NoopSpan()
+
+
+class Tracing:
+    """
+    Creates the spans of the notification pipeline. Spans are only created while :attr:`enabled`, otherwise a no-op
+    span is returned
+
+    Spans are set as the current span via :mod:`contextvars`, which notifiers carries to the threads it sends on, so
+    spans of concurrent sends have the span that dispatched them as their parent
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.tracer = None
+
+    def __repr__(self):
+        return f"<Tracing,enabled={self.enabled}>"
+
+    def enable(self, tracer=None):
+        """
+        Starts creating spans
+
+        :param tracer: An OpenTelemetry compatible tracer. Defaults to a tracer of the global OpenTelemetry tracer
+         provider, which requires the ``opentelemetry-api`` package
+        :raises: :class:`ImportError` if no tracer was passed and ``opentelemetry-api`` is not installed
+        """
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError as e:
+                raise ImportError("Tracing without a tracer requires opentelemetry-api, install notifiers[opentelemetry]") from e
+
+            from .._version import __version__
+
+            tracer = trace.get_tracer("notifiers", __version__)
+        self.tracer = tracer
+        self.enabled = True
+        log.debug("tracing enabled with %s", tracer)
+
+    def disable(self):
+        """Stops creating spans"""
+        self.enabled = False
+        self.tracer = None
+
+    def span(self, name: str, provider: str | None, **attributes):
+        """
+        Returns a context manager of a new span that is the current span while it is open
+
+        :param name: Span name
+        :param provider: Name of the provider the span belongs to
+        :param attributes: Additional span attributes
+        :return: A span context manager, yielding the span
+        """
+        # Read once, disable() may run on another thread between checking and using the tracer
+        tracer = self.tracer
+        if not self.enabled or tracer is None:
+            return _noop_span
+        if provider is not None:
+            attributes[PROVIDER_ATTRIBUTE] = provider
+        return tracer.start_as_current_span(name, attributes=attributes)
+
+
+tracing = Tracing()
@@ -10,17 +10,28 @@ from notifiers_cli.utils.callbacks import _notify, _resource, _resources, func_f
 from notifiers_cli.utils.dynamic_click import CORE_COMMANDS, schema_to_command
 
 
-def provider_group_factory():
-    """Dynamically generate provider groups for all providers, and add all basic command to it"""
-    for provider in all_providers():
-        p = get_notifier(provider)
+class ProviderGroup(click.Group):
+    """
+    A provider's command group. The provider is only instantiated, and its schemas turned into commands, once one of
+    its commands is requested
+
+    :param provider_name: The provider name
+    """
+
+    def __init__(self, provider_name: str, **kwargs):
+        kwargs.setdefault("help", f"Options for '{provider_name}'")
+        super().__init__(name=provider_name, **kwargs)
+        self._loaded = False
+
+    def _load(self):
+        if self._loaded:
+            return
+        p = get_notifier(self.name, strict=True)
         provider_name = p.name
-        help = f"Options for '{provider_name}'"
-        group = click.Group(name=provider_name, help=help)
 
         # Notify command
         notify = partial(_notify, p=p)
-        group.add_command(schema_to_command(p, "notify", notify, add_message=True))
+        self.add_command(schema_to_command(p, "notify", notify, add_message=True))
 
         # Resources command
         resources_callback = partial(_resources, p=p)
@@ -29,7 +40,7 @@ def provider_group_factory():
             callback=resources_callback,
             help="Show provider resources list",
         )
-        group.add_command(resources_cmd)
+        self.add_command(resources_cmd)
 
         pretty_opt = click.Option(["--pretty/--not-pretty"], help="Output a pretty version of the JSON")
 
@@ -39,7 +50,7 @@ def provider_group_factory():
             rsrc_callback = partial(_resource, rsc)
             rsrc_command = schema_to_command(rsc, resource, rsrc_callback, add_message=False)
             rsrc_command.params.append(pretty_opt)
-            group.add_command(rsrc_command)
+            self.add_command(rsrc_command)
 
         for name, description in CORE_COMMANDS.items():
             callback = func_factory(p, name)
@@ -50,18 +61,52 @@ def provider_group_factory():
                 help=description.format(provider_name),
                 params=params,
             )
-            group.add_command(command)
+            self.add_command(command)
+        self._loaded = True
+
+    def list_commands(self, ctx: click.Context) -> list:
+        self._load()
+        return super().list_commands(ctx)
+
+    def get_command(self, ctx: click.Context, cmd_name: str):
+        self._load()
+        return super().get_command(ctx, cmd_name)
+
+
+class NotifiersGroup(click.Group):
+    """
+    The root command group. Lists provider names without loading any provider and creates a :class:`ProviderGroup`
+    only for the invoked one
+    """
+
+    def list_commands(self, ctx: click.Context) -> list:
+        return sorted({*super().list_commands(ctx), *all_providers()})
+
+    def get_command(self, ctx: click.Context, cmd_name: str):
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in all_providers():
+            command = ProviderGroup(cmd_name)
+        return command
 
-        notifiers_cli.add_command(group)
 
+def provider_group_factory():
+    """
+    Adds a group for all providers. Not needed to run the CLI, as :class:`NotifiersGroup` creates provider groups on
+    demand, and their commands are only generated once invoked
+    """
+    for provider in all_providers():
+        notifiers_cli.add_command(ProviderGroup(provider))
 
-@click.group()
+
+@click.group(cls=NotifiersGroup)
 @click.version_option(version=__version__, prog_name="notifiers", message=("%(prog)s %(version)s"))
 @click.option("--env-prefix", help="Set a custom prefix for env vars usage")
+@click.option("--timings", is_flag=True, help="Show the time spent in each phase of sending a notification")
 @click.pass_context
-def notifiers_cli(ctx, env_prefix):
+def notifiers_cli(ctx, env_prefix, timings):
     """Notifiers CLI operation"""
     ctx.obj["env_prefix"] = env_prefix
+    ctx.obj["timings"] = timings
 
 
 @notifiers_cli.command()
@@ -70,10 +115,28 @@ def providers():
     click.echo(", ".join(all_providers()))
 
 
+@notifiers_cli.command()
+@click.argument("jobs", type=click.File("r"), default="-")
+@click.option("--concurrency", default=10, show_default=True, type=click.IntRange(min=1), help="Max number of notifications sent at once")
+@click.option("--output", "-o", type=click.File("w"), default="-", help="File to write the JSON results to, defaults to stdout")
+@click.pass_context
+def batch(ctx, jobs, concurrency, output):
+    """
+    Sends the notifications of JOBS, a file of JSON lines or stdin if not set.
+    Each line is a JSON object with the provider name under "provider" and the notification data, for example
+    {"provider": "pushover", "message": "foo"}. A JSON result line is written per job as it completes
+    """
+    from notifiers_cli.utils.batch import Batch
+
+    result = Batch(jobs, output, concurrency, env_prefix=ctx.obj.get("env_prefix")).run()
+    click.echo(result.summary(), err=True)
+    if result.failed:
+        ctx.exit(1)
+
+
 def entry_point():
     """The entry that CLI is executed from"""
     try:
-        provider_group_factory()
         notifiers_cli(obj={})
     except NotifierException as e:
         click.secho(f"ERROR: {e.message}", bold=True, fg="red")
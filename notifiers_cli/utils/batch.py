@@ -0,0 +1,120 @@
+"""
+Helpers of the ``batch`` command, which sends notifications read from newline delimited JSON jobs
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+from notifiers.core import FAILURE_STATUS, SUCCESS_STATUS, notify_stream
+
+PROVIDER_KEY = "provider"
+
+
+def parse_job(line: str, env_prefix: str | None = None) -> tuple:
+    """
+    Parses a single job line, a JSON object with the provider name under ``provider`` and the notification data as
+    the rest of its keys
+
+    :param line: A JSON line
+    :param env_prefix: Env vars prefix to use unless the job sets its own
+    :return: A ``(provider_name, kwargs)`` pair, sending a compact response
+    :raises: :class:`ValueError` if the line is not a JSON object with a provider name
+    """
+    job = json.loads(line)
+    if not isinstance(job, dict) or not isinstance(job.get(PROVIDER_KEY), str):
+        raise ValueError(f"A job must be a JSON object with a '{PROVIDER_KEY}' name")
+    provider_name = job.pop(PROVIDER_KEY)
+    if env_prefix:
+        job.setdefault("env_prefix", env_prefix)
+    job["compact"] = True
+    return provider_name, job
+
+
+def result_record(line_number: int, provider_name: str | None, result) -> dict:
+    """
+    Converts the result of a job to a JSON serializable result record
+
+    :param line_number: The line number of the job
+    :param provider_name: The job's provider name, if it was parsed
+    :param result: A :class:`~notifiers.core.CompactResponse` or the exception the job raised
+    :return: A dict with the job's line, provider, status and errors, and the HTTP status code if there was one
+    """
+    if isinstance(result, Exception):
+        return {"line": line_number, "provider": provider_name, "status": FAILURE_STATUS, "errors": [str(result)]}
+    return {
+        "line": line_number,
+        "provider": result.provider,
+        "status": result.status,
+        "errors": result.errors,
+        "status_code": result.status_code,
+    }
+
+
+class Batch:
+    """
+    Sends the jobs read from a stream and writes a result record per job as soon as it completes. Lines are read as
+    workers free up, so the input is never held in memory as a whole
+
+    :param lines: An iterable of JSON lines, such as an open file
+    :param output: A text stream to write the JSON result lines to
+    :param concurrency: Max number of concurrent sends
+    :param env_prefix: Env vars prefix used by jobs that do not set their own
+    """
+
+    def __init__(self, lines, output, concurrency: int, env_prefix: str | None = None):
+        self.lines = lines
+        self.output = output
+        self.concurrency = concurrency
+        self.env_prefix = env_prefix
+        self.sent = 0
+        self.failed = 0
+        self.elapsed = 0.0
+        # Line number and provider of each job in flight, by job index
+        self._pending = {}
+        self._jobs_read = 0
+
+    def __repr__(self):
+        return f"<Batch,sent={self.sent},failed={self.failed}>"
+
+    @property
+    def total(self) -> int:
+        return self.sent + self.failed
+
+    def _write(self, record: dict):
+        if record["status"] == SUCCESS_STATUS:
+            self.sent += 1
+        else:
+            self.failed += 1
+        self.output.write(json.dumps(record) + "\n")
+
+    def _jobs(self):
+        for line_number, line in enumerate(self.lines, 1):
+            if not line.strip():
+                continue
+            try:
+                provider_name, kwargs = parse_job(line, self.env_prefix)
+            except ValueError as e:
+                # Invalid lines are reported right away and never reach the workers
+                self._write(result_record(line_number, None, e))
+                continue
+            self._pending[self._jobs_read] = line_number, provider_name
+            self._jobs_read += 1
+            yield provider_name, kwargs
+
+    def run(self) -> Batch:
+        """
+        Sends all jobs
+
+        :return: This batch, holding the summary counters
+        """
+        start = time.perf_counter()
+        for index, result in notify_stream(self._jobs(), max_workers=self.concurrency):
+            line_number, provider_name = self._pending.pop(index)
+            self._write(result_record(line_number, provider_name, result))
+        self.elapsed = time.perf_counter() - start
+        return self
+
+    def summary(self) -> str:
+        return f"Sent {self.sent} of {self.total} notifications, {self.failed} failed in {self.elapsed:.2f}s"
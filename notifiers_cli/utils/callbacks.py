@@ -45,6 +45,8 @@ def _notify(p, **data):
         data["env_prefix"] = ctx.obj["env_prefix"]
 
     rsp = p.notify(**data)
+    if ctx.obj.get("timings"):
+        click.echo(f"Timings: {rsp.timings.format()}", err=True)
     rsp.raise_on_errors()
     click.secho(f"Succesfully sent a notification to {p.name}!", fg="green")
 
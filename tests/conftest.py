@@ -16,7 +16,10 @@ from notifiers.core import (
 )
 from notifiers.logging import NotificationHandler
 from notifiers.providers import _all_providers
+from notifiers.utils.circuit import circuit_breakers
 from notifiers.utils.helpers import text_to_bool
+from notifiers.utils.hooks import hooks
+from notifiers.utils.ratelimit import rate_limiter
 from notifiers.utils.schema.helpers import list_to_commas, one_or_more
 
 log = logging.getLogger(__name__)
@@ -152,8 +155,8 @@ def cli_runner(monkeypatch):
 
 @pytest.fixture
 def magic_mock_provider(monkeypatch):
-    MockProvider.notify = MagicMock()
-    MockProxy.name = "magic_mock"
+    monkeypatch.setattr(MockProvider, "notify", MagicMock())
+    monkeypatch.setattr(MockProxy, "name", "magic_mock")
     monkeypatch.setitem(_all_providers, MockProvider.name, MockProvider)
     return MockProvider()
 
@@ -169,6 +172,15 @@ def handler(caplog):
     return return_handler
 
 
+@pytest.fixture(autouse=True)
+def reset_send_state():
+    """Rate limit buckets, circuit breakers and hooks are process wide, start each test without previous state"""
+    yield
+    rate_limiter.reset()
+    circuit_breakers.reset()
+    hooks.clear()
+
+
 def pytest_runtest_setup(item):
     """Skips PRs if secure env vars are set and test is marked as online"""
     pull_request = text_to_bool(os.environ.get("TRAVIS_PULL_REQUEST"))
@@ -1,5 +1,8 @@
 import pytest
 
+from notifiers.exceptions import BadArguments
+from notifiers.transports import MockTransport
+
 provider = "dingtalk"
 
 
@@ -16,3 +19,31 @@ class TestDingTalk:
     def test_sanity(self, provider, test_message):
         data = {"access_token": "token", "message": test_message}
         provider.notify(**data, raise_on_errors=True)
+
+    def test_send(self, provider):
+        mock = MockTransport()
+        mock.add("post", "https://oapi.dingtalk.com/robot/send", json={"errcode": 0, "errmsg": "ok"})
+        data = {"access_token": "token", "msg_data": {"msgtype": "text", "text": {"content": "foo"}}}
+        rsp = type(provider)(transport=mock).notify(**data, raise_on_errors=True)
+        assert rsp.ok
+        ((_, _, kwargs),) = mock.requests
+        assert kwargs["params"] == {"access_token": "token"}
+        assert kwargs["json"] == {"msgtype": "text", "text": {"content": "foo"}}
+
+    def test_api_error(self, provider):
+        mock = MockTransport()
+        mock.add("post", "https://oapi.dingtalk.com/robot/send", json={"errcode": 300001, "errmsg": "token is not exist"})
+        data = {"access_token": "token", "msg_data": {"msgtype": "text", "text": {"content": "foo"}}}
+        rsp = type(provider)(transport=mock).notify(**data)
+        assert rsp.errors == ["token is not exist"]
+
+    def test_missing_message(self, provider):
+        with pytest.raises(BadArguments):
+            provider.notify(access_token="token", msg_data={"msgtype": "text"})
+
+    def test_non_json_response(self, provider):
+        mock = MockTransport()
+        mock.add("post", "https://oapi.dingtalk.com/robot/send", text="<html>proxy</html>")
+        data = {"access_token": "token", "msg_data": {"msgtype": "text", "text": {"content": "foo"}}}
+        rsp = type(provider)(transport=mock).notify(**data)
+        assert rsp.errors == ["<html>proxy</html>"]
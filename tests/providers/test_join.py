@@ -1,6 +1,7 @@
 import pytest
 
 from notifiers.exceptions import BadArguments, NotificationError, ResourceError
+from notifiers.transports import MockTransport
 
 provider = "join"
 
@@ -30,6 +31,14 @@ class TestJoin:
         rsp = provider.notify(**data)
         rsp.raise_on_errors()
 
+    def test_error_in_successful_response(self, provider):
+        mock = MockTransport()
+        mock.add("get", "https://joinjoaomgcd.appspot.com/_ah/api/messaging/v1/sendPush", json={"success": False, "errorMessage": "User Not Authenticated"})
+        rsp = type(provider)(transport=mock).notify(message="foo", apikey="bar")
+        assert rsp.errors == ["User Not Authenticated"]
+        ((_, _, kwargs),) = mock.requests
+        assert kwargs["params"] == {"apikey": "bar", "deviceId": "group.all", "text": "foo"}
+
     def test_negative(self, provider):
         data = {"message": "foo", "apikey": "bar"}
         rsp = provider.notify(**data)
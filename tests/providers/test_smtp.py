@@ -1,12 +1,68 @@
+import smtplib
+import threading
 from email.message import EmailMessage
 
 import pytest
 
-from notifiers.exceptions import BadArguments, NotificationError
+from notifiers.exceptions import BadArguments, CircuitOpenError, NotificationError
+from notifiers.providers import email as email_provider
+from notifiers.transports import default_transport
+from notifiers.utils.circuit import circuit_breakers
+from notifiers.utils.smtp import SMTPConnectionPool
 
 provider = "email"
 
 
+class FakeSMTP:
+    """A stand in for :class:`smtplib.SMTP` that records sent messages"""
+
+    instances = []
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.sent = []
+        self.logins = []
+        self.connected = True
+        self.fail_next_send = False
+        FakeSMTP.instances.append(self)
+
+    def ehlo(self):
+        pass
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        self.logins.append(username)
+
+    def noop(self):
+        if not self.connected:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        return 250, b"OK"
+
+    def send_message(self, message):
+        if self.fail_next_send or not self.connected:
+            self.fail_next_send = False
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(message)
+
+    def quit(self):
+        self.connected = False
+
+    def close(self):
+        self.connected = False
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    FakeSMTP.instances = []
+    pool = SMTPConnectionPool(max_connections=2, max_messages=3, check_after=0)
+    monkeypatch.setattr(email_provider.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(default_transport, "smtp_pool", pool)
+    return pool
+
+
 class TestSMTP:
     """SMTP tests"""
 
@@ -93,6 +149,104 @@ class TestSMTP:
         assert attach2.get_content_type() == "image/jpeg"
         assert attach3.get_content_type() == "application/pdf"
 
+    def test_connection_reused(self, provider, fake_smtp):
+        data = {"to": "foo@foo.com", "message": "bar", "host": "fakehost", "username": "ding", "password": "dong"}
+        for _ in range(2):
+            provider.notify(raise_on_errors=True, **data)
+        assert len(FakeSMTP.instances) == 1
+        assert len(FakeSMTP.instances[0].sent) == 2
+        assert FakeSMTP.instances[0].logins == ["ding"]
+
+    def test_connection_per_configuration(self, provider, fake_smtp):
+        data = {"to": "foo@foo.com", "message": "bar", "host": "fakehost"}
+        provider.notify(raise_on_errors=True, **data)
+        provider.notify(raise_on_errors=True, port=2525, **data)
+        provider.notify(raise_on_errors=True, username="ding", password="dong", **data)
+        assert len(FakeSMTP.instances) == 3
+
+    def test_max_messages_per_connection(self, provider, fake_smtp):
+        data = {"to": "foo@foo.com", "message": "bar", "host": "fakehost"}
+        for _ in range(4):
+            provider.notify(raise_on_errors=True, **data)
+        assert [len(server.sent) for server in FakeSMTP.instances] == [3, 1]
+        assert not FakeSMTP.instances[0].connected
+
+    def test_reconnect_dropped_idle_connection(self, provider, fake_smtp):
+        data = {"to": "foo@foo.com", "message": "bar", "host": "fakehost"}
+        provider.notify(raise_on_errors=True, **data)
+        FakeSMTP.instances[0].connected = False
+        provider.notify(raise_on_errors=True, **data)
+        assert len(FakeSMTP.instances) == 2
+        assert len(FakeSMTP.instances[1].sent) == 1
+
+    def test_reconnect_on_disconnect_during_send(self, provider, fake_smtp):
+        data = {"to": "foo@foo.com", "message": "bar", "host": "fakehost"}
+        provider.notify(raise_on_errors=True, **data)
+        FakeSMTP.instances[0].fail_next_send = True
+        fake_smtp.check_after = 60
+        provider.notify(raise_on_errors=True, **data)
+        assert len(FakeSMTP.instances) == 2
+        assert fake_smtp.open_connections(provider._get_configuration(provider._process_data(**data))) == 1
+
+    def test_warmup(self, provider, fake_smtp):
+        data = {"host": "fakehost", "tls": True, "username": "ding", "password": "dong"}
+        provider.warmup(**data)
+        assert len(FakeSMTP.instances) == 1
+        assert FakeSMTP.instances[0].logins == ["ding"]
+        provider.notify(raise_on_errors=True, to="foo@foo.com", message="bar", **data)
+        assert len(FakeSMTP.instances) == 1
+        assert len(FakeSMTP.instances[0].sent) == 1
+
+    def test_pool_key_includes_password(self, provider, fake_smtp):
+        data = {"to": "foo@foo.com", "message": "bar", "host": "fakehost", "tls": True, "username": "ding"}
+        provider.notify(raise_on_errors=True, password="dong", **data)
+        provider.notify(raise_on_errors=True, password="wrong", **data)
+        assert len(FakeSMTP.instances) == 2
+        assert [instance.logins for instance in FakeSMTP.instances] == [["ding"], ["ding"]]
+        assert "dong" not in repr(provider._get_configuration(provider._process_data(password="dong", **data)))
+
+    def test_warmup_reconnects_dead_connection(self, provider, fake_smtp):
+        provider.warmup(host="fakehost")
+        FakeSMTP.instances[0].connected = False
+        provider.warmup(host="fakehost")
+        provider.warmup(host="fakehost")
+        assert len(FakeSMTP.instances) == 2
+        assert fake_smtp.open_connections(provider._get_configuration({**provider.defaults, "host": "fakehost"})) == 1
+
+    def test_concurrent_sends(self, provider, fake_smtp):
+        data = {"to": "foo@foo.com", "message": "bar", "host": "fakehost"}
+        errors = []
+
+        def send():
+            try:
+                for _ in range(5):
+                    provider.notify(raise_on_errors=True, **data)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=send) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        assert sum(len(server.sent) for server in FakeSMTP.instances) == 20
+        assert all(len(server.sent) <= 3 for server in FakeSMTP.instances)
+
+    def test_circuit_opens_when_server_is_down(self, provider, fake_smtp, monkeypatch):
+        def refuse(*_args):
+            raise ConnectionRefusedError("Connection refused")
+
+        monkeypatch.setattr(email_provider.smtplib, "SMTP", refuse)
+        monkeypatch.setattr(circuit_breakers, "enabled", True)
+        monkeypatch.setattr(circuit_breakers, "settings", {"min_requests": 2})
+        data = {"to": "foo@foo.com", "message": "bar", "host": "fakehost"}
+        for _ in range(2):
+            assert not provider.notify(**data).ok
+        with pytest.raises(CircuitOpenError, match="email:fakehost:25"):
+            provider.notify(**data)
+        assert circuit_breakers.states("email")["email:fakehost:25"]["state"] == "open"
+
     @pytest.mark.online
     @pytest.mark.skip(reason="Disabled account")
     def test_smtp_sanity(self, provider, test_message):
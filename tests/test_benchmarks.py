@@ -0,0 +1,27 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+
+
+def run_benchmarks(*args):
+    return subprocess.run([sys.executable, "-m", "benchmarks", *args], cwd=ROOT, capture_output=True, text=True, check=False)
+
+
+class TestBenchmarks:
+    def test_run(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        result = run_benchmarks("-k", "send.pushover", "--quick", "--save", str(baseline))
+        assert result.returncode == 0, result.stderr
+        assert "send.pushover" in result.stdout
+        assert "startup" not in result.stdout
+        assert list(json.loads(baseline.read_text())["benchmarks"]) == ["send.pushover"]
+
+    def test_regression(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"benchmarks": {"get_notifier.pushover": 1e-12}}))
+        result = run_benchmarks("-k", "get_notifier.pushover", "--quick", "--compare", str(baseline))
+        assert result.returncode == 1
+        assert "REGRESSION get_notifier.pushover" in result.stderr
@@ -1,3 +1,4 @@
+import json
 import re
 
 import pytest
@@ -25,6 +26,13 @@ class TestCLI:
         assert not result.exit_code, f"Exit code is {result.exit_code}. Output: {result.output}"
         assert "Succesfully sent a notification" in result.output
 
+    def test_timings(self, cli_runner):
+        cmd = f"--timings {mock_name} notify --required bar foo".split()
+        result = cli_runner(cmd)
+        assert not result.exit_code, result.output
+        assert re.search(r"Timings: .*process=\d+\.\d+ms.*total=\d+\.\d+ms", result.stderr)
+        assert "Timings" not in result.stdout
+
     def test_providers(self, cli_runner):
         """Test providers command"""
         result = cli_runner(["providers"])
@@ -111,3 +119,48 @@ class TestCLI:
         result = cli_runner(cmd.split())
         assert not result.exit_code
         assert "Succesfully sent a notification" in result.output
+
+    def test_lazy_providers(self, monkeypatch):
+        """Providers are only loaded once one of their commands is invoked"""
+        from click.testing import CliRunner
+
+        from notifiers_cli.core import ProviderGroup, notifiers_cli
+
+        commands = {name: command for name, command in notifiers_cli.commands.items() if not isinstance(command, ProviderGroup)}
+        monkeypatch.setattr(notifiers_cli, "commands", commands)
+        loaded = []
+        get_notifier = notifiers.core.get_notifier
+        monkeypatch.setattr("notifiers_cli.core.get_notifier", lambda name, **kwargs: loaded.append(name) or get_notifier(name, **kwargs))
+        runner = CliRunner()
+        result = runner.invoke(notifiers_cli, ["--help"], obj={})
+        assert not result.exit_code, result.output
+        assert mock_name in result.output
+        assert "pushover" in result.output
+        assert not runner.invoke(notifiers_cli, ["providers"], obj={}).exit_code
+        assert loaded == []
+
+        result = runner.invoke(notifiers_cli, f"{mock_name} notify --required bar foo".split(), obj={})
+        assert "Succesfully sent a notification" in result.output
+        assert loaded == [mock_name]
+
+    def test_batch(self, cli_runner, tmp_path):
+        jobs = tmp_path / "jobs.jsonl"
+        lines = [json.dumps({"provider": mock_name, "required": "foo", "message": str(i)}) for i in range(5)]
+        jobs.write_text("\n".join([*lines, "", "foo", json.dumps({"provider": mock_name, "message": "bar"})]))
+        result = cli_runner(["batch", str(jobs), "--concurrency", "2"])
+        assert result.exit_code == 1
+        records = sorted((json.loads(line) for line in result.stdout.splitlines()), key=lambda record: record["line"])
+        assert [record["line"] for record in records] == [1, 2, 3, 4, 5, 7, 8]
+        assert all(record["status"] == "Success" and record["provider"] == mock_name for record in records[:5])
+        assert records[5]["provider"] is None
+        assert records[6]["status"] == "Failure"
+        assert "required" in records[6]["errors"][0]
+        assert re.match(r"Sent 5 of 7 notifications, 2 failed in \d+\.\d+s", result.stderr)
+
+    def test_batch_stdin(self, cli_runner, tmp_path, monkeypatch):
+        monkeypatch.setenv("FOO_MOCK_PROVIDER_REQUIRED", "foo")
+        output = tmp_path / "results.jsonl"
+        jobs = json.dumps({"provider": mock_name, "message": "foo"})
+        result = cli_runner(["--env-prefix", "FOO_", "batch", "-o", str(output)], input=jobs)
+        assert not result.exit_code, result.output
+        assert json.loads(output.read_text()) == {"line": 1, "provider": mock_name, "status": "Success", "errors": None, "status_code": None}
@@ -1,17 +1,28 @@
+import asyncio
+import os
+import re
+import subprocess
 import sys
+import threading
 import typing
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 
 import pytest
 
 import notifiers
-from notifiers import notify
-from notifiers.core import SUCCESS_STATUS, Provider, Response
+from notifiers import anotify, core, notify
+from notifiers.core import SUCCESS_STATUS, CompactResponse, Provider, ProviderRegistry, Response
 from notifiers.exceptions import (
     BadArguments,
     NoSuchNotifierError,
     NotificationError,
     SchemaError,
 )
+from notifiers.providers import LazyProviders
+from notifiers.transports import MockTransport
+from notifiers.utils import aio
+from notifiers.utils.ratelimit import RateLimit
 
 
 class TestCore:
@@ -72,6 +83,34 @@ class TestCore:
         with pytest.raises(SchemaError):
             bad_schema()
 
+    def test_validator_compiled_once_per_class(self, mock_provider, monkeypatch):
+        """Test that the schema validator is built and checked once and shared between instances"""
+        checks = []
+        original_validate_schema = Provider._validate_schema
+
+        def mock_validate_schema(self):
+            checks.append(self)
+            return original_validate_schema(self)
+
+        class CachedProvider(type(mock_provider)):
+            _required = {"required": ["message"]}
+
+        monkeypatch.setattr(Provider, "_validate_schema", mock_validate_schema)
+        p1 = CachedProvider()
+        p2 = CachedProvider()
+        assert len(checks) == 1
+        assert p1.validator is p2.validator
+        assert p1.schema is p2.schema
+        assert p1.schema["required"] == ["message"]
+        assert mock_provider.schema["required"] == ["required"]
+        assert mock_provider.validator is not p1.validator
+
+    def test_bad_schema_not_cached(self, bad_schema):
+        """Test that an invalid schema keeps raising on every instantiation"""
+        for _ in range(2):
+            with pytest.raises(SchemaError):
+                bad_schema()
+
     def test_prepare_data(self, mock_provider):
         """Test ``prepare_data()`` method"""
         rsp = mock_provider.notify(**self.valid_data)
@@ -189,3 +228,278 @@ class TestCore:
     def test_direct_notify_negative(self):
         with pytest.raises(NoSuchNotifierError, match="No such notifier with name"):
             notify("foo", message="whateverz")
+
+    def test_anotify(self, mock_provider):
+        rsp = asyncio.run(mock_provider.anotify(**self.valid_data))
+        assert isinstance(rsp, Response)
+        assert rsp.status == SUCCESS_STATUS
+        assert rsp.data == {
+            "not_required": "foo,bar",
+            "required": "foo",
+            "option_with_default": "foo",
+        }
+
+    def test_anotify_raise_on_errors(self, mock_provider, monkeypatch):
+        def failed_send(data):
+            return mock_provider.create_response(data, errors=["an error"])
+
+        monkeypatch.setattr(mock_provider, "_send_notification", failed_send)
+        with pytest.raises(NotificationError, match="an error"):
+            asyncio.run(mock_provider.anotify(raise_on_errors=True, **self.valid_data))
+
+    def test_anotify_executor(self, mock_provider):
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="app")
+        aio.set_executor(executor)
+        try:
+            assert asyncio.run(aio.run_sync(lambda: threading.current_thread().name)).startswith("app")
+            assert asyncio.run(mock_provider.anotify(**self.valid_data)).ok
+        finally:
+            aio.set_executor(None)
+        # The caller's executor is left running, and the default one is used again
+        assert executor.submit(lambda: True).result()
+        assert aio.get_executor() is not executor
+        assert aio.get_executor()._max_workers == aio.DEFAULT_MAX_WORKERS
+        executor.shutdown()
+
+    def test_anotify_concurrent(self, mock_provider):
+        async def send_many():
+            return await asyncio.gather(*(anotify(mock_provider.name, required="foo", message=str(i)) for i in range(20)))
+
+        responses = asyncio.run(send_many())
+        assert [rsp.data["message"] for rsp in responses] == [str(i) for i in range(20)]
+
+    def test_anotify_negative(self):
+        with pytest.raises(NoSuchNotifierError):
+            asyncio.run(anotify("foo", message="whateverz"))
+
+    def test_notify_many(self, mock_provider):
+        jobs = [(mock_provider.name, {"required": "foo", "message": str(i)}) for i in range(10)]
+        jobs.append(("foo", {"message": "bar"}))
+        jobs.append((mock_provider.name, {"message": "missing required"}))
+        results = notifiers.notify_many(jobs, max_workers=4)
+        assert [rsp.data["message"] for rsp in results[:10]] == [str(i) for i in range(10)]
+        assert isinstance(results[10], NoSuchNotifierError)
+        assert isinstance(results[11], BadArguments)
+
+    def test_notify_many_streamed(self, mock_provider):
+        jobs = [(mock_provider.name, {"required": "foo", "message": str(i)}) for i in range(10)]
+        results = notifiers.notify_many(jobs, ordered=False)
+        assert not isinstance(results, list)
+        results = dict(results)
+        assert sorted(results) == list(range(10))
+        assert all(results[i].data["message"] == str(i) for i in results)
+
+    def test_notify_many_timeout(self, mock_provider, monkeypatch):
+        release = threading.Event()
+
+        def slow_send(data):
+            release.wait(5)
+            return mock_provider.create_response(data)
+
+        monkeypatch.setattr(type(mock_provider), "_send_notification", lambda _, data: slow_send(data))
+        jobs = [(mock_provider.name, {"required": "foo"})] * 2
+        try:
+            results = notifiers.notify_many(jobs, timeout=0.1)
+        finally:
+            release.set()
+        assert all(isinstance(result, FuturesTimeoutError) for result in results)
+
+    def test_notify_many_no_jobs(self):
+        assert notifiers.notify_many([]) == []
+
+    def test_notify_stream(self, mock_provider):
+        read = []
+
+        def jobs():
+            for i in range(20):
+                read.append(i)
+                yield mock_provider.name, {"required": "foo", "message": str(i)}
+            yield "foo", {"message": "bar"}
+
+        results = notifiers.notify_stream(jobs(), max_workers=2)
+        assert read == []
+        index, rsp = next(results)
+        # Only a bounded number of jobs is read ahead of the results
+        assert len(read) <= 4
+        assert rsp.data["message"] == str(index)
+        results = dict(results)
+        assert sorted(results) == [i for i in range(21) if i != index]
+        assert isinstance(results[20], NoSuchNotifierError)
+
+    def test_resource_acall(self, mock_provider):
+        resource = mock_provider.mock_rsrc
+        assert asyncio.run(resource.acall(key="fpp")) == {"status": SUCCESS_STATUS}
+        with pytest.raises(BadArguments):
+            asyncio.run(resource.acall())
+
+    def test_compact_response(self):
+        mock = MockTransport()
+        mock.add("post", "https://api.pushover.net/1/messages.json", json={"status": 1}, headers={"X-Ratelimit-Remaining": "10", "Server": "foo"})
+        pushover = type(notifiers.get_notifier("pushover"))(transport=mock)
+        rsp = pushover.notify(token="foo", user="bar", message="baz", compact=True)
+        assert isinstance(rsp, CompactResponse)
+        assert rsp.ok
+        assert rsp.status_code == 200
+        assert rsp.headers == {"X-RateLimit-Remaining": "10"}
+        assert rsp.data == {"token": "********", "user": "********", "message": "baz"}
+        assert rsp.response is None
+        assert not hasattr(rsp, "__dict__")
+
+    def test_compact_response_provider_sensitive_keys(self):
+        victorops = notifiers.get_notifier("victorops")
+        rsp = victorops.create_response({"rest_url": "https://alert.victorops.com/integrations/foo/bar", "message": "baz"})
+        assert rsp.compact().data == {"rest_url": "********", "message": "baz"}
+
+    def test_compact_response_errors(self, mock_provider):
+        full = mock_provider.notify(**self.valid_data)
+        full.errors = ["an error"]
+        rsp = full.compact(keep_data=False, keep_response=True)
+        assert rsp.data is None
+        assert rsp.response is full.response
+        with pytest.raises(NotificationError) as e:
+            rsp.raise_on_errors()
+        assert e.value.errors == ["an error"]
+
+    def test_compact_responses_globally(self, mock_provider, monkeypatch):
+        monkeypatch.setattr(Provider, "compact_responses", True)
+        assert isinstance(mock_provider.notify(**self.valid_data), CompactResponse)
+        assert isinstance(mock_provider.notify(compact=False, **self.valid_data), Response)
+        assert isinstance(asyncio.run(mock_provider.anotify(**self.valid_data)), CompactResponse)
+
+    def test_timings(self, mock_provider):
+        rsp = mock_provider.notify(**self.valid_data)
+        assert set(rsp.timings) == {"environs", "defaults", "validate", "prepare", "process", "send", "total"}
+        assert rsp.timings["total"] >= rsp.timings["process"] + rsp.timings["send"]
+        assert rsp.timings["process"] >= rsp.timings["validate"]
+        assert rsp.compact().timings is rsp.timings
+        assert "total" in asyncio.run(mock_provider.anotify(**self.valid_data)).timings
+
+    def test_timings_rate_limit(self, mock_provider, monkeypatch):
+        monkeypatch.setattr(type(mock_provider), "rate_limits", (RateLimit(10, 1),))
+        rsp = mock_provider.notify(**self.valid_data)
+        assert "rate_limit" in rsp.timings
+        assert re.fullmatch(r"environs=.*, rate_limit=\d+\.\d{2}ms, send=.*, total=\d+\.\d{2}ms", rsp.timings.format())
+
+
+class MockEntryPoint:
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+
+class TestProviderRegistry:
+    """Test the cached provider registry"""
+
+    @pytest.fixture
+    def scans(self, monkeypatch):
+        scans = []
+
+        def mock_entry_points(group):
+            scans.append(group)
+            return [MockEntryPoint("plugin", "tests.conftest:MockProvider")]
+
+        monkeypatch.setattr(core, "entry_points", mock_entry_points)
+        return scans
+
+    def test_scans_entry_points_once(self, scans, mock_provider):
+        registry = ProviderRegistry()
+        assert "plugin" in registry.names()
+        assert "pushover" in registry.names()
+        assert "plugin" in registry
+        assert "foo" not in registry
+        registry.get("pushover")
+        registry.get("plugin")
+        assert scans == ["notifiers"]
+
+    def test_lazy_plugin_loading(self, scans, monkeypatch):
+        loaded = []
+        original_load = core.load_provider_from_points
+
+        def mock_load(value):
+            loaded.append(value)
+            return original_load(value)
+
+        monkeypatch.setattr(core, "load_provider_from_points", mock_load)
+        registry = ProviderRegistry()
+        registry.names()
+        assert not loaded
+        registry.get_class("plugin")
+        registry.get_class("plugin")
+        assert loaded == ["tests.conftest:MockProvider"]
+
+    def test_singletons(self, scans, mock_provider):
+        registry = ProviderRegistry()
+        p = registry.get("pushover")
+        assert registry.get("pushover") is p
+        assert registry.get("plugin") is registry.get("plugin")
+        assert registry.get("foo") is None
+
+    def test_refresh(self, scans):
+        registry = ProviderRegistry()
+        p = registry.get("plugin")
+        registry.refresh()
+        assert registry.get("plugin") is not p
+        assert scans == ["notifiers", "notifiers"]
+
+    def test_get_notifier_reuses_instances(self, mock_provider):
+        assert notifiers.get_notifier("pushover") is notifiers.get_notifier("pushover")
+
+
+IMPORT_TIME_BUDGET = float(os.environ.get("NOTIFIERS_IMPORT_TIME_BUDGET", "0.15"))
+
+IMPORT_TIME_SCRIPT = """
+import sys
+import time
+
+start = time.perf_counter()
+import notifiers
+elapsed = time.perf_counter() - start
+heavy = sorted({m.split('.')[0] for m in sys.modules} & {'jsonschema', 'requests', 'importlib_metadata', 'asyncio'})
+providers = sorted(m for m in sys.modules if m.startswith('notifiers.providers.'))
+print(elapsed, ','.join(heavy + providers))
+"""
+
+
+class TestLazyImports:
+    """Test that importing notifiers stays cheap"""
+
+    @staticmethod
+    def cold_import() -> tuple:
+        output = subprocess.run([sys.executable, "-c", IMPORT_TIME_SCRIPT], check=True, capture_output=True, text=True).stdout.split()
+        return float(output[0]), output[1:]
+
+    def test_no_eager_imports(self):
+        _, loaded = self.cold_import()
+        assert loaded == []
+
+    def test_import_time_budget(self):
+        elapsed = min(self.cold_import()[0] for _ in range(3))
+        assert elapsed < IMPORT_TIME_BUDGET, f"Cold import took {elapsed:.3f}s, budget is {IMPORT_TIME_BUDGET}s"
+
+    def test_lazy_providers(self):
+        providers = LazyProviders({"mock": "tests.conftest:MockProvider"})
+        assert "mock" in providers
+        assert list(providers) == ["mock"]
+        assert isinstance(providers._providers["mock"], str)
+        assert providers["mock"].name
+        assert not isinstance(providers._providers["mock"], str)
+        providers["other"] = Provider
+        assert providers.copy() == {"mock": providers["mock"], "other": Provider}
+        del providers["other"]
+        assert len(providers) == 1
+
+    def test_lazy_resources(self):
+        from notifiers.providers.pushover import Pushover, PushoverSounds
+
+        p = Pushover()
+        assert "sounds" not in p.__dict__
+        assert isinstance(p.sounds, PushoverSounds)
+        assert p.sounds is p.sounds
+
+    def test_lazy_default_from(self):
+        from notifiers.providers import email
+
+        assert email.default_from() == email.DEFAULT_FROM
+        assert email.DEFAULT_FROM.startswith("notifiers@")
+        with pytest.raises(AttributeError):
+            email.FOO  # noqa: B018
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from notifiers.core import Response, get_notifier
+from notifiers.exceptions import BadArguments, RateLimitExceeded
+from notifiers.transports import MockTransport
+from notifiers.utils.hooks import ON_ERROR, POST_SEND, PRE_SEND, HookRegistry, hooks
+from notifiers.utils.ratelimit import REJECT, RateLimit, RateLimiter
+
+
+class TestHookRegistry:
+    def test_register(self):
+        registry = HookRegistry()
+        assert not registry.active
+
+        @registry.register(PRE_SEND)
+        def hook(resource, data):
+            pass
+
+        assert registry.active
+        assert registry.get(PRE_SEND) == (hook,)
+        registry.unregister(PRE_SEND, hook)
+        assert not registry.active
+        assert registry.get(PRE_SEND) == ()
+
+    def test_unknown_event(self):
+        with pytest.raises(ValueError, match="Unknown hook event 'foo'"):
+            HookRegistry().register("foo", print)
+
+
+@pytest.fixture
+def provider(mock_provider):
+    """A new provider instance, the session wide one would keep the hooks registered on it"""
+    return type(mock_provider)()
+
+
+class TestHooks:
+    def test_order(self, provider):
+        calls = []
+        hooks.register(PRE_SEND, lambda resource, data: calls.append(("global", resource.name, data["required"])))
+        provider.hooks.register(PRE_SEND, lambda resource, data: calls.append(("instance", resource.name, data["required"])))
+        hooks.register(POST_SEND, lambda _resource, _data, rsp: calls.append(("post", rsp.status)))
+        assert provider.notify(required="foo").ok
+        assert calls == [("global", "mock_provider", "foo"), ("instance", "mock_provider", "foo"), ("post", "Success")]
+
+    def test_instance_hooks_are_not_shared(self, provider):
+        provider.hooks.register(PRE_SEND, lambda _resource, _data: None)
+        assert type(provider)().hooks.get(PRE_SEND) == ()
+
+    def test_pre_send_short_circuits(self, provider, monkeypatch):
+        cached = Response(status="Success", provider="mock_provider", data={})
+        monkeypatch.setattr(type(provider), "_send_notification", None)
+        second = []
+        provider.hooks.register(PRE_SEND, lambda _resource, _data: cached)
+        provider.hooks.register(PRE_SEND, lambda _resource, data: second.append(data))
+        rsp = provider.notify(required="foo")
+        assert (rsp.status, rsp.data) == ("Success", {})
+        assert second == []
+        assert "total" in rsp.timings
+        # The cached response itself is left as is
+        assert rsp is not cached
+        assert not cached.timings
+
+    @pytest.mark.parametrize("event", [PRE_SEND, POST_SEND, ON_ERROR])
+    def test_provider_hooks_must_return_response(self, provider, monkeypatch, event):
+        def fail(_self, _data):
+            raise ConnectionError("foo")
+
+        if event == ON_ERROR:
+            monkeypatch.setattr(type(provider), "_send_notification", fail)
+        provider.hooks.register(event, lambda *_args: {"status": "Success"})
+        with pytest.raises(TypeError, match=f"{event} hooks of provider 'mock_provider' must return a Response or None, got dict"):
+            provider.notify(required="foo")
+        with pytest.raises(TypeError):
+            asyncio.run(provider.anotify(required="foo"))
+
+    def test_pre_send_skips_rate_limiting(self, provider, monkeypatch):
+        monkeypatch.setattr(type(provider), "rate_limits", (RateLimit(1, 60),))
+        monkeypatch.setattr(type(provider), "rate_limiter", RateLimiter(mode=REJECT))
+        provider.notify(required="foo")
+        with pytest.raises(RateLimitExceeded):
+            provider.notify(required="foo")
+        provider.hooks.register(PRE_SEND, lambda resource, data: Response(status="Success", provider=resource.name, data=data))
+        assert provider.notify(required="foo").ok
+
+    def test_pre_send_changes_data(self):
+        mock = MockTransport()
+        pushover = type(get_notifier("pushover"))(transport=mock)
+        pushover.hooks.register(PRE_SEND, lambda _resource, data: data.update(message=data["message"].upper()))
+        pushover.notify(token="foo", user="bar", message="baz")
+        ((_, _, kwargs),) = mock.requests
+        assert kwargs["data"]["message"] == "BAZ"
+
+    def test_post_send_replaces_result(self, mock_provider):
+        replaced = Response(status="Success", provider="mock_provider", data={})
+        hooks.register(POST_SEND, lambda _resource, _data, _rsp: replaced)
+        rsp = mock_provider.notify(required="foo")
+        assert rsp.data == {}
+        assert "total" in rsp.timings
+
+    def test_on_error(self, provider, monkeypatch):
+        def fail(_self, _data):
+            raise ConnectionError("foo")
+
+        errors = []
+        monkeypatch.setattr(type(provider), "_send_notification", fail)
+        provider.hooks.register(ON_ERROR, lambda _resource, _data, error: errors.append(error))
+        with pytest.raises(ConnectionError):
+            provider.notify(required="foo")
+        assert [str(error) for error in errors] == ["foo"]
+
+        recovered = Response(status="Failure", provider="mock_provider", data={}, errors=["recovered"])
+        provider.hooks.register(ON_ERROR, lambda _resource, _data, _error: recovered)
+        assert provider.notify(required="foo").errors == ["recovered"]
+
+    def test_no_hooks_for_invalid_data(self, mock_provider):
+        calls = []
+        hooks.register(PRE_SEND, lambda _resource, data: calls.append(data))
+        with pytest.raises(BadArguments):
+            mock_provider.notify()
+        assert calls == []
+
+    def test_anotify(self, mock_provider):
+        calls = []
+        hooks.register(PRE_SEND, lambda _resource, _data: calls.append(PRE_SEND))
+        hooks.register(POST_SEND, lambda _resource, _data, _rsp: calls.append(POST_SEND))
+        assert asyncio.run(mock_provider.anotify(required="foo")).ok
+        assert calls == [PRE_SEND, POST_SEND]
+
+    def test_resources(self, mock_provider):
+        resource = mock_provider.mock_rsrc
+        resource.hooks.register(PRE_SEND, lambda _resource, data: {"cached": data["key"]})
+        assert resource(key="foo") == {"cached": "foo"}
+        assert asyncio.run(resource.acall(key="bar")) == {"cached": "bar"}
+
+    def test_resource_post_send(self, mock_provider):
+        hooks.register(POST_SEND, lambda resource, _data, result: {**result, "resource": resource.resource_name})
+        assert mock_provider.mock_rsrc(key="foo") == {"status": "Success", "resource": "mock_resource"}
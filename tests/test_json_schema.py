@@ -1,8 +1,11 @@
 import hypothesis.strategies as st
 import pytest
-from hypothesis import given
-from jsonschema import ValidationError, validate
+from hypothesis import given, settings
+from jsonschema import Draft4Validator, ValidationError, validate
 
+from notifiers.core import get_notifier
+from notifiers.providers import _all_providers
+from notifiers.utils.schema.compiler import compile_schema
 from notifiers.utils.schema.formats import format_checker
 from notifiers.utils.schema.helpers import list_to_commas, one_or_more
 
@@ -87,3 +90,76 @@ class TestSchemaUtils:
     @given(st.lists(st.text()))
     def test_list_to_commas(self, input_data):
         assert list_to_commas(input_data) == ",".join(input_data)
+
+
+json_values = st.recursive(
+    st.none() | st.booleans() | st.integers(-5, 100_000) | st.floats(allow_nan=False) | st.text(max_size=5) | st.sampled_from(["foo", "markdown", "text", "a@b.com", "12"]),
+    lambda children: st.lists(children, max_size=3) | st.dictionaries(st.text(max_size=3), children, max_size=3),
+    max_leaves=5,
+)
+
+
+class TestSchemaCompiler:
+    @pytest.mark.parametrize(
+        ("schema", "valid", "invalid"),
+        [
+            ({"type": "integer"}, [1, -3], [True, 1.0, "1", None]),
+            ({"type": "number", "minimum": 0, "exclusiveMinimum": True}, [0.5, 1], [0, -1, "a"]),
+            ({"minimum": 0}, ["a", 0, None], [-1]),
+            ({"type": ["integer", "string"], "maximum": 2}, [2, "3"], [3, 1.5]),
+            ({"type": "string", "minLength": 1, "maxLength": 2, "pattern": "^a"}, ["a", "ab"], ["", "abc", "ba", 1]),
+            ({"enum": ["markdown", "html"]}, ["html"], ["text", 1, None]),
+            ({"type": "array", "items": {"type": "string"}, "minItems": 1, "maxItems": 2, "uniqueItems": True}, [["a"], ["a", "b"]], [[], ["a", "a"], ["a", 1], ["a", "b", "c"]]),
+            ({"type": "object", "required": ["a"], "properties": {"a": {"type": "string"}}, "additionalProperties": False}, [{"a": "b"}], [{}, {"a": 1}, {"a": "b", "c": 1}]),
+            ({"additionalProperties": {"type": "integer"}, "properties": {"a": {}}}, [{"a": "b", "c": 1}], [{"c": "d"}]),
+            ({"dependencies": {"a": ["b"], "c": {"required": ["d"]}}}, [{"a": 1, "b": 2}, {"c": 1, "d": 2}, {}], [{"a": 1}, {"c": 1}]),
+            ({"oneOf": [{"type": "string"}, {"type": "string", "minLength": 2}]}, ["a"], ["ab", 1]),
+            ({"anyOf": [{"type": "string"}, {"type": "null"}]}, ["a", None], [1]),
+            ({"allOf": [{"type": "string"}, {"minLength": 2}]}, ["ab"], ["a", 1]),
+            ({"not": {"type": "string"}}, [1, None], ["a"]),
+            ({"minProperties": 1, "maxProperties": 1}, [{"a": 1}], [{}, {"a": 1, "b": 2}]),
+            ({"patternProperties": {"^a": {"type": "string"}}, "additionalProperties": False}, [{"ab": "c"}, {}], [{"ab": 1}, {"b": "c"}]),
+            ({"format": "port"}, [80, "443"], [70_000]),
+        ],
+    )
+    def test_compiled_validation(self, schema, valid, invalid):
+        validate_fast = compile_schema(schema, format_checker)
+        validator = Draft4Validator(schema, format_checker=format_checker)
+        for instance in valid:
+            assert validator.is_valid(instance)
+            assert validate_fast(instance), instance
+        for instance in invalid:
+            assert not validator.is_valid(instance)
+            assert not validate_fast(instance), instance
+
+    @pytest.mark.parametrize(
+        "schema",
+        [{"$ref": "#/definitions/foo"}, {"multipleOf": 2}, {"properties": {"a": {"$ref": "#"}}}, {"items": [{"type": "string"}]}, {"type": "banana"}],
+    )
+    def test_unsupported_schemas(self, schema):
+        assert compile_schema(schema) is None
+
+    def test_undecided_falls_back(self):
+        validate_fast = compile_schema({"enum": [1, "a"], "uniqueItems": True})
+        assert validate_fast("a")
+        assert not validate_fast(True)
+        assert not validate_fast([1, 2])
+
+    @pytest.mark.parametrize("provider_name", list(_all_providers))
+    @settings(max_examples=30, deadline=None)
+    @given(data=st.data())
+    def test_provider_schemas_never_accept_invalid_data(self, provider_name, data):
+        provider = get_notifier(provider_name)
+        validate_fast = compile_schema(provider.schema, format_checker)
+        assert validate_fast is not None
+        keys = st.sampled_from([*provider.arguments, "foo"])
+        instance = data.draw(st.dictionaries(keys, json_values, max_size=6))
+        if validate_fast(instance):
+            assert provider.validator.is_valid(instance)
+
+    def test_fast_path_skips_full_validation(self, mock_provider, monkeypatch):
+        def fail(*_args, **_kwargs):
+            pytest.fail("full validation should not run for valid data")
+
+        monkeypatch.setattr(type(mock_provider.validator), "iter_errors", fail)
+        mock_provider._validate_data({"required": "foo", "not_required": ["foo", "bar"]})
@@ -1,8 +1,10 @@
 import logging
+import threading
+import time
 
 import pytest
 
-from notifiers.exceptions import NoSuchNotifierError
+from notifiers.exceptions import NoSuchNotifierError, NotifierException
 
 log = logging.getLogger("test_logger")
 
@@ -67,3 +69,131 @@ class TestLogger:
             foo="bar",
             message="Could not log msg to provider 'pushover'!\nError with sent data: 'user' is a required property",
         )
+
+
+class TestBackgroundLogger:
+    def test_background_logging(self, magic_mock_provider, handler):
+        hdlr = handler(magic_mock_provider.name, logging.INFO, {"foo": "bar"}, background=True)
+        log.addHandler(hdlr)
+        try:
+            log.info("test")
+            assert hdlr.flush(5)
+        finally:
+            log.removeHandler(hdlr)
+            hdlr.close()
+
+        magic_mock_provider.notify.assert_called_with(foo="bar", message="test", raise_on_errors=True)
+
+    def test_emit_does_not_block(self, magic_mock_provider, handler):
+        sending, release = threading.Event(), threading.Event()
+
+        def notify(**_kwargs):
+            sending.set()
+            release.wait(5)
+
+        magic_mock_provider.notify.side_effect = notify
+        hdlr = handler(magic_mock_provider.name, logging.INFO, background=True, queue_size=1)
+        try:
+            start = time.monotonic()
+            hdlr.handle(log.makeRecord(log.name, logging.INFO, __file__, 0, "test", None, None))
+            assert sending.wait(5)
+            for _ in range(4):
+                hdlr.handle(log.makeRecord(log.name, logging.INFO, __file__, 0, "test", None, None))
+            assert time.monotonic() - start < 1
+            # One record is being sent, one is queued and the rest are dropped
+            assert hdlr.dropped == 3
+        finally:
+            release.set()
+            hdlr.close()
+            magic_mock_provider.notify.side_effect = None
+
+        assert magic_mock_provider.notify.call_count == 2
+
+    def test_close_flushes_queue(self, magic_mock_provider, handler):
+        magic_mock_provider.notify.side_effect = lambda **_kwargs: time.sleep(0.01)
+        hdlr = handler(magic_mock_provider.name, logging.INFO, background=True, workers=2, on_full="block", queue_size=2)
+        try:
+            for _ in range(10):
+                hdlr.handle(log.makeRecord(log.name, logging.INFO, __file__, 0, "test", None, None))
+        finally:
+            hdlr.close()
+            magic_mock_provider.notify.side_effect = None
+
+        assert magic_mock_provider.notify.call_count == 10
+        assert hdlr.dropped == 0
+        assert hdlr.queue is None
+
+    def test_background_fallback(self, magic_mock_provider, handler):
+        hdlr = handler("pushover", logging.INFO, {"env_prefix": "foo"}, fallback=magic_mock_provider.name, background=True)
+        hdlr.handle(log.makeRecord(log.name, logging.INFO, __file__, 0, "test", None, None))
+        hdlr.close()
+
+        magic_mock_provider.notify.assert_called_with(message="Could not log msg to provider 'pushover'!\nError with sent data: 'user' is a required property")
+
+    def test_invalid_on_full(self, magic_mock_provider, handler):
+        with pytest.raises(ValueError, match="on_full"):
+            handler(magic_mock_provider.name, logging.INFO, on_full="foo")
+
+    def test_failing_fallback(self, magic_mock_provider, handler, capsys):
+        magic_mock_provider.notify.side_effect = NotifierException(message="fallback is down")
+        hdlr = handler("pushover", logging.INFO, {"env_prefix": "foo"}, fallback=magic_mock_provider.name, background=True)
+        try:
+            for _ in range(2):
+                hdlr.handle(log.makeRecord(log.name, logging.INFO, __file__, 0, "test", None, None))
+            # The worker survives the fallback error and keeps draining the queue
+            assert hdlr.flush(5)
+            assert all(worker.is_alive() for worker in hdlr._workers)
+        finally:
+            hdlr.close()
+            magic_mock_provider.notify.side_effect = None
+
+        assert magic_mock_provider.notify.call_count == 2
+        assert "fallback is down" in capsys.readouterr().err
+
+    def test_close_with_full_queue(self, magic_mock_provider, handler):
+        sending, release = threading.Event(), threading.Event()
+
+        def notify(**_kwargs):
+            sending.set()
+            release.wait(5)
+
+        magic_mock_provider.notify.side_effect = notify
+        hdlr = handler(magic_mock_provider.name, logging.INFO, background=True, queue_size=1)
+        try:
+            hdlr.handle(log.makeRecord(log.name, logging.INFO, __file__, 0, "test", None, None))
+            assert sending.wait(5)
+            hdlr.handle(log.makeRecord(log.name, logging.INFO, __file__, 0, "test", None, None))
+            start = time.monotonic()
+            hdlr.close(timeout=0.2)
+            assert time.monotonic() - start < 2
+        finally:
+            release.set()
+            magic_mock_provider.notify.side_effect = None
+
+    def test_flush_does_not_block(self, magic_mock_provider, handler):
+        sending, release = threading.Event(), threading.Event()
+
+        def notify(**_kwargs):
+            sending.set()
+            release.wait(5)
+
+        magic_mock_provider.notify.side_effect = notify
+        hdlr = handler(magic_mock_provider.name, logging.INFO, background=True)
+        try:
+            hdlr.handle(log.makeRecord(log.name, logging.INFO, __file__, 0, "test", None, None))
+            assert sending.wait(5)
+            # logging.shutdown() flushes before closing, only closing should wait for the queue
+            start = time.monotonic()
+            assert not hdlr.flush()
+            hdlr.close(timeout=0.2)
+            assert time.monotonic() - start < 2
+        finally:
+            release.set()
+            magic_mock_provider.notify.side_effect = None
+
+    def test_fallback_defaults_are_not_changed(self, magic_mock_provider, handler):
+        fallback_defaults = {"foo": "bar"}
+        hdlr = handler("pushover", logging.INFO, {"env_prefix": "foo"}, fallback=magic_mock_provider.name, fallback_defaults=fallback_defaults)
+        hdlr.handle(log.makeRecord(log.name, logging.INFO, __file__, 0, "test", None, None))
+        assert fallback_defaults == {"foo": "bar"}
+        magic_mock_provider.notify.assert_called_once()
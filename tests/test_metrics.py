@@ -0,0 +1,137 @@
+import asyncio
+import socket
+import urllib.request
+
+import pytest
+
+from notifiers.core import get_notifier
+from notifiers.exceptions import BadArguments
+from notifiers.standin import StandInHTTPServer, StandInSMTPServer
+from notifiers.transports import HTTPTransport, MockTransport, RedirectTransport
+from notifiers.utils.metrics import PrometheusExporter, StatsDExporter, metrics
+from notifiers.utils.requests import SessionPool
+from notifiers.utils.retry import RetryPolicy
+
+PUSHOVER_URL = "https://api.pushover.net/1/messages.json"
+PUSHOVER_DATA = {"token": "foo", "user": "bar", "message": "baz"}
+
+
+@pytest.fixture
+def prometheus():
+    exporter = metrics.add_exporter(PrometheusExporter())
+    yield exporter
+    metrics.remove_exporter(exporter)
+
+
+def pushover(transport):
+    return type(get_notifier("pushover"))(transport=transport)
+
+
+class TestMetrics:
+    def test_disabled(self, mock_provider, monkeypatch):
+        assert not metrics.enabled
+        monkeypatch.setattr(metrics, "record_send", None)
+        assert mock_provider.notify(required="foo").ok
+
+    def test_remove_exporter(self):
+        exporter = metrics.add_exporter(PrometheusExporter())
+        assert metrics.enabled
+        metrics.remove_exporter(exporter)
+        assert not metrics.enabled
+
+    def test_sends(self, prometheus, mock_provider):
+        mock_provider.notify(required="foo")
+        asyncio.run(mock_provider.anotify(required="foo"))
+        with pytest.raises(BadArguments):
+            mock_provider.notify()
+        text = prometheus.render()
+        assert 'notifiers_sends_total{provider="mock_provider",status="success"} 2' in text
+        assert 'notifiers_sends_total{provider="mock_provider",status="failure"} 1' in text
+        assert 'notifiers_failures_total{provider="mock_provider",error="BadArguments"} 1' in text
+        assert "# TYPE notifiers_send_duration_seconds histogram" in text
+        assert 'notifiers_send_duration_seconds_bucket{provider="mock_provider",le="+Inf"} 2' in text
+        assert 'notifiers_send_duration_seconds_count{provider="mock_provider"} 2' in text
+
+    def test_failures_and_retries(self, prometheus, monkeypatch):
+        monkeypatch.setattr("notifiers.utils.requests.time.sleep", lambda _: None)
+        mock = MockTransport()
+        mock.add("post", PUSHOVER_URL, status_code=429)
+        mock.add("post", PUSHOVER_URL, status_code=500, json={"errors": ["foo"]})
+        provider = pushover(mock)
+        provider.retry_policy = RetryPolicy(max_attempts=2)
+        assert not provider.notify(**PUSHOVER_DATA).ok
+        text = prometheus.render()
+        assert 'notifiers_failures_total{provider="pushover",error="http_500"} 1' in text
+        assert 'notifiers_retries_total{provider="pushover"} 1' in text
+
+    def test_resource_calls(self, prometheus, mock_provider):
+        mock_provider.mock_rsrc(key="foo")
+        with pytest.raises(BadArguments):
+            mock_provider.mock_rsrc()
+        text = prometheus.render()
+        assert 'notifiers_resource_calls_total{provider="mock_provider",resource="mock_resource",status="success"} 1' in text
+        assert 'notifiers_resource_calls_total{provider="mock_provider",resource="mock_resource",status="BadArguments"} 1' in text
+
+    def test_transports(self, prometheus):
+        with StandInHTTPServer(seed=1) as server:
+            transport = RedirectTransport(server.url, HTTPTransport(session_pool=SessionPool()))
+            assert pushover(transport).notify(**PUSHOVER_DATA).ok
+        with StandInSMTPServer(seed=1) as smtp_server:
+            data = {"to": "foo@foo.com", "message": "bar", "host": smtp_server.host, "port": smtp_server.port}
+            assert get_notifier("email").notify(**data).ok
+        text = prometheus.render()
+        assert 'notifiers_transport_requests_total{provider="pushover",transport="http"} 1' in text
+        assert 'notifiers_transport_requests_total{provider="email",transport="smtp"} 1' in text
+        assert 'notifiers_payload_bytes_bucket{provider="pushover",transport="http",le="256"} 1' in text
+        assert 'notifiers_payload_bytes_count{provider="email",transport="smtp"} 1' in text
+
+    def test_label_escaping(self, prometheus, mock_provider, monkeypatch):
+        monkeypatch.setattr(type(mock_provider), "name", 'mock"\\')
+        mock_provider.notify(required="foo")
+        assert 'provider="mock\\"\\\\"' in prometheus.render()
+
+    def test_serve(self, prometheus, mock_provider):
+        mock_provider.notify(required="foo")
+        server = prometheus.serve(0)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as rsp:
+                assert rsp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                assert rsp.read().decode() == prometheus.render()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestStatsD:
+    @pytest.fixture
+    def agent(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.settimeout(2)
+        yield sock
+        sock.close()
+
+    @staticmethod
+    def receive(agent, count):
+        return [agent.recv(1024).decode() for _ in range(count)]
+
+    def test_statsd(self, agent, mock_provider):
+        exporter = metrics.add_exporter(StatsDExporter(port=agent.getsockname()[1]))
+        try:
+            mock_provider.notify(required="foo")
+        finally:
+            metrics.remove_exporter(exporter)
+            exporter.close()
+        sent, duration = self.receive(agent, 2)
+        assert sent == "notifiers.sends.mock_provider.success:1|c"
+        assert duration.startswith("notifiers.send_duration.mock_provider:")
+        assert duration.endswith("|ms")
+
+    def test_statsd_tags(self, agent, mock_provider):
+        exporter = metrics.add_exporter(StatsDExporter(port=agent.getsockname()[1], prefix="", tags=True))
+        try:
+            mock_provider.notify(required="foo")
+        finally:
+            metrics.remove_exporter(exporter)
+            exporter.close()
+        assert self.receive(agent, 1) == ["sends:1|c|#provider:mock_provider,status:success"]
@@ -0,0 +1,167 @@
+import threading
+import time
+
+import pytest
+
+from notifiers.core import FAILURE_STATUS, SUCCESS_STATUS, Provider, Response
+from notifiers.exceptions import BadArguments, NotificationError
+from notifiers.providers import _all_providers
+from notifiers.router import Router, Target, TargetStats
+
+
+class FakeProvider(Provider):
+    """Sends by sleeping for ``delay`` seconds and either succeeds or fails"""
+
+    name = "fake"
+    base_url = ""
+    site_url = ""
+    delay = 0.0
+    fail = False
+    _required = {"required": ["message"]}
+    _schema = {"type": "object", "properties": {"message": {"type": "string"}}, "additionalProperties": False}
+
+    def _send_notification(self, data: dict):
+        time.sleep(self.delay)
+        self.sent.append(data)
+        if self.fail:
+            return Response(status=FAILURE_STATUS, provider=self.name, data=data, errors=["failed"])
+        return Response(status=SUCCESS_STATUS, provider=self.name, data=data)
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    """Registers a :class:`FakeProvider` under the given name"""
+
+    def return_provider(name, delay=0.0, fail=False):
+        provider = type("FakeProvider", (FakeProvider,), {"name": name, "delay": delay, "fail": fail, "sent": []})
+        monkeypatch.setitem(_all_providers, name, provider)
+        return provider
+
+    return return_provider
+
+
+class TestTargetStats:
+    def test_stats(self):
+        stats = TargetStats(window=4)
+        for latency, ok in [(9, True), (1, True), (2, False), (3, True), (4, True)]:
+            stats.record(latency, ok)
+        assert len(stats) == 4
+        assert stats.error_rate == 0.25
+        assert stats.percentile(50) == 3
+        assert stats.percentile(95) == 4
+        assert stats.snapshot() == {"sends": 4, "error_rate": 0.25, "p50": 3, "p95": 4}
+
+    def test_empty_stats(self):
+        stats = TargetStats()
+        assert stats.error_rate == 0
+        assert stats.percentile(95) is None
+
+
+class TestRouter:
+    def test_first_target_delivers(self, fake_provider):
+        first, second = fake_provider("first"), fake_provider("second")
+        router = Router([("first", {"message": "foo"}), ("second", {"message": "bar"})])
+        rsp = router.notify()
+        assert rsp.ok
+        assert rsp.provider == "first"
+        assert first.sent == [{"message": "foo"}]
+        assert not second.sent
+
+    def test_failover(self, fake_provider):
+        fake_provider("first", fail=True)
+        fake_provider("second")
+        router = Router([Target("first"), Target("second")])
+        rsp = router.notify(message="foo")
+        assert rsp.provider == "second"
+        assert router.stats()["first"]["error_rate"] == 1
+
+    def test_failover_on_exception(self, fake_provider):
+        fake_provider("first")
+        fake_provider("second")
+        router = Router([("first", {"foo": "bar"}), ("second",)])
+        assert router.notify(message="foo").provider == "second"
+
+    def test_all_targets_fail(self, fake_provider):
+        fake_provider("first", fail=True)
+        fake_provider("second", fail=True)
+        router = Router([("first",), ("second",)])
+        rsp = router.notify(message="foo")
+        assert not rsp.ok
+        assert rsp.provider == "second"
+        with pytest.raises(NotificationError):
+            router.notify(raise_on_errors=True, message="foo")
+
+    def test_all_targets_raise(self, fake_provider):
+        fake_provider("first")
+        router = Router([("first",)])
+        with pytest.raises(BadArguments):
+            router.notify()
+
+    def test_unhealthy_targets_last(self, fake_provider):
+        first = fake_provider("first", fail=True)
+        fake_provider("second")
+        router = Router([("first",), ("second",)], min_samples=2)
+        router.notify(message="foo")
+        router.notify(message="foo")
+        assert [target.name for target in router.ordered_targets()] == ["second", "first"]
+        router.notify(message="foo")
+        assert len(first.sent) == 2
+
+    def test_weighted(self, fake_provider):
+        fake_provider("first")
+        fake_provider("second")
+        router = Router([Target("first", weight=9), Target("second", weight=1)], strategy="weighted")
+        firsts = [router.ordered_targets()[0].name for _ in range(1000)]
+        assert 800 < firsts.count("first") < 980
+
+    def test_fastest(self, fake_provider):
+        fake_provider("slow", delay=0.02)
+        fake_provider("fast")
+        router = Router([("slow",), ("fast",)], strategy="fastest", min_samples=1)
+        router.targets[0].notify(message="foo")
+        assert [target.name for target in router.ordered_targets()] == ["fast", "slow"]
+        router.targets[1].notify(message="foo")
+        assert [target.name for target in router.ordered_targets()] == ["fast", "slow"]
+
+    def test_hedging(self, fake_provider):
+        fake_provider("slow", delay=0.5)
+        fake_provider("fast")
+        router = Router([("slow",), ("fast",)], hedge=True, hedge_delay=0.05)
+        start = time.monotonic()
+        rsp = router.notify(message="foo")
+        assert time.monotonic() - start < 0.4
+        assert rsp.provider == "fast"
+        router.close()
+        # The slow target still delivered in the background
+        assert router.stats()["slow"]["sends"] == 1
+
+    def test_hedging_uses_p95(self, fake_provider):
+        fake_provider("first", delay=0.01)
+        fake_provider("second")
+        router = Router([("first",), ("second",)], hedge=True, hedge_delay=10, min_samples=1)
+        target = router.targets[0]
+        target.notify(message="foo")
+        assert router._hedge_delay(target) == pytest.approx(0.01, abs=0.01)
+
+    def test_hedging_fails_over(self, fake_provider):
+        fake_provider("first", fail=True)
+        fake_provider("second")
+        router = Router([("first",), ("second",)], hedge=True, hedge_delay=10)
+        assert router.notify(message="foo").provider == "second"
+        router.close()
+
+    def test_concurrent_notify(self, fake_provider):
+        fake_provider("first", delay=0.01)
+        router = Router([("first",)])
+        threads = [threading.Thread(target=router.notify, kwargs={"message": "foo"}) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert router.stats()["first"]["sends"] == 10
+
+    @pytest.mark.parametrize(("targets", "strategy", "message"), [([], "ordered", "target"), ([("first",)], "foo", "strategy")])
+    def test_invalid_router(self, fake_provider, targets, strategy, message):
+        fake_provider("first")
+        with pytest.raises(ValueError, match=message):
+            Router(targets, strategy=strategy)
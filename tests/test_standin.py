@@ -0,0 +1,128 @@
+import pytest
+
+from notifiers.core import get_notifier
+from notifiers.standin import StandInHTTPServer, StandInSMTPServer
+from notifiers.transports import HTTPTransport, RedirectTransport
+from notifiers.utils.requests import SessionPool
+from notifiers.utils.retry import NO_RETRY, RetryPolicy
+
+
+@pytest.fixture
+def standin():
+    """Starts a :class:`StandInHTTPServer` with the given settings"""
+    servers = []
+
+    def return_server(**kwargs):
+        server = StandInHTTPServer(seed=1, **kwargs).start()
+        servers.append(server)
+        return server
+
+    yield return_server
+    for server in servers:
+        server.stop()
+
+
+def redirected(provider_name, server, retry_policy=NO_RETRY):
+    provider = type(get_notifier(provider_name))(transport=RedirectTransport(server.url))
+    provider.retry_policy = retry_policy
+    return provider
+
+
+@pytest.mark.parametrize(
+    ("provider_name", "data"),
+    [
+        ("pushover", {"token": "foo", "user": "bar", "message": "baz"}),
+        ("telegram", {"token": "foo", "chat_id": 1, "message": "bar"}),
+        ("slack", {"webhook_url": "https://hooks.slack.com/services/foo", "message": "bar"}),
+        ("pagerduty", {"routing_key": "foo", "event_action": "trigger", "source": "bar", "severity": "info", "message": "baz"}),
+        ("twilio", {"account_sid": "foo", "auth_token": "bar", "to": "+15551234567", "from": "+15557654321", "message": "baz"}),
+        ("pushbullet", {"token": "foo", "message": "bar"}),
+        ("gitter", {"token": "foo", "room_id": "bar", "message": "baz"}),
+        ("zulip", {"email": "foo@foo.com", "api_key": "bar", "domain": "baz", "to": "qux", "subject": "quux", "message": "corge"}),
+    ],
+)
+def test_providers(standin, provider_name, data):
+    server = standin()
+    rsp = redirected(provider_name, server).notify(**data)
+    assert rsp.ok, rsp.errors
+    assert server.stats[provider_name] == 1
+
+
+def test_errors(standin):
+    server = standin(error_rate=1)
+    rsp = redirected("pushover", server).notify(token="foo", user="bar", message="baz")
+    assert rsp.errors == ["Internal Server Error"]
+    assert rsp.response.status_code == 500
+
+
+def test_throttling_is_retried(standin, monkeypatch):
+    monkeypatch.setattr("notifiers.utils.requests.time.sleep", lambda _: None)
+    server = standin(throttle_rate=0.5, retry_after=0)
+    provider = redirected("telegram", server, retry_policy=RetryPolicy(max_attempts=10, retry_after_path=("parameters", "retry_after")))
+    for chat_id in range(5):
+        provider.notify(token="foo", chat_id=chat_id, message="bar", raise_on_errors=True)
+    assert server.stats["status:200"] == 5
+    assert server.stats["status:429"] > 0
+
+
+def test_rate_limit(standin):
+    server = standin(rate_limit=2)
+    provider = redirected("pagerduty", server)
+    data = {"routing_key": "foo", "event_action": "trigger", "source": "bar", "severity": "info", "message": "baz"}
+    responses = [provider.notify(**data) for _ in range(4)]
+    assert [rsp.ok for rsp in responses] == [True, True, False, False]
+    assert responses[-1].response.headers["Retry-After"] == "1"
+
+
+def test_direct_base_url(standin):
+    server = standin()
+    rsp = get_notifier("slack").notify(webhook_url=f"{server.url}/services/foo", message="bar")
+    assert rsp.ok
+    assert rsp.response.text == "ok"
+
+
+def test_unknown_endpoint(standin):
+    server = standin()
+    rsp = redirected("simplepush", server).notify(key="foo", message="bar")
+    assert "No stand-in endpoint" in str(rsp.errors)
+    assert server.stats["unknown"] == 1
+
+
+def test_timings(standin):
+    server = standin()
+    provider = type(get_notifier("pushover"))(transport=RedirectTransport(server.url, HTTPTransport(session_pool=SessionPool())))
+    first = provider.notify(token="foo", user="bar", message="baz")
+    assert {"connect", "first_byte", "send", "total"} <= set(first.timings)
+    assert "tls" not in first.timings
+    second = provider.notify(token="foo", user="bar", message="baz")
+    assert "first_byte" in second.timings
+    assert "connect" not in second.timings
+
+
+def test_warmup(standin):
+    server = standin()
+    redirected("pushover", server).warmup()
+    assert server.stats["head"] == 1
+
+
+class TestStandInSMTPServer:
+    @pytest.fixture
+    def smtp_server(self):
+        with StandInSMTPServer(seed=1) as server:
+            yield server
+
+    def test_send(self, smtp_server):
+        data = {"to": "foo@foo.com", "message": "bar", "host": smtp_server.host, "port": smtp_server.port}
+        rsp = get_notifier("email").notify(username="foo", password="bar", **data)
+        assert rsp.ok, rsp.errors
+        (message,) = smtp_server.messages
+        assert b"To: foo@foo.com" in message
+        assert smtp_server.stats == {"received": 1}
+        assert "connect" in rsp.timings
+
+    def test_errors(self, smtp_server):
+        smtp_server.error_rate = 1
+        data = {"to": "foo@foo.com", "message": "bar", "host": smtp_server.host, "port": smtp_server.port}
+        rsp = get_notifier("email").notify(**data)
+        assert "Temporary server error" in rsp.errors[0]
+        assert smtp_server.stats == {"refused": 1}
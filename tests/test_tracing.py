@@ -0,0 +1,132 @@
+import asyncio
+import contextlib
+import contextvars
+import logging
+import sys
+
+import pytest
+
+from notifiers import notify_many
+from notifiers.core import get_notifier
+from notifiers.logging import NotificationHandler
+from notifiers.standin import StandInHTTPServer
+from notifiers.transports import HTTPTransport, RedirectTransport
+from notifiers.utils.requests import SessionPool
+from notifiers.utils.tracing import tracing
+
+PROCESS_SPANS = [
+    "notifiers.get_environs",
+    "notifiers.merge_defaults",
+    "notifiers.validate_data",
+    "notifiers.validate_data_dependencies",
+    "notifiers.prepare_data",
+]
+
+
+class Span:
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class RecordingTracer:
+    """Records spans and their parents, like an OpenTelemetry tracer with an in memory exporter"""
+
+    def __init__(self):
+        self.spans = []
+        self._current = contextvars.ContextVar("current_span", default=None)
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        span = Span(name, attributes, self._current.get())
+        self.spans.append(span)
+        token = self._current.set(span)
+        try:
+            yield span
+        finally:
+            self._current.reset(token)
+
+    def named(self, name):
+        return [span for span in self.spans if span.name == name]
+
+
+@pytest.fixture
+def tracer():
+    tracer = RecordingTracer()
+    tracing.enable(tracer)
+    yield tracer
+    tracing.disable()
+
+
+class TestTracing:
+    def test_disabled(self, mock_provider):
+        assert not tracing.enabled
+        with tracing.span("foo", "bar") as span:
+            span.set_attribute("foo", "bar")
+        assert mock_provider.notify(required="foo").ok
+
+    def test_disabled_while_sending(self, mock_provider, monkeypatch):
+        # Another thread disabling tracing after a send checked enabled leaves the flag set without a tracer
+        monkeypatch.setattr(tracing, "enabled", True)
+        monkeypatch.setattr(tracing, "tracer", None)
+        assert mock_provider.notify(required="foo").ok
+
+    def test_enable_requires_opentelemetry(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "opentelemetry", None)
+        with pytest.raises(ImportError, match="notifiers\\[opentelemetry\\]"):
+            tracing.enable()
+        assert not tracing.enabled
+
+    def test_notify(self, tracer, mock_provider):
+        mock_provider.notify(required="foo")
+        (root, *children) = tracer.spans
+        assert root.name == "notifiers.notify"
+        assert root.parent is None
+        assert root.attributes == {"notifiers.provider": "mock_provider", "notifiers.status": "Success"}
+        assert [span.name for span in children] == [*PROCESS_SPANS, "notifiers.send_notification"]
+        assert all(span.parent is root for span in children)
+
+    def test_anotify(self, tracer, mock_provider):
+        asyncio.run(mock_provider.anotify(required="foo"))
+        (send,) = tracer.named("notifiers.send_notification")
+        assert send.parent is tracer.named("notifiers.notify")[0]
+
+    def test_resource(self, tracer, mock_provider):
+        mock_provider.mock_rsrc(key="foo")
+        (root, *children) = tracer.spans
+        assert root.name == "notifiers.resource"
+        assert root.attributes == {"notifiers.provider": "mock_provider", "notifiers.resource": "mock_resource"}
+        assert [span.name for span in children] == PROCESS_SPANS
+
+    def test_http_request(self, tracer):
+        with StandInHTTPServer(seed=1) as server:
+            transport = RedirectTransport(server.url, HTTPTransport(session_pool=SessionPool()))
+            type(get_notifier("pushover"))(transport=transport).notify(token="foo", user="bar", message="baz")
+        (request,) = tracer.named("notifiers.http_request")
+        assert request.parent is tracer.named("notifiers.send_notification")[0]
+        assert request.attributes == {
+            "notifiers.provider": "pushover",
+            "http.request.method": "POST",
+            "server.address": "127.0.0.1",
+            "http.response.status_code": 200,
+        }
+
+    def test_concurrent_sends(self, tracer, mock_provider):
+        with tracer.start_as_current_span("batch") as batch:
+            notify_many([("mock_provider", {"required": "foo"})] * 3)
+        roots = tracer.named("notifiers.notify")
+        assert len(roots) == 3
+        assert all(span.parent is batch for span in roots)
+
+    def test_background_logging(self, tracer, mock_provider):
+        hdlr = NotificationHandler("mock_provider", defaults={"required": "foo"}, background=True)
+        record = logging.LogRecord("foo", logging.ERROR, __file__, 1, "bar", (), None)
+        with tracer.start_as_current_span("request") as request:
+            hdlr.emit(record)
+        hdlr.close()
+        (root,) = tracer.named("notifiers.notify")
+        assert root.parent is request
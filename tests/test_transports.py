@@ -0,0 +1,206 @@
+import hashlib
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+import notifiers
+from notifiers import transports
+from notifiers.core import get_notifier
+from notifiers.transports import HTTPTransport, MockTransport, RecordingTransport, ReplayTransport, get_transport
+from notifiers.utils.context import send_context
+from notifiers.utils.keepalive import KeepAlive, keepalive
+
+PUSHBULLET_URL = "https://api.pushbullet.com/v2/pushes"
+
+
+def pushbullet(transport):
+    return type(get_notifier("pushbullet"))(transport=transport)
+
+
+class TestTransports:
+    def test_default_transport(self):
+        assert isinstance(get_transport(), HTTPTransport)
+        mock = MockTransport()
+        with send_context("foo", transport=mock):
+            assert get_transport() is mock
+
+    def test_mock_transport(self):
+        mock = MockTransport()
+        mock.add("post", PUSHBULLET_URL, json={"iden": "foo"})
+        rsp = pushbullet(mock).notify(token="foo", message="bar")
+        assert rsp.ok
+        assert rsp.response.json() == {"iden": "foo"}
+        ((method, url, kwargs),) = mock.requests
+        assert (method, url) == ("post", PUSHBULLET_URL)
+        assert kwargs["json"] == {"body": "bar", "type": "note"}
+
+    def test_mock_transport_errors(self):
+        mock = MockTransport()
+        mock.add("post", PUSHBULLET_URL, status_code=401, json={"error": {"message": "Access token is missing or invalid."}})
+        rsp = pushbullet(mock).notify(token="foo", message="bar")
+        assert rsp.errors == ["Access token is missing or invalid."]
+
+    def test_mock_transport_ignores_query_string(self):
+        mock = MockTransport()
+        mock.add("get", "https://foo.com/bar", text="baz", repeat=True)
+        for _ in range(2):
+            assert mock.request("get", "https://foo.com/bar?foo=bar").text == "baz"
+
+    def test_strict_mock_transport(self):
+        mock = MockTransport(strict=True)
+        rsp = pushbullet(mock).notify(token="foo", message="bar")
+        assert rsp.response is None
+        assert "No mock response" in rsp.errors[0]
+
+    def test_resources_inherit_transport(self):
+        mock = MockTransport()
+        mock.add("get", "https://api.pushbullet.com/v2/devices", json={"devices": [{"iden": "foo", "active": True}]})
+        provider = pushbullet(mock)
+        assert provider.devices.transport is mock
+        assert provider.devices(token="foo") == [{"iden": "foo", "active": True}]
+
+    def test_email(self):
+        mock = MockTransport()
+        email = type(get_notifier("email"))(transport=mock)
+        rsp = email.notify(to="foo@foo.com", message="bar", host="fakehost", raise_on_errors=True)
+        assert rsp.ok
+        (message,) = mock.messages
+        assert message["To"] == "foo@foo.com"
+
+    def test_record_and_replay(self, tmp_path):
+        path = tmp_path / "recording.jsonl"
+        mock = MockTransport()
+        mock.add("post", PUSHBULLET_URL, json={"iden": "foo"})
+        mock.add("post", PUSHBULLET_URL, status_code=401, json={"error": {"message": "bad token"}})
+        recorder = pushbullet(RecordingTransport(path, transport=mock))
+        recorded = [recorder.notify(token="foo", message="bar") for _ in range(2)]
+
+        replayer = pushbullet(ReplayTransport(path))
+        replayed = [replayer.notify(token="foo", message="bar") for _ in range(2)]
+        assert [rsp.errors for rsp in replayed] == [rsp.errors for rsp in recorded] == [None, ["bad token"]]
+        assert replayed[0].response.json() == {"iden": "foo"}
+        # Like an unreachable endpoint, a request without a recorded response fails the send instead of raising
+        rsp = replayer.notify(token="foo", message="bar")
+        assert "No recorded response left" in rsp.errors[0]
+
+    def test_recording_is_redacted(self, tmp_path):
+        path = tmp_path / "recording.jsonl"
+        token = "123456789:AAHdqTcvCH1vGWJxfSeofSAs0K5PALDsaw"
+        mock = MockTransport()
+        mock.add("post", f"https://api.telegram.org/bot{token}/sendMessage", json={"ok": True}, headers={"Set-Cookie": "session=foo"})
+        telegram = type(get_notifier("telegram"))(transport=RecordingTransport(path, transport=mock))
+        assert telegram.notify(token=token, chat_id=1, message="bar").ok
+        RecordingTransport(path, transport=mock).request("get", "https://foo.com/v1?api_key=secret&page=2", params={"token": "secret"})
+        recording = path.read_text()
+        assert "AAHdqTcvCH1vGWJxfSeofSAs0K5PALDsaw" not in recording
+        assert "secret" not in recording
+        assert "session=foo" not in recording
+        interaction = json.loads(recording.splitlines()[1])
+        assert interaction["url"] == "https://foo.com/v1?api_key=********&page=2"
+
+        # Recorded responses are matched by the redacted URL
+        replayer = type(get_notifier("telegram"))(transport=ReplayTransport(path))
+        assert replayer.notify(token=token, chat_id=1, message="bar").ok
+
+    def test_recording_redacts_provider_sensitive_keys(self, tmp_path):
+        path = tmp_path / "recording.jsonl"
+        mock = MockTransport()
+        mock.add("post", "https://api.pushover.net/1/messages.json", json={"status": 1})
+        pushover = type(get_notifier("pushover"))(transport=RecordingTransport(path, transport=mock))
+        assert pushover.notify(token="foo", user="uQiRzpo4DXghDmr9QzzfQu27cmVRsG", message="bar").ok
+        interaction = json.loads(path.read_text())
+        assert interaction["body"]["user"] == "********"
+        assert interaction["body"]["message"] == "bar"
+
+    def test_http_transport_session(self, monkeypatch):
+        session = requests.Session()
+        monkeypatch.setattr(session, "request", lambda method, url, **_kwargs: (method, url))
+        assert HTTPTransport().request("get", "https://foo.com", session=session) == ("get", "https://foo.com")
+
+
+class TestWarmup:
+    @pytest.mark.parametrize(
+        ("provider", "config", "urls"),
+        [
+            ("pushover", {}, ["https://api.pushover.net/1/"]),
+            ("telegram", {"token": "foo"}, ["https://api.telegram.org/botfoo"]),
+            ("zulip", {"domain": "foo"}, ["https://foo.zulipchat.com"]),
+            ("zulip", {"server": "https://zulip.foo.com"}, ["https://zulip.foo.com"]),
+            ("notify", {}, []),
+        ],
+    )
+    def test_warmup_urls(self, provider, config, urls):
+        mock = MockTransport()
+        type(get_notifier(provider))(transport=mock).warmup(**config)
+        assert mock.warmed_up == urls
+
+    def test_email_warmup(self):
+        mock = MockTransport()
+        type(get_notifier("gmail"))(transport=mock).warmup(username="foo", password="bar")
+        assert mock.warmed_up == [("smtp.gmail.com", 587, "foo", hashlib.sha256(b"bar").hexdigest(), True, False, True)]
+
+    def test_http_warmup(self):
+        pool = MagicMock()
+        HTTPTransport(session_pool=pool).warmup("https://api.foo.com/v1/messages?foo=bar")
+        pool.get.assert_called_once_with("https://api.foo.com/")
+        pool.get().head.assert_called_once_with("https://api.foo.com/", timeout=transports.DEFAULT_WARMUP_TIMEOUT, allow_redirects=False)
+
+    def test_warmup_many(self, monkeypatch):
+        mock = MockTransport()
+        monkeypatch.setattr(transports, "default_transport", mock)
+        results = notifiers.warmup(["pushover", ("zulip", {"domain": "foo"}), "foo"])
+        assert results[:2] == [None, None]
+        assert isinstance(results[2], notifiers.exceptions.NoSuchNotifierError)
+        assert sorted(mock.warmed_up) == ["https://api.pushover.net/1/", "https://foo.zulipchat.com"]
+
+    def test_keepalive(self):
+        mock = MockTransport()
+        pinged = threading.Event()
+        provider = type(get_notifier("pushover"))(transport=mock)
+        record = mock.warmup
+
+        def warmup(url):
+            record(url)
+            if len(mock.warmed_up) == 3:
+                pinged.set()
+
+        mock.warmup = warmup
+        try:
+            provider.warmup(keepalive=0.01)
+            assert pinged.wait(2)
+            assert len(keepalive) == 1
+        finally:
+            keepalive.cancel()
+        assert len(keepalive) == 0
+
+
+class TestKeepAlive:
+    def test_schedule(self):
+        scheduler = KeepAlive()
+        pings = []
+        done = threading.Event()
+
+        def failing_ping():
+            pings.append("failing")
+            raise ConnectionError
+
+        def ping():
+            pings.append("ping")
+            if pings.count("ping") == 2:
+                done.set()
+
+        scheduler.schedule("failing", failing_ping, 0.01)
+        scheduler.schedule("ping", ping, 0.01)
+        assert done.wait(2)
+        assert "failing" in pings
+        scheduler.cancel("ping")
+        assert len(scheduler) == 1
+        scheduler.cancel()
+        assert len(scheduler) == 0
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError, match="interval"):
+            KeepAlive().schedule("foo", lambda: None, 0)